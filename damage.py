@@ -5,30 +5,69 @@
 import bmesh
 from mathutils import Vector
 import math
+from dataclasses import dataclass
+import numpy as np
 from . import util
 
 
+# Order of the per-wall arrays used while generating damage profiles
+WALL_ORDER = ('front', 'back', 'left', 'right')
+
+
+@dataclass(slots=True)
+class DamageProfiles:
+    """
+    Damage height profiles for the four walls of a building.
+    
+    Each wall profile is an (N, 2) float32 array of (position, height)
+    rows, ordered by position along the wall.
+    """
+    front: np.ndarray
+    back: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    min_height: float
+    intact_height: float
+
+
 def generate_damage_profile(width: float, depth: float, total_height: float,
                             damage_amount: float, min_intact_height: float = 0,
                             pointiness: float = 0.5, resolution: float = 1.0,
-                            seed: int = None) -> dict:
+                            seed: int = None) -> DamageProfiles:
     """
     Generate a damage height profile for the building perimeter.
+    
+    The per-wall heights are computed by _profile_for_wall, which is
+    compiled with numba when it is installed; this function only draws the
+    random values and collapse zones for it.
+    
+    Args:
+        width: Building width (front and back wall length)
+        depth: Building depth (left and right wall length)
+        total_height: Undamaged height of the walls
+        damage_amount: Damage strength, 0 (none) to 1
+        min_intact_height: Height the damage never cuts below
+        pointiness: Height variance between neighbouring profile points
+        resolution: Multiplier for the number of profile points per wall
+        seed: Random seed, or None to draw one from the shared random state
+    
+    Returns:
+        DamageProfiles with one profile per wall
     """
     if seed is not None:
         util.seed_random(seed)
     
     if damage_amount <= 0:
-        return {
-            'front': [(0, total_height), (width, total_height)],
-            'back': [(0, total_height), (width, total_height)],
-            'left': [(0, total_height), (depth, total_height)],
-            'right': [(0, total_height), (depth, total_height)],
-            'min_height': total_height,
-            'intact_height': total_height,
-        }
-    
-    profiles = {}
+        return DamageProfiles(
+            front=np.array([(0, total_height), (width, total_height)], dtype=np.float32),
+            back=np.array([(0, total_height), (width, total_height)], dtype=np.float32),
+            left=np.array([(0, total_height), (depth, total_height)], dtype=np.float32),
+            right=np.array([(0, total_height), (depth, total_height)], dtype=np.float32),
+            min_height=total_height,
+            intact_height=total_height,
+        )
+    
+    wall_profiles = []
     min_height = total_height
     
     # Calculate the range of damage based on pointiness
@@ -36,97 +75,132 @@ def generate_damage_profile(width: float, depth: float, total_height: float,
     variance_range = base_damage_depth * pointiness
     absolute_min = max(min_intact_height, total_height * 0.1)
     
-    # Asymmetric damage - wall collapses
-    wall_collapse = {
-        'front': util.random_bool(damage_amount * 0.4),
-        'back': util.random_bool(damage_amount * 0.4),
-        'left': util.random_bool(damage_amount * 0.35),
-        'right': util.random_bool(damage_amount * 0.35),
-    }
-    
-    wall_collapse_intensity = {
-        'front': util.random_float(1.3, 2.0) if wall_collapse['front'] else 1.0,
-        'back': util.random_float(1.3, 2.0) if wall_collapse['back'] else 1.0,
-        'left': util.random_float(1.3, 2.0) if wall_collapse['left'] else 1.0,
-        'right': util.random_float(1.3, 2.0) if wall_collapse['right'] else 1.0,
-    }
-    
-    # Corner collapses
-    corner_collapse = [util.random_bool(damage_amount * 0.25) for _ in range(4)]
-    corner_collapse_zones = []
-    
-    if corner_collapse[0]:  # Front-left
-        corner_collapse_zones.append(('front', 0, width * 0.3, util.random_float(1.5, 2.5)))
-        corner_collapse_zones.append(('left', 0, depth * 0.3, util.random_float(1.5, 2.5)))
-    if corner_collapse[1]:  # Front-right
-        corner_collapse_zones.append(('front', width * 0.7, width, util.random_float(1.5, 2.5)))
-        corner_collapse_zones.append(('right', 0, depth * 0.3, util.random_float(1.5, 2.5)))
-    if corner_collapse[2]:  # Back-left
-        corner_collapse_zones.append(('back', width * 0.7, width, util.random_float(1.5, 2.5)))
-        corner_collapse_zones.append(('left', depth * 0.7, depth, util.random_float(1.5, 2.5)))
-    if corner_collapse[3]:  # Back-right
-        corner_collapse_zones.append(('back', 0, width * 0.3, util.random_float(1.5, 2.5)))
-        corner_collapse_zones.append(('right', depth * 0.7, depth, util.random_float(1.5, 2.5)))
+    # All random draws come from one generator, taken in bulk. Without an
+    # explicit seed it is seeded from the shared random state so seeded
+    # builds stay reproducible.
+    if seed is None:
+        seed = util.random_int(0, 2**31 - 1)
+    rng = np.random.default_rng(seed)
+    
+    # Asymmetric damage - wall collapses. Per-wall values below are indexed
+    # in WALL_ORDER (front, back, left, right).
+    collapse_chance = damage_amount * np.array([0.4, 0.4, 0.35, 0.35])
+    wall_collapse = rng.random(4) < collapse_chance
+    collapse_intensity = np.where(wall_collapse, rng.uniform(1.3, 2.0, 4), 1.0).tolist()
+    
+    # Corner collapses, each affecting the two walls that meet there
+    corner_collapse = rng.random(4) < damage_amount * 0.25
+    corner_intensity = rng.uniform(1.5, 2.5, 8).tolist()
+    corner_zones = (
+        ((0, 0, width * 0.3), (2, 0, depth * 0.3)),          # Front-left
+        ((0, width * 0.7, width), (3, 0, depth * 0.3)),      # Front-right
+        ((1, width * 0.7, width), (2, depth * 0.7, depth)),  # Back-left
+        ((1, 0, width * 0.3), (3, depth * 0.7, depth)),      # Back-right
+    )
+    wall_zones = [[], [], [], []]
+    for corner, collapsed in enumerate(corner_collapse):
+        if collapsed:
+            for side, (wall, zone_start, zone_end) in enumerate(corner_zones[corner]):
+                wall_zones[wall].append((zone_start, zone_end, corner_intensity[corner * 2 + side]))
+    
+    wall_lengths = (width, width, depth, depth)
     
     # Generate profile for each wall
-    for wall_name, wall_length in [('front', width), ('back', width), 
-                                    ('left', depth), ('right', depth)]:
-        profile = []
+    for wall in range(len(WALL_ORDER)):
+        wall_length = wall_lengths[wall]
         base_points = max(3, int(wall_length / 0.8))
         num_points = max(3, int(base_points * resolution))
-        wall_multiplier = wall_collapse_intensity[wall_name]
-        random_offsets = [util.random_float(0, 1) for _ in range(num_points + 1)]
-        
-        for i in range(num_points + 1):
-            pos = (i / num_points) * wall_length
-            
-            collapse_multiplier = 1.0
-            for zone_wall, zone_start, zone_end, zone_intensity in corner_collapse_zones:
-                if zone_wall == wall_name and zone_start <= pos <= zone_end:
-                    zone_center = (zone_start + zone_end) / 2
-                    zone_dist = abs(pos - zone_center) / ((zone_end - zone_start) / 2 + 0.01)
-                    zone_factor = 1.0 - zone_dist * 0.5
-                    collapse_multiplier = max(collapse_multiplier, 1.0 + (zone_intensity - 1.0) * zone_factor)
-            
-            base_loss = base_damage_depth * wall_multiplier * collapse_multiplier
-            variance_offset = (random_offsets[i] - 0.5) * variance_range * wall_multiplier
-            
-            height_loss = max(0, base_loss + variance_offset)
-            height = max(absolute_min, min(total_height, total_height - height_loss))
-            
-            profile.append((pos, height))
-            min_height = min(min_height, height)
+        zone_starts, zone_ends, zone_intensities = (
+            np.array(wall_zones[wall], dtype=np.float64).reshape(-1, 3).T.copy())
         
-        profiles[wall_name] = profile
+        profile = _profile_for_wall(
+            float(wall_length), num_points, base_damage_depth, collapse_intensity[wall],
+            variance_range, absolute_min, float(total_height),
+            zone_starts, zone_ends, zone_intensities, rng.random(num_points + 1))
+        wall_profiles.append(profile)
+        min_height = min(min_height, float(profile[:, 1].min()))
     
     min_height = max(min_height, min_intact_height)
-    profiles['min_height'] = min_height
-    profiles['intact_height'] = min_intact_height
     
-    return profiles
+    return DamageProfiles(*wall_profiles, min_height=min_height,
+                          intact_height=min_intact_height)
+
+
+@util.njit(cache=True, fastmath=True)
+def _profile_for_wall(wall_length, num_points, base_damage_depth, wall_multiplier,
+                      variance_range, absolute_min, total_height,
+                      zone_starts, zone_ends, zone_intensities, random_offsets):
+    """
+    Compute the (position, height) profile of a single wall.
+    
+    Only takes floats and float64 arrays so it can be compiled by numba.
+    
+    Returns:
+        (num_points + 1, 2) float32 array of (position, height) rows
+    """
+    pos = np.linspace(0.0, wall_length, num_points + 1)
+    
+    collapse_multiplier = np.ones(num_points + 1)
+    for zone in range(zone_starts.shape[0]):
+        zone_start = zone_starts[zone]
+        zone_end = zone_ends[zone]
+        in_zone = (pos >= zone_start) & (pos <= zone_end)
+        zone_dist = np.abs(pos - (zone_start + zone_end) / 2) / ((zone_end - zone_start) / 2 + 0.01)
+        zone_factor = 1.0 - zone_dist * 0.5
+        zone_multiplier = np.where(in_zone, 1.0 + (zone_intensities[zone] - 1.0) * zone_factor, 1.0)
+        collapse_multiplier = np.maximum(collapse_multiplier, zone_multiplier)
+    
+    base_loss = base_damage_depth * wall_multiplier * collapse_multiplier
+    variance_offset = (random_offsets - 0.5) * variance_range * wall_multiplier
+    
+    height_loss = np.maximum(0.0, base_loss + variance_offset)
+    height = np.clip(total_height - height_loss, absolute_min, total_height)
+    
+    profile = np.empty((num_points + 1, 2), dtype=np.float32)
+    profile[:, 0] = pos
+    profile[:, 1] = height
+    return profile
 
 
-def get_height_at_position(profile: list, position: float) -> float:
+def get_height_at_position(profile: np.ndarray, position: float) -> float:
     """Interpolate the height at a given position along the wall."""
-    if not profile:
+    if len(profile) == 0:
         return 0
     
-    if position <= profile[0][0]:
-        return profile[0][1]
-    if position >= profile[-1][0]:
-        return profile[-1][1]
+    profile = np.asarray(profile)
+    return float(np.interp(position, profile[:, 0], profile[:, 1]))
+
+
+def get_heights_at_positions(xs: np.ndarray, ys: np.ndarray,
+                             positions: np.ndarray) -> np.ndarray:
+    """
+    Interpolate heights for many positions along a wall in one call.
     
-    for i in range(len(profile) - 1):
-        pos1, h1 = profile[i]
-        pos2, h2 = profile[i + 1]
-        
-        if pos1 <= position <= pos2:
-            if abs(pos2 - pos1) < 0.001:
-                return h1
-            t = (position - pos1) / (pos2 - pos1)
-            return h1 + t * (h2 - h1)
+    Args:
+        xs: Profile positions along the wall (ascending)
+        ys: Profile heights matching xs
+        positions: Positions to sample
     
-    return profile[-1][1]
+    Returns:
+        Array of heights, clamped to the end heights outside the profile
+    """
+    return np.interp(positions, xs, ys)
+
+
+def profile_covers(profile: np.ndarray, span_start: float, span_end: float,
+                   height: float) -> bool:
+    """
+    Check whether a wall profile stays at or above a height over a span.
+    
+    The profile is piecewise linear, so its minimum over the span is found
+    at the span ends or at a profile point inside it.
+    """
+    xs = profile[:, 0]
+    ys = profile[:, 1]
+    inside = ys[(xs > span_start) & (xs < span_end)]
+    lowest = min(np.interp((span_start, span_end), xs, ys).min(),
+                 inside.min(initial=np.inf))
+    return bool(lowest >= height)
 
 
 def get_intact_floor_count(min_height: float, floor_height: float) -> int:
@@ -136,147 +210,161 @@ def get_intact_floor_count(min_height: float, floor_height: float) -> int:
     return int(min_height / floor_height)
 
 
-def build_damaged_top_section(bm: bmesh.types.BMesh, profile: list,
-                               start_pos: Vector, direction: Vector, normal: Vector,
-                               base_z: float, thickness: float, mat_index: int = 0):
+# Quad vertex orders for one damaged wall top, as positions in the
+# (outer bottom, outer top, inner bottom, inner top) verts of a profile
+# point. Strip quads span a point and the next one (4-7); the left cap
+# uses the first point and the right cap the last.
+# Wall running with its normal on the right of its direction (seen from
+# above): (outer, inner, top) strip quads, left cap, right cap.
+_WINDING_RIGHT = (((0, 4, 5, 1), (2, 3, 7, 6), (1, 5, 7, 3)),
+                  (2, 0, 1, 3), (0, 2, 3, 1))
+# Normal on the left of the direction: the same quads, reversed.
+_WINDING_LEFT = (((0, 1, 5, 4), (2, 6, 7, 3), (1, 3, 7, 5)),
+                 (2, 3, 1, 0), (0, 1, 3, 2))
+
+
+def build_damaged_top_section_on_mesh(verts: list, faces: list, profile: np.ndarray,
+                                      start_pos: Vector, direction: Vector, normal: Vector,
+                                      base_z: float, thickness: float,
+                                      caps: tuple = ('left', 'right'),
+                                      vert_cache: dict = None):
     """
-    Build the damaged top portion of a wall with an irregular top edge.
-    Creates smooth continuous geometry following the damage profile.
+    Append the vertices and quads of one damaged wall top to shared lists.
+    
+    Nothing is written to a BMesh here: quad indices refer to the shared
+    vertex list, so any number of walls can be collected and turned into
+    mesh data in one step at the end of the build. Passing the same
+    vert_cache for every wall welds the verts they share at corners. Only
+    the end caps named in caps ('left' at the start, 'right' at the end)
+    are emitted.
     
-    Faces are created with consistent winding - normals will be fixed
-    by the post-processing step in mesh_builder.
+    Args:
+        verts: Shared list of (x, y, z) tuples to append to
+        faces: Shared list of vertex index quads to append to
+        profile: (N, 2) array of (position, height) points
+        start_pos: Start of the wall's outer face
+        direction: Unit vector along the wall
+        normal: Outward facing unit normal of the wall
+        base_z: Z height where the damaged portion starts
+        thickness: Wall thickness
+        caps: End caps to emit
+        vert_cache: Optional dict shared between walls to weld coincident verts
     """
-    if not profile or len(profile) < 2:
+    if profile is None or len(profile) < 2:
         return
+    if vert_cache is None:
+        vert_cache = {}
     
     # Filter profile to only include points above base_z
-    valid_profile = []
-    for pos, height in profile:
-        if height > base_z + 0.05:
-            valid_profile.append((pos, height))
+    profile = np.asarray(profile)
+    valid_profile = profile[profile[:, 1] > base_z + 0.05]
     
     if len(valid_profile) < 2:
         return
     
-    inner_offset = -normal * thickness
+    # Work in plain floats; walls run horizontally, so direction and
+    # normal have no z component.
+    sx, sy, sz = start_pos.x, start_pos.y, start_pos.z
+    dx, dy = direction.x, direction.y
+    ix, iy = -normal.x * thickness, -normal.y * thickness
+    bottom_z = sz + base_z
+    min_top = base_z + 0.05
     
-    # Build vertices for outer and inner faces
-    outer_bottom_verts = []
-    outer_top_verts = []
-    inner_bottom_verts = []
-    inner_top_verts = []
+    # Every quad's facing follows from the wall orientation alone: outer,
+    # top and end faces wind the same way and the inner face the other,
+    # so the orders are picked once per wall instead of tested per face
+    if dy * normal.x - dx * normal.y >= 0:
+        strip, left_cap, right_cap = _WINDING_RIGHT
+    else:
+        strip, left_cap, right_cap = _WINDING_LEFT
     
-    for pos, height in valid_profile:
-        top_z = max(height, base_z + 0.05)
-        
-        outer_pos = start_pos + direction * pos
-        outer_bottom = outer_pos + Vector((0, 0, base_z))
-        outer_top = outer_pos + Vector((0, 0, top_z))
-        
-        inner_pos = outer_pos + inner_offset
-        inner_bottom = inner_pos + Vector((0, 0, base_z))
-        inner_top = inner_pos + Vector((0, 0, top_z))
+    # Four verts per profile point: outer bottom, outer top,
+    # inner bottom, inner top
+    point_verts = []
+    for pos, height in valid_profile.tolist():
+        top_z = sz + max(height, min_top)
         
-        outer_bottom_verts.append(bm.verts.new(outer_bottom))
-        outer_top_verts.append(bm.verts.new(outer_top))
-        inner_bottom_verts.append(bm.verts.new(inner_bottom))
-        inner_top_verts.append(bm.verts.new(inner_top))
-    
-    # Create faces between adjacent vertices
-    for i in range(len(valid_profile) - 1):
-        # Outer face - should point in 'normal' direction (outward)
-        try:
-            v0 = outer_bottom_verts[i]
-            v1 = outer_bottom_verts[i+1]
-            v2 = outer_top_verts[i+1]
-            v3 = outer_top_verts[i]
-            
-            edge1 = v1.co - v0.co
-            edge2 = v3.co - v0.co
-            cross = edge1.cross(edge2)
-            
-            # Outer face should point in 'normal' direction
-            if cross.dot(normal) >= 0:
-                f = bm.faces.new([v0, v1, v2, v3])
-            else:
-                f = bm.faces.new([v0, v3, v2, v1])
-            f.material_index = mat_index
-        except: pass
+        ox = sx + dx * pos
+        oy = sy + dy * pos
         
-        # Inner face - should point in '-normal' direction (inward)
-        try:
-            v0 = inner_bottom_verts[i]
-            v1 = inner_bottom_verts[i+1]
-            v2 = inner_top_verts[i+1]
-            v3 = inner_top_verts[i]
-            
-            edge1 = v1.co - v0.co
-            edge2 = v3.co - v0.co
-            cross = edge1.cross(edge2)
-            
-            # Inner face should point opposite to 'normal' (into building)
-            if cross.dot(normal) <= 0:
-                f = bm.faces.new([v0, v1, v2, v3])
-            else:
-                f = bm.faces.new([v0, v3, v2, v1])
-            f.material_index = mat_index
-        except: pass
-        
-        # Top face - should point up (+Z)
-        try:
-            v0 = outer_top_verts[i]
-            v1 = outer_top_verts[i+1]
-            v2 = inner_top_verts[i+1]
-            v3 = inner_top_verts[i]
-            
-            edge1 = v1.co - v0.co
-            edge2 = v3.co - v0.co
-            cross = edge1.cross(edge2)
-            
-            # Top face should point up (+Z)
-            if cross.z >= 0:
-                f = bm.faces.new([v0, v1, v2, v3])
-            else:
-                f = bm.faces.new([v0, v3, v2, v1])
-            f.material_index = mat_index
-        except: pass
-    
-    # End caps
-    if len(outer_bottom_verts) >= 1:
-        # Left end cap - should point in -direction
-        try:
-            v0 = inner_bottom_verts[0]
-            v1 = outer_bottom_verts[0]
-            v2 = outer_top_verts[0]
-            v3 = inner_top_verts[0]
-            
-            edge1 = v1.co - v0.co
-            edge2 = v3.co - v0.co
-            cross = edge1.cross(edge2)
-            
-            # Left end should point opposite to direction
-            if cross.dot(direction) <= 0:
-                f = bm.faces.new([v0, v1, v2, v3])
-            else:
-                f = bm.faces.new([v0, v3, v2, v1])
-            f.material_index = mat_index
-        except: pass
-        
-        # Right end cap - should point in +direction
-        try:
-            v0 = outer_bottom_verts[-1]
-            v1 = inner_bottom_verts[-1]
-            v2 = inner_top_verts[-1]
-            v3 = outer_top_verts[-1]
-            
-            edge1 = v1.co - v0.co
-            edge2 = v3.co - v0.co
-            cross = edge1.cross(edge2)
-            
-            # Right end should point in direction
-            if cross.dot(direction) >= 0:
-                f = bm.faces.new([v0, v1, v2, v3])
-            else:
-                f = bm.faces.new([v0, v3, v2, v1])
-            f.material_index = mat_index
-        except: pass
+        point_verts.append((
+            _vert_index(verts, vert_cache, (ox, oy, bottom_z)),
+            _vert_index(verts, vert_cache, (ox, oy, top_z)),
+            _vert_index(verts, vert_cache, (ox + ix, oy + iy, bottom_z)),
+            _vert_index(verts, vert_cache, (ox + ix, oy + iy, top_z)),
+        ))
+    
+    # Outer, inner and top quads between adjacent profile points
+    for i in range(len(point_verts) - 1):
+        pair = point_verts[i] + point_verts[i + 1]
+        for quad in strip:
+            _append_quad(faces, [pair[k] for k in quad])
+    
+    # End caps close off the wall section at either end
+    if 'left' in caps:
+        _append_quad(faces, [point_verts[0][k] for k in left_cap])
+    if 'right' in caps:
+        _append_quad(faces, [point_verts[-1][k] for k in right_cap])
+
+
+def _vert_index(verts: list, vert_cache: dict, co: tuple) -> int:
+    """
+    Return the index of the vertex at co, appending it if it is new.
+    
+    Coordinates are keyed at 0.1 mm so that walls meeting at a corner
+    share their coincident verts instead of duplicating them.
+    """
+    key = (round(co[0] * 1e4), round(co[1] * 1e4), round(co[2] * 1e4))
+    index = vert_cache.get(key)
+    if index is None:
+        index = len(verts)
+        verts.append(co)
+        vert_cache[key] = index
+    return index
+
+
+def _append_quad(faces: list, quad: list):
+    """Append a quad unless shared verts have collapsed it."""
+    if len(set(quad)) == 4:
+        faces.append(quad)
+
+
+def build_damaged_top_section(bm: bmesh.types.BMesh, profile: np.ndarray,
+                               start_pos: Vector, direction: Vector, normal: Vector,
+                               base_z: float, thickness: float, mat_index: int = 0,
+                               caps: tuple = ('left', 'right')):
+    """
+    Build the damaged top portion of a wall with an irregular top edge.
+    Creates smooth continuous geometry following the damage profile.
+    
+    Vertices and quads are collected as flat index data and appended to
+    the BMesh in one bulk submission. Pass a subset of caps to skip end
+    caps that are hidden against an adjoining wall.
+    """
+    verts = []
+    faces = []
+    build_damaged_top_section_on_mesh(verts, faces, profile, start_pos, direction,
+                                      normal, base_z, thickness, caps)
+    util.add_geometry_bulk(bm, verts, faces, mat_index)
+
+
+def build_all_damaged_tops(bm: bmesh.types.BMesh, walls: list, base_z: float,
+                           thickness: float, mat_index: int = 0):
+    """
+    Build the damaged tops of several walls with a single bulk submission.
+    
+    Args:
+        bm: BMesh to add geometry to
+        walls: List of (profile, start_pos, direction, normal, caps) per
+            wall, with each profile an (N, 2) array of (position, height)
+        base_z: Z height where the damaged portion starts
+        thickness: Wall thickness
+        mat_index: Material slot index for all faces
+    """
+    verts = []
+    faces = []
+    vert_cache = {}
+    for profile, start_pos, direction, normal, caps in walls:
+        build_damaged_top_section_on_mesh(verts, faces, profile, start_pos, direction,
+                                          normal, base_z, thickness, caps, vert_cache)
+    util.add_geometry_bulk(bm, verts, faces, mat_index)
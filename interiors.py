@@ -9,7 +9,18 @@
 # 5. Every room needs at least one doorway
 # 6. Stair zones are consistent across all floors (vertical alignment)
 
+import math
+from bisect import bisect_left
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from functools import lru_cache, partial, wraps
+from itertools import compress
+from types import MappingProxyType
+from typing import NamedTuple
+
 import bmesh
+import numpy as np
 from mathutils import Vector
 from . import util
 
@@ -41,11 +52,40 @@ DOOR_WIDTH = 0.9            # Standard interior door width
 EXTERIOR_DOOR_WIDTH = 1.0   # Exterior door width
 WALL_CLEARANCE = 0.3        # Minimum clearance from windows/doors for wall attachment
 
+# Exterior walls with windows for each window_sides option, as a bit mask.
+# Unknown options get no windows, like NONE
+WINDOW_SIDE_FRONT = 1
+WINDOW_SIDE_BACK = 2
+WINDOW_SIDE_LEFT = 4
+WINDOW_SIDE_RIGHT = 8
+WINDOW_SIDES_MASK = {
+    'ALL': 0b1111,
+    'FRONT_BACK': WINDOW_SIDE_FRONT | WINDOW_SIDE_BACK,
+    'FRONT_SIDES': WINDOW_SIDE_FRONT | WINDOW_SIDE_LEFT | WINDOW_SIDE_RIGHT,
+    'FRONT_ONLY': WINDOW_SIDE_FRONT,
+    'FRONT_LEFT': WINDOW_SIDE_FRONT | WINDOW_SIDE_LEFT,
+    'FRONT_RIGHT': WINDOW_SIDE_FRONT | WINDOW_SIDE_RIGHT,
+    'BACK_SIDES': WINDOW_SIDE_BACK | WINDOW_SIDE_LEFT | WINDOW_SIDE_RIGHT,
+    'SIDES_ONLY': WINDOW_SIDE_LEFT | WINDOW_SIDE_RIGHT,
+    'NONE': 0,
+}
+
+# The same options resolved once into the walls that get windows, split by
+# the wall length their windows are spread over: (front/back, left/right)
+_WINDOW_WALLS = {
+    sides: (tuple(wall for wall, bit in (('front', WINDOW_SIDE_FRONT), ('back', WINDOW_SIDE_BACK))
+                  if mask & bit),
+            tuple(wall for wall, bit in (('left', WINDOW_SIDE_LEFT), ('right', WINDOW_SIDE_RIGHT))
+                  if mask & bit))
+    for sides, mask in WINDOW_SIDES_MASK.items()
+}
+
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+@lru_cache(maxsize=256)
 def get_interior_bounds(width: float, depth: float, wall_thickness: float) -> tuple:
     """
     Get the interior bounds of a building (inside the exterior walls).
@@ -61,47 +101,79 @@ def get_interior_bounds(width: float, depth: float, wall_thickness: float) -> tu
     )
 
 
+class _WindowPositions(dict):
+    """
+    Result of get_window_positions: a plain dict of opening lists.
+    
+    It also carries the cached per-wall lookup index the lists were made
+    from, so the opening lookups don't have to rebuild it (see
+    _opening_index).
+    """
+    __slots__ = ('index',)
+    
+    def __init__(self, index: Mapping):
+        super().__init__((wall, list(map(tuple, openings['intervals'].tolist())))
+                         for wall, openings in index.items())
+        self.index = index
+
+
 def get_window_positions(width: float, depth: float, params: dict) -> dict:
     """
     Calculate window positions on each exterior wall.
     
     Returns:
         Dict with 'front', 'back', 'left', 'right' keys, each containing
-        list of (start, end) tuples indicating window positions along that wall.
+        list of (start, end) tuples indicating window positions along that
+        wall, sorted by start.
     """
-    wall_thickness = params.get('wall_thickness', 0.25)
-    window_width = params.get('window_width', 1.2)
-    window_spacing = params.get('window_spacing', 0.8)
-    windows_per_floor = params.get('windows_per_floor', 3)
-    door_width = params.get('door_width', 1.2)
-    front_door_offset = params.get('front_door_offset', 0.1)
-    back_exit = params.get('back_exit', False)
-    back_door_offset = params.get('back_door_offset', 0.5)
+    return _WindowPositions(_window_positions(
+        width, depth,
+        wall_thickness=params.get('wall_thickness', 0.25),
+        window_width=params.get('window_width', 1.2),
+        window_spacing=params.get('window_spacing', 0.8),
+        windows_per_floor=params.get('windows_per_floor', 3),
+        door_width=params.get('door_width', 1.2),
+        front_door_offset=params.get('front_door_offset', 0.1),
+        back_exit=params.get('back_exit', False),
+        back_door_offset=params.get('back_door_offset', 0.5),
+        window_sides=params.get('window_sides', 'ALL'),
+    ))
+
+
+@lru_cache(maxsize=256)
+def _window_positions(width: float, depth: float, *, wall_thickness: float, window_width: float,
+                      window_spacing: float, windows_per_floor: int, door_width: float,
+                      front_door_offset: float, back_exit: bool, back_door_offset: float,
+                      window_sides: str) -> Mapping:
+    """
+    Cached body of get_window_positions, keyed on the scalar parameters it reads.
     
+    Returns:
+        Read-only mapping from wall name to its lookup index (see
+        _index_openings)
+    """
     # Determine which sides have windows
-    window_sides = params.get('window_sides', 'ALL')
-    has_front_windows = window_sides in ('ALL', 'FRONT_BACK', 'FRONT_SIDES', 'FRONT_ONLY', 'FRONT_LEFT', 'FRONT_RIGHT')
-    has_back_windows = window_sides in ('ALL', 'FRONT_BACK', 'BACK_SIDES')
-    has_left_windows = window_sides in ('ALL', 'FRONT_SIDES', 'FRONT_LEFT', 'BACK_SIDES', 'SIDES_ONLY')
-    has_right_windows = window_sides in ('ALL', 'FRONT_SIDES', 'FRONT_RIGHT', 'BACK_SIDES', 'SIDES_ONLY')
+    front_back_walls, side_walls = _WINDOW_WALLS.get(window_sides, _WINDOW_WALLS['NONE'])
     
+    # Each wall's openings are kept as an (N, 2) array sorted by start
+    no_openings = np.empty((0, 2))
     positions = {
-        'front': [],  # Along Y=0, positions are X coordinates
-        'back': [],   # Along Y=depth, positions are X coordinates
-        'left': [],   # Along X=0, positions are Y coordinates
-        'right': []   # Along X=width, positions are Y coordinates
+        'front': no_openings,  # Along Y=0, positions are X coordinates
+        'back': no_openings,   # Along Y=depth, positions are X coordinates
+        'left': no_openings,   # Along X=0, positions are Y coordinates
+        'right': no_openings   # Along X=width, positions are Y coordinates
     }
     
-    def calc_window_positions(wall_length: float, count: int) -> list:
-        """Calculate evenly distributed window positions along a wall."""
+    def calc_window_positions(wall_length: float, count: int) -> np.ndarray:
+        """Calculate evenly distributed window positions along a wall as an (N, 2) array."""
         if count <= 0:
-            return []
+            return np.empty((0, 2))
         
         edge_margin = max(0.3, window_spacing * 0.5)
         available_length = wall_length - (2 * edge_margin)
         
         if available_length < window_width:
-            return []
+            return np.empty((0, 2))
         
         # Limit count based on available space
         min_spacing = 0.3
@@ -109,47 +181,122 @@ def get_window_positions(width: float, depth: float, params: dict) -> dict:
         count = min(count, max_windows)
         
         if count <= 0:
-            return []
+            return np.empty((0, 2))
         
         # Calculate even spacing
         total_win_width = count * window_width
         remaining = available_length - total_win_width
         gap = remaining / (count + 1) if count >= 1 else remaining / 2
         
-        result = []
-        for i in range(count):
-            x_start = edge_margin + gap + i * (window_width + gap)
-            x_end = x_start + window_width
-            result.append((x_start, x_end))
-        
-        return result
+        idx = np.arange(count, dtype=np.float64)
+        starts = edge_margin + gap + idx * (window_width + gap)
+        return np.column_stack([starts, starts + window_width])
     
     # Calculate window positions for front/back walls (evenly distributed)
-    if has_front_windows or has_back_windows:
+    if front_back_walls:
         front_back_positions = calc_window_positions(width, windows_per_floor)
-        if has_front_windows:
-            positions['front'].extend(front_back_positions)
-        if has_back_windows:
-            positions['back'].extend(front_back_positions)
+        for wall in front_back_walls:
+            positions[wall] = front_back_positions
     
     # Add door positions (doors are always added regardless of window settings)
     door_x = front_door_offset * (width - door_width)
-    positions['front'].append((door_x, door_x + door_width))
+    positions['front'] = _insert_opening(positions['front'], door_x, door_x + door_width)
     
     if back_exit:
         back_door_x = back_door_offset * (width - door_width)
-        positions['back'].append((back_door_x, back_door_x + door_width))
+        positions['back'] = _insert_opening(positions['back'], back_door_x,
+                                            back_door_x + door_width)
     
     # Side wall windows (fewer, evenly distributed)
-    side_windows = max(1, windows_per_floor // 2)
-    if has_left_windows or has_right_windows:
-        side_positions = calc_window_positions(depth, side_windows)
-        if has_left_windows:
-            positions['left'].extend(side_positions)
-        if has_right_windows:
-            positions['right'].extend(side_positions)
+    if side_walls:
+        side_positions = calc_window_positions(depth, max(1, windows_per_floor // 2))
+        for wall in side_walls:
+            positions[wall] = side_positions
+    
+    # Interior span of each wall, the range interior walls can attach in
+    wall_lengths = {'front': width, 'back': width, 'left': depth, 'right': depth}
+    return MappingProxyType({
+        wall: _index_openings(openings, wall_thickness, wall_lengths[wall] - wall_thickness)
+        for wall, openings in positions.items()
+    })
+
+
+def _insert_opening(openings: np.ndarray, start: float, end: float) -> np.ndarray:
+    """Insert an opening into a start-sorted (N, 2) array, keeping it sorted."""
+    index = np.searchsorted(openings[:, 0], start, side='right')
+    return np.insert(openings, index, (start, end), axis=0)
+
+
+def _index_openings(intervals: np.ndarray, min_pos: float = None,
+                    max_pos: float = None) -> Mapping:
+    """
+    Prepare a wall's openings for binary-search lookups.
+    
+    Each opening is widened by WALL_CLEARANCE and overlapping spans (a door
+    cutting into a window, for instance) are merged, leaving disjoint
+    sorted spans that bisect can search directly. The safe zones between
+    them over the wall's interior span are computed here too, when it is
+    known.
+    
+    Args:
+        intervals: (N, 2) array of (start, end) rows along the wall, sorted
+            by start
+        min_pos: Start of the wall's interior span, or None if unknown
+        max_pos: End of the wall's interior span, or None if unknown
+    
+    Returns:
+        Read-only mapping with 'intervals' (the openings, made read-only),
+        'starts' / 'ends' tuples of the merged, clearance-expanded spans,
+        'min_pos' / 'max_pos' and the matching 'safe_edges' tuple (see
+        _safe_zone_edges), None without a known span
+    """
+    span_starts = intervals[:, 0] - WALL_CLEARANCE
+    span_reach = np.maximum.accumulate(intervals[:, 1] + WALL_CLEARANCE)
+    # A span opens a new group unless it starts within the reach of the ones before
+    opens_group = np.ones(len(intervals), dtype=bool)
+    opens_group[1:] = span_starts[1:] > span_reach[:-1]
+    # The last span always closes a group; rolling brings in opens_group[0] (True)
+    closes_group = np.roll(opens_group, -1)
+    
+    intervals.flags.writeable = False
+    starts = tuple(span_starts[opens_group].tolist())
+    ends = tuple(span_reach[closes_group].tolist())
+    safe_edges = None
+    if min_pos is not None and max_pos is not None:
+        safe_edges = tuple(_safe_zone_edges(starts, ends, min_pos, max_pos).tolist())
+    return MappingProxyType({'intervals': intervals, 'starts': starts, 'ends': ends,
+                             'min_pos': min_pos, 'max_pos': max_pos,
+                             'safe_edges': safe_edges})
+
+
+def _safe_zone_edges(starts: tuple, ends: tuple, min_pos: float, max_pos: float) -> np.ndarray:
+    """
+    Edges of the gaps between opening spans where walls can safely attach.
+    
+    Zones start at min_pos and the last one closes at max_pos.
+    
+    Returns:
+        Flattened [start0, end0, start1, end1, ...] array, non-decreasing
+    """
+    zone_starts = np.maximum(min_pos, np.concatenate(([min_pos], ends)))
+    zone_ends = np.append(starts, max_pos)
+    has_gap = zone_starts < zone_ends
+    return np.column_stack([zone_starts[has_gap], zone_ends[has_gap]]).ravel()
+
+
+def _opening_index(window_positions: dict, wall: str) -> Mapping:
+    """
+    Return the lookup index of a wall's openings, or None without openings.
     
-    return positions
+    Results of get_window_positions carry their index; for other dicts of
+    (start, end) lists it is built here, without a known interior span.
+    """
+    if isinstance(window_positions, _WindowPositions):
+        return window_positions.index.get(wall)
+    openings = window_positions.get(wall)
+    if not openings:
+        return None
+    return _index_openings(np.array(sorted(openings), dtype=np.float64).reshape(-1, 2))
 
 
 def is_position_blocked_by_opening(pos: float, wall: str, window_positions: dict) -> bool:
@@ -164,16 +311,17 @@ def is_position_blocked_by_opening(pos: float, wall: str, window_positions: dict
     Returns:
         True if position would block a window/door
     """
-    openings = window_positions.get(wall, [])
-    for start, end in openings:
-        # Check if pos is within the opening (with clearance)
-        if start - WALL_CLEARANCE <= pos <= end + WALL_CLEARANCE:
-            return True
-    return False
+    openings = _opening_index(window_positions, wall)
+    if openings is None:
+        return False
+    # First span that ends at or after pos; blocked if it also starts before pos
+    starts = openings['starts']
+    i = bisect_left(openings['ends'], pos)
+    return i < len(starts) and starts[i] <= pos
 
 
 def find_safe_wall_attachment(target_pos: float, wall: str, window_positions: dict,
-                               min_pos: float, max_pos: float) -> float:
+                               min_pos: float = None, max_pos: float = None) -> float:
     """
     Find a safe position to attach an interior wall that doesn't block openings.
     
@@ -181,8 +329,10 @@ def find_safe_wall_attachment(target_pos: float, wall: str, window_positions: di
         target_pos: Desired position
         wall: Which exterior wall
         window_positions: Opening positions
-        min_pos: Minimum allowed position
-        max_pos: Maximum allowed position
+        min_pos: Minimum allowed position (defaults to the wall's interior
+            span for the output of get_window_positions)
+        max_pos: Maximum allowed position (defaults to the wall's interior
+            span for the output of get_window_positions)
     
     Returns:
         Safe position, or None if no safe position found
@@ -190,64 +340,80 @@ def find_safe_wall_attachment(target_pos: float, wall: str, window_positions: di
     if not is_position_blocked_by_opening(target_pos, wall, window_positions):
         return target_pos
     
-    openings = window_positions.get(wall, [])
-    
-    # Find gaps between openings where we can safely place walls
-    safe_zones = []
-    current_pos = min_pos
-    
-    sorted_openings = sorted(openings, key=lambda x: x[0])
-    for start, end in sorted_openings:
-        if current_pos < start - WALL_CLEARANCE:
-            safe_zones.append((current_pos, start - WALL_CLEARANCE))
-        current_pos = max(current_pos, end + WALL_CLEARANCE)
-    
-    if current_pos < max_pos:
-        safe_zones.append((current_pos, max_pos))
+    openings = _opening_index(window_positions, wall)
+    if openings is None:
+        # No openings recorded on this wall, so nothing can block the target
+        return target_pos
+    if min_pos is None:
+        min_pos = openings['min_pos']
+    if max_pos is None:
+        max_pos = openings['max_pos']
+    if min_pos is None or max_pos is None:
+        raise ValueError("min_pos and max_pos are required for window "
+                         "positions not made by get_window_positions")
+    
+    # Safe zones over the interior span are precomputed with the openings
+    if min_pos == openings['min_pos'] and max_pos == openings['max_pos']:
+        edges = openings['safe_edges']
+    else:
+        edges = _safe_zone_edges(openings['starts'], openings['ends'], min_pos, max_pos).tolist()
     
-    # Find the safe zone closest to target
-    best_pos = None
-    best_dist = float('inf')
+    if not len(edges):
+        return None
     
-    for zone_start, zone_end in safe_zones:
-        # Check if target is in this zone
-        if zone_start <= target_pos <= zone_end:
-            return target_pos
-        
-        # Find closest edge of this zone
-        for edge in [zone_start, zone_end]:
-            dist = abs(edge - target_pos)
-            if dist < best_dist:
-                best_dist = dist
-                best_pos = edge
+    # First edge at or after the target; an odd index (or landing exactly on
+    # a zone start) means the target lies inside that zone. The edges are
+    # sorted, so the nearest one is a neighbour of i and no argmin over all
+    # of them is needed
+    i = bisect_left(edges, target_pos)
+    if i < len(edges) and (i % 2 == 1 or edges[i] == target_pos):
+        return target_pos
     
-    return best_pos
+    # Otherwise the closest safe position is the nearest edge on either side
+    if i == 0:
+        return edges[0]
+    if i == len(edges) or target_pos - edges[i - 1] <= edges[i] - target_pos:
+        return edges[i - 1]
+    return edges[i]
 
 
-def validate_room_size(room_width: float, room_depth: float) -> bool:
+def validate_room_size(room_width: float, room_depth: float,
+                       min_room_size: float = MIN_ROOM_SIZE,
+                       min_room_area: float = MIN_ROOM_AREA) -> bool:
     """
     Check if a room meets minimum size requirements.
     
     Args:
         room_width: Room width in meters
         room_depth: Room depth in meters
+        min_room_size: Minimum room dimension
+        min_room_area: Minimum room area
     
     Returns:
         True if room is large enough to be usable
     """
+    return bool(_validate_room_size(float(room_width), float(room_depth),
+                                    min_room_size, min_room_area))
+
+
+@util.njit(cache=True)
+def _validate_room_size(room_width, room_depth, min_room_size, min_room_area):
+    """Compiled body of validate_room_size with the room constants passed in."""
     # Check minimum dimensions
-    if room_width < MIN_ROOM_SIZE or room_depth < MIN_ROOM_SIZE:
+    if room_width < min_room_size or room_depth < min_room_size:
         return False
     
     # Check minimum area
-    if room_width * room_depth < MIN_ROOM_AREA:
+    if room_width * room_depth < min_room_area:
         return False
     
     return True
 
 
 def validate_wall_placement(wall_pos: float, axis_min: float, axis_max: float,
-                            interior_bounds: tuple) -> tuple:
+                            interior_bounds: tuple,
+                            min_room_size: float = MIN_ROOM_SIZE,
+                            min_wall_offset: float = MIN_WALL_OFFSET) -> tuple:
     """
     Validate and adjust interior wall position to create usable rooms.
     
@@ -256,10 +422,21 @@ def validate_wall_placement(wall_pos: float, axis_min: float, axis_max: float,
         axis_min: Minimum position on this axis (interior bound)
         axis_max: Maximum position on this axis (interior bound)
         interior_bounds: (ix_min, iy_min, ix_max, iy_max) interior bounds
+        min_room_size: Minimum room dimension on either side of the wall
+        min_wall_offset: Minimum distance of the wall from the exterior walls
     
     Returns:
         Tuple of (adjusted_pos, is_valid) where is_valid indicates if wall should be placed
     """
+    adjusted_pos, is_valid = _validate_wall_placement(float(wall_pos), float(axis_min),
+                                                      float(axis_max), min_room_size,
+                                                      min_wall_offset)
+    return adjusted_pos, bool(is_valid)
+
+
+@util.njit(cache=True, fastmath=True)
+def _validate_wall_placement(wall_pos, axis_min, axis_max, min_room_size, min_wall_offset):
+    """Compiled body of validate_wall_placement with the room constants passed in."""
     axis_length = axis_max - axis_min
     
     # Room on either side of the wall must meet minimum size
@@ -267,11 +444,11 @@ def validate_wall_placement(wall_pos: float, axis_min: float, axis_max: float,
     room2_size = axis_max - wall_pos
     
     # If interior is too small for two rooms, don't place wall
-    if axis_length < MIN_ROOM_SIZE * 2 + 0.5:  # Need space for 2 rooms + wall
+    if axis_length < min_room_size * 2 + 0.5:  # Need space for 2 rooms + wall
         return wall_pos, False
     
     # Ensure wall isn't too close to exterior walls
-    min_from_edge = max(MIN_WALL_OFFSET, MIN_ROOM_SIZE)
+    min_from_edge = max(min_wall_offset, min_room_size)
     
     if room1_size < min_from_edge:
         # Wall too close to min edge - move it
@@ -286,7 +463,7 @@ def validate_wall_placement(wall_pos: float, axis_min: float, axis_max: float,
         room1_size = wall_pos - axis_min
     
     # Final validation - both rooms must be usable
-    if room1_size < MIN_ROOM_SIZE or room2_size < MIN_ROOM_SIZE:
+    if room1_size < min_room_size or room2_size < min_room_size:
         return wall_pos, False
     
     return wall_pos, True
@@ -309,12 +486,19 @@ def calculate_optimal_divider_position(axis_min: float, axis_max: float,
     """
     if min_room_size is None:
         min_room_size = MIN_ROOM_SIZE
-    
+    pos = _optimal_divider_position(float(axis_min), float(axis_max),
+                                    float(target_ratio), float(min_room_size))
+    return None if math.isnan(pos) else pos
+
+
+@util.njit(cache=True)
+def _optimal_divider_position(axis_min, axis_max, target_ratio, min_room_size):
+    """Compiled body of calculate_optimal_divider_position; returns nan instead of None."""
     axis_length = axis_max - axis_min
     
     # Check if there's enough space for two rooms
     if axis_length < min_room_size * 2:
-        return None
+        return math.nan
     
     # Calculate target position
     target_pos = axis_min + axis_length * target_ratio
@@ -326,6 +510,64 @@ def calculate_optimal_divider_position(axis_min: float, axis_max: float,
     return max(min_pos, min(max_pos, target_pos))
 
 
+@dataclass(slots=True, frozen=True)
+class WallDef:
+    """
+    Definition of one interior wall segment.
+    
+    Walls run from start to end on the floor plane, both plain (x, y)
+    tuples; build_interior_walls emits the geometry for whole lists of
+    them. height and thickness describe the box built for them, and
+    openings is reserved for openings cut into the wall. Records are
+    immutable since cached layouts share them; derive changed walls with
+    dataclasses.replace.
+    """
+    start: tuple
+    end: tuple
+    height: float
+    thickness: float
+    openings: tuple = ()
+    
+    def __copy__(self) -> 'WallDef':
+        return replace(self)
+
+
+@dataclass(slots=True, frozen=True)
+class RoomDef:
+    """
+    Definition of one room in a floor layout.
+    
+    bounds is the (x_min, y_min, x_max, y_max) rectangle of the room and
+    type its use ('retail', 'storage', 'apartment', ...).
+    """
+    name: str
+    bounds: tuple
+    type: str
+
+
+@dataclass(slots=True)
+class WallArray:
+    """
+    Structure-of-arrays layout of wall endpoints.
+    
+    Holds the start (x0, y0) and end (x1, y1) of every wall as parallel
+    float64 arrays so zone tests run over all walls in one NumPy expression.
+    """
+    x0: np.ndarray
+    y0: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+    
+    @classmethod
+    def from_wall_defs(cls, wall_defs: list) -> 'WallArray':
+        """Gather the endpoints of a list of wall definitions."""
+        coords = np.array([(*w.start, *w.end) for w in wall_defs], dtype=np.float64)
+        return cls(*coords.reshape(-1, 4).T)
+    
+    def __len__(self) -> int:
+        return len(self.x0)
+
+
 def is_wall_cardinal(wall_start: Vector, wall_end: Vector) -> bool:
     """Check if a wall runs in a cardinal direction (along X or Y axis)."""
     dx = abs(wall_end.x - wall_start.x)
@@ -357,24 +599,23 @@ def create_l_shaped_wall(corner: Vector, end_a: Vector, end_b: Vector,
         List of two wall definitions that form an L-shape
     """
     walls = []
+    corner = (corner[0], corner[1])
     
     # First segment: corner to end_a
-    walls.append({
-        'start': corner.copy(),
-        'end': end_a.copy(),
-        'height': height,
-        'thickness': thickness,
-        'openings': []
-    })
+    walls.append(WallDef(
+        start=corner,
+        end=(end_a[0], end_a[1]),
+        height=height,
+        thickness=thickness
+    ))
     
     # Second segment: corner to end_b
-    walls.append({
-        'start': corner.copy(),
-        'end': end_b.copy(),
-        'height': height,
-        'thickness': thickness,
-        'openings': []
-    })
+    walls.append(WallDef(
+        start=corner,
+        end=(end_b[0], end_b[1]),
+        height=height,
+        thickness=thickness
+    ))
     
     return walls
 
@@ -390,7 +631,8 @@ def validate_and_adjust_cardinal_wall(wall_start: Vector, wall_end: Vector,
     - Along X axis (constant Y) - east-west walls
     - Along Y axis (constant X) - north-south walls
     
-    Non-cardinal (diagonal) walls are rejected.
+    Non-cardinal (diagonal) walls are rejected. validate_cardinal_batch
+    runs the same checks over arrays of walls.
     
     Returns:
         Tuple of (adjusted_start, adjusted_end) or (None, None) if wall can't be placed
@@ -445,8 +687,73 @@ def validate_and_adjust_cardinal_wall(wall_start: Vector, wall_end: Vector,
     return adjusted_start, adjusted_end
 
 
+def validate_cardinal_batch(walls: WallArray, ix_min: float, iy_min: float,
+                            ix_max: float, iy_max: float,
+                            window_positions: dict) -> tuple:
+    """
+    Validate and straighten many walls in one pass.
+    
+    Diagonal walls (more than 10cm of movement on both axes) are rejected,
+    the rest are forced perfectly cardinal by averaging their fixed
+    coordinate, and walls whose ends touch an exterior wall where a window
+    or door would be blocked are rejected.
+    
+    Args:
+        walls: Candidate walls
+        ix_min, iy_min, ix_max, iy_max: Interior bounds
+        window_positions: Output from get_window_positions()
+    
+    Returns:
+        Tuple of (keep, adjusted): a boolean mask over the input walls and
+        a WallArray of the straightened walls that were kept
+    """
+    dx = np.abs(walls.x1 - walls.x0)
+    dy = np.abs(walls.y1 - walls.y0)
+    along_x = dx > dy
+    
+    # Average the fixed coordinate to straighten each wall
+    wall_y = (walls.y0 + walls.y1) / 2
+    wall_x = (walls.x0 + walls.x1) / 2
+    
+    # Ends touching an exterior wall must not land on an opening there
+    blocked = (
+        (along_x & (np.abs(walls.x0 - ix_min) < 0.01) & _blocked_batch(wall_y, 'left', window_positions)) |
+        (along_x & (np.abs(walls.x1 - ix_max) < 0.01) & _blocked_batch(wall_y, 'right', window_positions)) |
+        (~along_x & (np.abs(walls.y0 - iy_min) < 0.01) & _blocked_batch(wall_x, 'front', window_positions)) |
+        (~along_x & (np.abs(walls.y1 - iy_max) < 0.01) & _blocked_batch(wall_x, 'back', window_positions))
+    )
+    keep = ~((dx > 0.1) & (dy > 0.1)) & ~blocked
+    
+    x0 = np.where(along_x, walls.x0, wall_x)
+    x1 = np.where(along_x, walls.x1, wall_x)
+    y0 = np.where(along_x, wall_y, walls.y0)
+    y1 = np.where(along_x, wall_y, walls.y1)
+    return keep, WallArray(x0[keep], y0[keep], x1[keep], y1[keep])
+
+
+def _blocked_batch(positions: np.ndarray, wall: str, window_positions: dict) -> np.ndarray:
+    """Batch version of is_position_blocked_by_opening."""
+    openings = _opening_index(window_positions, wall)
+    if openings is None or not openings['starts']:
+        return np.zeros(len(positions), dtype=bool)
+    starts = np.asarray(openings['starts'])
+    ends = np.asarray(openings['ends'])
+    i = np.searchsorted(ends, positions, side='left')
+    inside = i < len(starts)
+    return inside & (starts[np.minimum(i, len(starts) - 1)] <= positions)
+
+
+class Zone(NamedTuple):
+    """Axis-aligned rectangle on the floor plan, such as the stair zone."""
+    x_min: float
+    y_min: float
+    x_max: float
+    y_max: float
+
+
+@lru_cache(maxsize=256)
 def get_stair_zone(width: float, depth: float, wall_thickness: float, 
-                   position: str = 'back_right') -> dict:
+                   position: str = 'back_right') -> Zone:
     """
     Calculate the stair zone - a reserved area for stairs that is consistent across all floors.
     
@@ -457,7 +764,7 @@ def get_stair_zone(width: float, depth: float, wall_thickness: float,
         position: Where to place stairs ('back_right', 'back_left', 'back_center', 'front_right', etc.)
     
     Returns:
-        Dict with 'x_min', 'y_min', 'x_max', 'y_max' defining the stair zone
+        Zone defining the stair zone
     """
     ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
     interior_width = ix_max - ix_min
@@ -488,136 +795,217 @@ def get_stair_zone(width: float, depth: float, wall_thickness: float,
         y_max = iy_max - wall_margin
         y_min = y_max - zone_depth
     
-    return {
-        'x_min': x_min,
-        'y_min': y_min,
-        'x_max': x_max,
-        'y_max': y_max
-    }
+    return Zone(x_min, y_min, x_max, y_max)
 
 
+@lru_cache(maxsize=256)
 def get_floor_opening(width: float, depth: float, wall_thickness: float,
-                      stair_position: str = 'back_right') -> dict:
+                      stair_position: str = 'back_right') -> Zone:
     """
     Get the floor slab opening for stair access. This is used for ALL multi-floor buildings.
     
     Returns:
-        Dict with 'x_min', 'y_min', 'x_max', 'y_max' for the opening
+        Zone of the opening
     """
-    stair_zone = get_stair_zone(width, depth, wall_thickness, stair_position)
+    x_min, y_min, x_max, y_max = get_stair_zone(width, depth, wall_thickness, stair_position)
     
     # Opening is slightly smaller than stair zone (allow for framing)
     margin = 0.1
-    return {
-        'x_min': stair_zone['x_min'] + margin,
-        'y_min': stair_zone['y_min'] + margin,
-        'x_max': stair_zone['x_max'] - margin,
-        'y_max': stair_zone['y_max'] - margin
-    }
+    return Zone(x_min + margin, y_min + margin, x_max - margin, y_max - margin)
 
 
-def walls_overlap_zone(wall_start: Vector, wall_end: Vector, zone: dict) -> bool:
+def walls_overlap_zone(wall_start: tuple, wall_end: tuple, zone: Zone) -> bool:
     """Check if a wall segment would pass through a zone (like stair zone)."""
-    # Get wall bounding box
-    wall_x_min = min(wall_start.x, wall_end.x)
-    wall_x_max = max(wall_start.x, wall_end.x)
-    wall_y_min = min(wall_start.y, wall_end.y)
-    wall_y_max = max(wall_start.y, wall_end.y)
+    x_min, y_min, x_max, y_max = zone
+    sx, sy = wall_start[0], wall_start[1]
+    ex, ey = wall_end[0], wall_end[1]
     
-    # Check for overlap
-    x_overlap = wall_x_min < zone['x_max'] and wall_x_max > zone['x_min']
-    y_overlap = wall_y_min < zone['y_max'] and wall_y_max > zone['y_min']
-    
-    return x_overlap and y_overlap
+    # Overlap of the wall's bounding box with the zone
+    return (min(sx, ex) < x_max and max(sx, ex) > x_min and
+            min(sy, ey) < y_max and max(sy, ey) > y_min)
 
 
-def adjust_wall_for_stair_zone(wall_def: dict, stair_zone: dict) -> list:
+def adjust_wall_for_stair_zone(wall_def: WallDef, stair_zone: Zone) -> list:
     """
     Adjust a wall definition to avoid the stair zone.
     Returns a list of wall segments (may split the wall or shorten it).
     """
-    start = wall_def['start']
-    end = wall_def['end']
+    # Bounding-box reject before calling into the split kernel
+    if not walls_overlap_zone(wall_def.start, wall_def.end, stair_zone):
+        return [wall_def]
     
-    if not walls_overlap_zone(start, end, stair_zone):
+    (sx, sy), (ex, ey) = wall_def.start, wall_def.end
+    x_min, y_min, x_max, y_max = stair_zone
+    split, keep_lo, keep_hi, lo_x, lo_y, hi_x, hi_y = _split_wall(
+        float(sx), float(sy), float(ex), float(ey),
+        float(x_min), float(y_min), float(x_max), float(y_max))
+    if not split:
         return [wall_def]
     
-    # Wall overlaps stair zone - need to split or shorten
-    walls = []
+    pieces = []
+    if keep_lo:
+        pieces.append(replace(wall_def, end=(lo_x, lo_y)))
+    if keep_hi:
+        pieces.append(replace(wall_def, start=(hi_x, hi_y)))
+    return pieces
+
+
+def adjust_walls_for_stair_zone(wall_defs: list, stair_zone: Zone) -> list:
+    """
+    Adjust several wall definitions to avoid the stair zone.
     
-    # Determine if wall is primarily horizontal (along X) or vertical (along Y)
-    is_horizontal = abs(end.x - start.x) > abs(end.y - start.y)
-    
-    if is_horizontal:
-        # Wall runs along X axis at some Y position
-        wall_y = start.y
-        # Check if wall Y is within stair zone Y range
-        if stair_zone['y_min'] <= wall_y <= stair_zone['y_max']:
-            # Need to split wall around stair zone
-            if start.x < stair_zone['x_min']:
-                # Left portion
-                new_wall = wall_def.copy()
-                new_wall['start'] = start.copy()
-                new_wall['end'] = Vector((stair_zone['x_min'], wall_y, 0))
-                if (new_wall['end'] - new_wall['start']).length > 0.3:
-                    walls.append(new_wall)
-            
-            if end.x > stair_zone['x_max']:
-                # Right portion
-                new_wall = wall_def.copy()
-                new_wall['start'] = Vector((stair_zone['x_max'], wall_y, 0))
-                new_wall['end'] = end.copy()
-                if (new_wall['end'] - new_wall['start']).length > 0.3:
-                    walls.append(new_wall)
-        else:
-            walls.append(wall_def)
+    Args:
+        wall_defs: Wall definitions, like the pair on either side of a door
+        stair_zone: Zone to keep clear
+    
+    Returns:
+        List of wall segments, in the order of the walls they came from
+    """
+    return [piece for wall_def in wall_defs
+            for piece in adjust_wall_for_stair_zone(wall_def, stair_zone)]
+
+
+@util.njit(cache=True)
+def _split_wall(sx, sy, ex, ey, x_min, y_min, x_max, y_max):
+    """
+    Split a wall around a zone.
+    
+    Walls that cross the zone are cut into the portions on either side of
+    it, and portions of 0.3m or less are dropped.
+    
+    Returns:
+        Tuple of (split, keep_lo, keep_hi, lo_x, lo_y, hi_x, hi_y): whether
+        the wall overlaps the zone, which pieces survive, and the cut points
+        ending the low piece and starting the high one
+    """
+    along_x = abs(ex - sx) > abs(ey - sy)
+    if along_x:
+        run_start, run_end, fixed, fixed_end = sx, ex, sy, ey
+        cut_lo, cut_hi = x_min, x_max
+        fixed_inside = y_min <= sy <= y_max
     else:
-        # Wall runs along Y axis at some X position
-        wall_x = start.x
-        if stair_zone['x_min'] <= wall_x <= stair_zone['x_max']:
-            # Need to split wall around stair zone
-            if start.y < stair_zone['y_min']:
-                new_wall = wall_def.copy()
-                new_wall['start'] = start.copy()
-                new_wall['end'] = Vector((wall_x, stair_zone['y_min'], 0))
-                if (new_wall['end'] - new_wall['start']).length > 0.3:
-                    walls.append(new_wall)
-            
-            if end.y > stair_zone['y_max']:
-                new_wall = wall_def.copy()
-                new_wall['start'] = Vector((wall_x, stair_zone['y_max'], 0))
-                new_wall['end'] = end.copy()
-                if (new_wall['end'] - new_wall['start']).length > 0.3:
-                    walls.append(new_wall)
-        else:
-            walls.append(wall_def)
+        run_start, run_end, fixed, fixed_end = sy, ey, sx, ex
+        cut_lo, cut_hi = y_min, y_max
+        fixed_inside = x_min <= sx <= x_max
+    
+    split = (fixed_inside and
+             min(sx, ex) < x_max and max(sx, ex) > x_min and
+             min(sy, ey) < y_max and max(sy, ey) > y_min)
+    
+    # The low piece runs along the fixed coordinate, so its length is just
+    # the run difference; the high piece ends at the wall's own end point,
+    # which a nearly cardinal wall may have slightly off the fixed line, so
+    # its squared length is compared instead of taking a square root
+    hi_run = run_end - cut_hi
+    hi_drift = fixed_end - fixed
+    keep_lo = split and run_start < cut_lo and cut_lo - run_start > 0.3
+    keep_hi = split and run_end > cut_hi and hi_run * hi_run + hi_drift * hi_drift > 0.3 * 0.3
     
-    return walls if walls else []
+    if along_x:
+        return split, keep_lo, keep_hi, cut_lo, fixed, cut_hi, fixed
+    return split, keep_lo, keep_hi, fixed, cut_lo, fixed, cut_hi
 
 
 # =============================================================================
 # Building Profiles
 # =============================================================================
 
+class LayoutPrep(NamedTuple):
+    """
+    Parameters and derived bounds shared by all floor layouts of a building.
+    
+    stair_zone is always filled in; layouts that only reserve it for
+    multi-floor buildings check floors themselves.
+    """
+    wall_thickness: float
+    floor_height: float
+    floors: int
+    exterior_stairs: bool
+    bounds: tuple
+    interior_width: float
+    interior_depth: float
+    stair_zone: Zone
+
+
+# Parameters the profile layouts read, with their defaults. Layouts are a
+# pure function of these, the footprint and the profile class
+_LAYOUT_PARAMS = (
+    ('wall_thickness', 0.25),
+    ('floor_height', 3.5),
+    ('floors', 1),
+    ('exterior_stairs', False),
+)
+
+
+def _cached_layout(method):
+    """
+    Memoize a profile layout method on the parameters in _LAYOUT_PARAMS.
+    
+    Blocks of buildings often share a footprint and profile, so repeated
+    layouts are served from the cache. Each call gets its own dict and
+    lists; the WallDef and RoomDef records in them are shared, which is
+    safe because they are frozen.
+    """
+    @lru_cache(maxsize=128)
+    def cached(cls, args, values):
+        return method(cls, *args, dict(zip((key for key, _ in _LAYOUT_PARAMS), values)))
+    
+    @wraps(method)
+    def wrapper(cls, *args):
+        *args, params = args
+        layout = cached(cls, tuple(args),
+                        tuple(params.get(key, default) for key, default in _LAYOUT_PARAMS))
+        return {key: list(value) if isinstance(value, list) else value
+                for key, value in layout.items()}
+    
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+@lru_cache(maxsize=64)
+def _layout_prep(width: float, depth: float, wall_thickness: float, floor_height: float,
+                 floors: int, exterior_stairs: bool, stair_position: str) -> LayoutPrep:
+    """Cached body of BuildingProfile._prep, keyed on the scalar parameters it reads."""
+    bounds = get_interior_bounds(width, depth, wall_thickness)
+    ix_min, iy_min, ix_max, iy_max = bounds
+    return LayoutPrep(wall_thickness, floor_height, floors, exterior_stairs, bounds,
+                      ix_max - ix_min, iy_max - iy_min,
+                      get_stair_zone(width, depth, wall_thickness, stair_position))
+
+
 class BuildingProfile:
     """Base class for building profiles that define interior layouts."""
     
     name = "generic"
     description = "Generic building with no specific layout"
     stair_position = "back_right"  # Default stair position
+    # Exterior door for external stair access (see get_exterior_stair_door)
+    exterior_stair_door = MappingProxyType({
+        'wall': 'back',
+        'position': 0.8,  # 80% along the wall from left
+        'width': EXTERIOR_DOOR_WIDTH,
+        'height': 2.4
+    })
     
     @classmethod
-    def get_stair_zone(cls, width: float, depth: float, params: dict) -> dict:
+    def get_stair_zone(cls, width: float, depth: float, params: dict) -> Zone:
         """Get the stair zone for this profile."""
         wall_thickness = params.get('wall_thickness', 0.25)
         return get_stair_zone(width, depth, wall_thickness, cls.stair_position)
     
     @classmethod
-    def get_floor_opening(cls, width: float, depth: float, params: dict) -> dict:
+    def get_floor_opening(cls, width: float, depth: float, params: dict) -> Zone:
         """Get the floor opening for stair access."""
         wall_thickness = params.get('wall_thickness', 0.25)
         return get_floor_opening(width, depth, wall_thickness, cls.stair_position)
     
+    @classmethod
+    def _prep(cls, width: float, depth: float, params: dict) -> LayoutPrep:
+        """Get the parameters and bounds the layout methods start from."""
+        return _layout_prep(width, depth,
+                            *[params.get(key, default) for key, default in _LAYOUT_PARAMS],
+                            cls.stair_position)
+    
     @classmethod
     def get_ground_floor_layout(cls, width: float, depth: float, params: dict) -> dict:
         """Define the ground floor room layout."""
@@ -634,22 +1022,16 @@ class BuildingProfile:
         return params.get('exterior_stairs', False)
     
     @classmethod
-    def get_exterior_stair_door(cls, width: float, depth: float, params: dict) -> dict:
+    def get_exterior_stair_door(cls, width: float, depth: float, params: dict) -> Mapping:
         """
         Get exterior door position for external stair access.
         This is just a door on the exterior wall - external stairs are not generated.
         
         Returns:
-            Dict with 'wall' ('front', 'back', 'left', 'right'), 'position' (0-1 along wall), 
-            'width', 'height'
+            Read-only mapping with 'wall' ('front', 'back', 'left', 'right'),
+            'position' (0-1 along wall), 'width', 'height'
         """
-        # Default: door on back wall, right side
-        return {
-            'wall': 'back',
-            'position': 0.8,  # 80% along the wall from left
-            'width': EXTERIOR_DOOR_WIDTH,
-            'height': 2.4
-        }
+        return cls.exterior_stair_door
 
 
 class StorefrontProfile(BuildingProfile):
@@ -665,80 +1047,61 @@ class StorefrontProfile(BuildingProfile):
     stair_position = "back_right"
     
     @classmethod
+    @_cached_layout
     def get_ground_floor_layout(cls, width: float, depth: float, params: dict) -> dict:
         """Large front retail space with back room containing stairs."""
-        wall_thickness = params.get('wall_thickness', 0.25)
-        floor_height = params.get('floor_height', 3.5)
-        floors = params.get('floors', 1)
+        (wall_thickness, floor_height, floors, exterior_stairs, (ix_min, iy_min, ix_max, iy_max),
+         interior_width, interior_depth, stair_zone) = cls._prep(width, depth, params)
+        # Every wall on the floor shares its height and thickness
+        new_wall = partial(WallDef, height=floor_height, thickness=wall_thickness)
         
-        ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
-        interior_width = ix_max - ix_min
-        interior_depth = iy_max - iy_min
-        
-        rooms = []
-        walls = []
-        
-        # Check if interior is large enough for subdivision
-        if not validate_room_size(interior_width, interior_depth):
-            # Too small - just one open room
-            rooms = [{'name': 'open_retail', 'bounds': (ix_min, iy_min, ix_max, iy_max), 'type': 'retail'}]
-            exterior_door = cls.get_exterior_stair_door(width, depth, params) if cls.needs_exterior_stair_door(params) else None
-            return {'rooms': rooms, 'walls': walls, 'exterior_door': exterior_door}
-        
-        # Get stair zone to work around
-        stair_zone = cls.get_stair_zone(width, depth, params) if floors > 1 else None
-        
-        # Calculate back room depth with validation
-        target_back_depth = interior_depth * 0.35 if floors > 1 else interior_depth * 0.25
-        if floors > 1:
-            target_back_depth = max(target_back_depth, STAIR_ZONE_DEPTH + 1.0)
+        # Exterior door for external stairs if needed
+        exterior_door = cls.get_exterior_stair_door(width, depth, params) if cls.needs_exterior_stair_door(params) else None
         
-        # Use optimal divider calculation to ensure usable rooms
-        divider_y = calculate_optimal_divider_position(iy_min, iy_max, 1.0 - (target_back_depth / interior_depth))
+        # Stair zone to work around
+        if floors <= 1:
+            stair_zone = None
+        
+        # Divider between the retail front and the back room, left as None if
+        # the interior can't be split into two usable rooms
+        divider_y = None
+        if validate_room_size(interior_width, interior_depth):
+            # Calculate back room depth with validation
+            target_back_depth = interior_depth * 0.35 if floors > 1 else interior_depth * 0.25
+            if floors > 1:
+                target_back_depth = max(target_back_depth, STAIR_ZONE_DEPTH + 1.0)
+            
+            # Use optimal divider calculation to ensure usable rooms
+            divider_y = calculate_optimal_divider_position(iy_min, iy_max, 1.0 - (target_back_depth / interior_depth))
+            
+            # Validate both resulting rooms
+            if divider_y is not None and \
+               (not validate_room_size(interior_width, divider_y - iy_min) or
+                    not validate_room_size(interior_width, iy_max - divider_y)):
+                divider_y = None
         
-        # If no valid divider position, skip interior walls
         if divider_y is None:
-            rooms = [{'name': 'open_retail', 'bounds': (ix_min, iy_min, ix_max, iy_max), 'type': 'retail'}]
-            exterior_door = cls.get_exterior_stair_door(width, depth, params) if cls.needs_exterior_stair_door(params) else None
-            return {'rooms': rooms, 'walls': walls, 'exterior_door': exterior_door}
-        
-        # Validate both resulting rooms
-        front_room_depth = divider_y - iy_min
-        back_room_depth = iy_max - divider_y
-        
-        if not validate_room_size(interior_width, front_room_depth) or not validate_room_size(interior_width, back_room_depth):
-            # Rooms too small - skip divider
-            rooms = [{'name': 'open_retail', 'bounds': (ix_min, iy_min, ix_max, iy_max), 'type': 'retail'}]
-            exterior_door = cls.get_exterior_stair_door(width, depth, params) if cls.needs_exterior_stair_door(params) else None
-            return {'rooms': rooms, 'walls': walls, 'exterior_door': exterior_door}
+            # Too small - just one open room
+            rooms = [RoomDef('open_retail', (ix_min, iy_min, ix_max, iy_max), 'retail')]
+            return {'rooms': rooms, 'walls': [], 'exterior_door': exterior_door}
         
         rooms = [
-            {'name': 'retail_front', 'bounds': (ix_min, iy_min, ix_max, divider_y), 'type': 'retail'},
-            {'name': 'back_room', 'bounds': (ix_min, divider_y, ix_max, iy_max), 'type': 'storage'}
+            RoomDef('retail_front', (ix_min, iy_min, ix_max, divider_y), 'retail'),
+            RoomDef('back_room', (ix_min, divider_y, ix_max, iy_max), 'storage')
         ]
         
+        walls = []
+        
         # Divider wall with doorway (avoid stair zone)
         door_width = DOOR_WIDTH
         door_x = ix_min + interior_width * 0.3  # Door on left side, away from stairs
         
         # Left portion of divider wall
         if door_x > ix_min + MIN_WALL_OFFSET:
-            walls.append({
-                'start': Vector((ix_min, divider_y, 0)),
-                'end': Vector((door_x, divider_y, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            })
+            walls.append(new_wall((ix_min, divider_y), (door_x, divider_y)))
         
         # Right portion of divider wall (may need to avoid stair zone)
-        right_wall = {
-            'start': Vector((door_x + door_width, divider_y, 0)),
-            'end': Vector((ix_max, divider_y, 0)),
-            'height': floor_height,
-            'thickness': wall_thickness,
-            'openings': []
-        }
+        right_wall = new_wall((door_x + door_width, divider_y), (ix_max, divider_y))
         
         if stair_zone:
             adjusted = adjust_wall_for_stair_zone(right_wall, stair_zone)
@@ -746,23 +1109,15 @@ class StorefrontProfile(BuildingProfile):
         else:
             walls.append(right_wall)
         
-        # Exterior door for external stairs if needed
-        exterior_door = None
-        if cls.needs_exterior_stair_door(params):
-            exterior_door = cls.get_exterior_stair_door(width, depth, params)
-        
         return {'rooms': rooms, 'walls': walls, 'exterior_door': exterior_door}
     
     @classmethod
+    @_cached_layout
     def get_upper_floor_layout(cls, width: float, depth: float, floor_idx: int, params: dict) -> dict:
         """Upper floors with rooms arranged around stair zone."""
-        wall_thickness = params.get('wall_thickness', 0.25)
-        floor_height = params.get('floor_height', 3.5)
-        
-        ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
-        interior_width = ix_max - ix_min
-        interior_depth = iy_max - iy_min
-        stair_zone = cls.get_stair_zone(width, depth, params)
+        (wall_thickness, floor_height, floors, exterior_stairs, (ix_min, iy_min, ix_max, iy_max),
+         interior_width, interior_depth, stair_zone) = cls._prep(width, depth, params)
+        new_wall = partial(WallDef, height=floor_height, thickness=wall_thickness)
         
         rooms = []
         walls = []
@@ -776,7 +1131,7 @@ class StorefrontProfile(BuildingProfile):
         if interior_width > MIN_ROOM_SIZE * 2 + 1.0:
             # Calculate divider position with validation
             # Position to give stair zone its own area, but ensure usable room sizes
-            target_ratio = 0.6 if stair_zone['x_min'] > ix_min + MIN_ROOM_SIZE else 0.5
+            target_ratio = 0.6 if stair_zone.x_min > ix_min + MIN_ROOM_SIZE else 0.5
             divider_x = calculate_optimal_divider_position(ix_min, ix_max, target_ratio)
             
             if divider_x is None:
@@ -791,8 +1146,8 @@ class StorefrontProfile(BuildingProfile):
                 return {'rooms': rooms, 'walls': walls}
             
             rooms = [
-                {'name': f'living_{floor_idx}', 'bounds': (ix_min, iy_min, divider_x, iy_max), 'type': 'living'},
-                {'name': f'bedroom_{floor_idx}', 'bounds': (divider_x, iy_min, ix_max, iy_max), 'type': 'bedroom'}
+                RoomDef(f'living_{floor_idx}', (ix_min, iy_min, divider_x, iy_max), 'living'),
+                RoomDef(f'bedroom_{floor_idx}', (divider_x, iy_min, ix_max, iy_max), 'bedroom')
             ]
             
             # Divider wall with door (positioned away from stair zone)
@@ -805,25 +1160,11 @@ class StorefrontProfile(BuildingProfile):
                 door_y = iy_max - DOOR_WIDTH - MIN_WALL_OFFSET
             
             # Wall segments avoiding stair zone
-            wall_bottom = {
-                'start': Vector((divider_x, iy_min, 0)),
-                'end': Vector((divider_x, door_y, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            }
+            wall_bottom = new_wall((divider_x, iy_min), (divider_x, door_y))
             
-            wall_top = {
-                'start': Vector((divider_x, door_y + DOOR_WIDTH, 0)),
-                'end': Vector((divider_x, iy_max, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            }
+            wall_top = new_wall((divider_x, door_y + DOOR_WIDTH), (divider_x, iy_max))
             
-            for wall in [wall_bottom, wall_top]:
-                adjusted = adjust_wall_for_stair_zone(wall, stair_zone)
-                walls.extend(adjusted)
+            walls.extend(adjust_walls_for_stair_zone([wall_bottom, wall_top], stair_zone))
         
         return {'rooms': rooms, 'walls': walls}
 
@@ -838,18 +1179,21 @@ class WarehouseProfile(BuildingProfile):
     name = "warehouse"
     description = "Large open warehouse with optional office"
     stair_position = "back_left"
+    exterior_stair_door = MappingProxyType({
+        'wall': 'left',
+        'position': 0.7,
+        'width': EXTERIOR_DOOR_WIDTH,
+        'height': 2.4
+    })
     
     @classmethod
+    @_cached_layout
     def get_ground_floor_layout(cls, width: float, depth: float, params: dict) -> dict:
-        wall_thickness = params.get('wall_thickness', 0.25)
-        floor_height = params.get('floor_height', 3.5)
-        floors = params.get('floors', 1)
-        
-        ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
-        interior_width = ix_max - ix_min
-        interior_depth = iy_max - iy_min
-        
-        stair_zone = cls.get_stair_zone(width, depth, params) if floors > 1 else None
+        (wall_thickness, floor_height, floors, exterior_stairs, (ix_min, iy_min, ix_max, iy_max),
+         interior_width, interior_depth, stair_zone) = cls._prep(width, depth, params)
+        new_wall = partial(WallDef, height=floor_height, thickness=wall_thickness)
+        if floors <= 1:
+            stair_zone = None
         
         rooms = []
         walls = []
@@ -869,27 +1213,15 @@ class WarehouseProfile(BuildingProfile):
             office_y_max = iy_min + office_depth
             
             rooms = [
-                {'name': 'warehouse_floor', 'bounds': (office_x_max, iy_min, ix_max, iy_max), 'type': 'warehouse'},
-                {'name': 'office', 'bounds': (ix_min, iy_min, office_x_max, office_y_max), 'type': 'office'}
+                RoomDef('warehouse_floor', (office_x_max, iy_min, ix_max, iy_max), 'warehouse'),
+                RoomDef('office', (ix_min, iy_min, office_x_max, office_y_max), 'office')
             ]
             
             # L-shaped office walls with door
-            walls.append({
-                'start': Vector((office_x_max, iy_min, 0)),
-                'end': Vector((office_x_max, office_y_max - DOOR_WIDTH, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            })
-            walls.append({
-                'start': Vector((ix_min, office_y_max, 0)),
-                'end': Vector((office_x_max, office_y_max, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            })
+            walls.append(new_wall((office_x_max, iy_min), (office_x_max, office_y_max - DOOR_WIDTH)))
+            walls.append(new_wall((ix_min, office_y_max), (office_x_max, office_y_max)))
         else:
-            rooms = [{'name': 'warehouse_floor', 'bounds': (ix_min, iy_min, ix_max, iy_max), 'type': 'warehouse'}]
+            rooms = [RoomDef('warehouse_floor', (ix_min, iy_min, ix_max, iy_max), 'warehouse')]
         
         exterior_door = cls.get_exterior_stair_door(width, depth, params) if cls.needs_exterior_stair_door(params) else None
         
@@ -900,16 +1232,6 @@ class WarehouseProfile(BuildingProfile):
         """Upper floors are open storage with stair access."""
         return {'rooms': [], 'walls': []}
     
-    @classmethod
-    def get_exterior_stair_door(cls, width: float, depth: float, params: dict) -> dict:
-        # Warehouse: door on left side wall
-        return {
-            'wall': 'left',
-            'position': 0.7,
-            'width': EXTERIOR_DOOR_WIDTH,
-            'height': 2.4
-        }
-
 
 class ResidentialProfile(BuildingProfile):
     """
@@ -922,6 +1244,12 @@ class ResidentialProfile(BuildingProfile):
     description = "Apartment building with rooms and hallway"
     stair_position = "back_center"
     hallway_width = 1.4
+    exterior_stair_door = MappingProxyType({
+        'wall': 'back',
+        'position': 0.5,  # Center of back wall
+        'width': EXTERIOR_DOOR_WIDTH,
+        'height': 2.4
+    })
     
     @classmethod
     def get_ground_floor_layout(cls, width: float, depth: float, params: dict) -> dict:
@@ -932,19 +1260,13 @@ class ResidentialProfile(BuildingProfile):
         return cls._generate_floor_layout(width, depth, floor_idx, params)
     
     @classmethod
+    @_cached_layout
     def _generate_floor_layout(cls, width: float, depth: float, floor_idx: int, params: dict) -> dict:
-        wall_thickness = params.get('wall_thickness', 0.25)
-        floor_height = params.get('floor_height', 3.5)
-        floors = params.get('floors', 1)
-        
-        ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
-        interior_width = ix_max - ix_min
-        interior_depth = iy_max - iy_min
-        
-        stair_zone = cls.get_stair_zone(width, depth, params) if floors > 1 else None
-        
-        rooms = []
-        walls = []
+        (wall_thickness, floor_height, floors, exterior_stairs, (ix_min, iy_min, ix_max, iy_max),
+         interior_width, interior_depth, stair_zone) = cls._prep(width, depth, params)
+        new_wall = partial(WallDef, height=floor_height, thickness=wall_thickness)
+        if floors <= 1:
+            stair_zone = None
         
         # Check if there's enough space for hallway + rooms on both sides
         min_room_width = MIN_ROOM_SIZE
@@ -953,31 +1275,28 @@ class ResidentialProfile(BuildingProfile):
         
         if interior_width < required_width or interior_depth < min_hallway_depth:
             # Too small for residential layout - return empty
-            return {'rooms': rooms, 'walls': walls}
+            return {'rooms': [], 'walls': []}
         
         # Central hallway - ensure rooms on sides are large enough
         room_width_each_side = (interior_width - cls.hallway_width) / 2
         
         # If rooms would be too narrow, widen hallway or skip layout
         if room_width_each_side < MIN_ROOM_SIZE:
-            return {'rooms': rooms, 'walls': walls}
+            return {'rooms': [], 'walls': []}
         
         hallway_x_left = ix_min + room_width_each_side
         hallway_x_right = hallway_x_left + cls.hallway_width
         
         # Hallway runs from front to stair zone at back
-        hallway_y_max = stair_zone['y_min'] if stair_zone else iy_max
+        hallway_y_max = stair_zone.y_min if stair_zone else iy_max
         hallway_depth = hallway_y_max - iy_min
         
         # Validate hallway length
         if hallway_depth < MIN_ROOM_SIZE:
-            return {'rooms': rooms, 'walls': walls}
+            return {'rooms': [], 'walls': []}
         
-        rooms.append({
-            'name': f'hallway_{floor_idx}',
-            'bounds': (hallway_x_left, iy_min, hallway_x_right, hallway_y_max),
-            'type': 'hallway'
-        })
+        rooms = [RoomDef(f'hallway_{floor_idx}',
+                         (hallway_x_left, iy_min, hallway_x_right, hallway_y_max), 'hallway')]
         
         # Calculate room depth - aim for 2 rooms per side if space permits
         # Each room must be at least MIN_ROOM_SIZE deep
@@ -990,73 +1309,44 @@ class ResidentialProfile(BuildingProfile):
             num_rooms = 1
             room_depth = hallway_depth
         
-        # Rooms on left side of hallway
-        for i in range(num_rooms):
-            y_start = iy_min + i * room_depth
-            y_end = y_start + room_depth
-            if y_end <= hallway_y_max + 0.01 and validate_room_size(room_width_each_side, room_depth):
-                rooms.append({
-                    'name': f'apt_L{i}_{floor_idx}',
-                    'bounds': (ix_min, y_start, hallway_x_left, y_end),
-                    'type': 'apartment'
-                })
-        
-        # Rooms on right side of hallway
-        for i in range(num_rooms):
-            y_start = iy_min + i * room_depth
-            y_end = y_start + room_depth
-            if y_end <= hallway_y_max + 0.01 and validate_room_size(room_width_each_side, room_depth):
-                rooms.append({
-                    'name': f'apt_R{i}_{floor_idx}',
-                    'bounds': (hallway_x_right, y_start, ix_max, y_end),
-                    'type': 'apartment'
-                })
-        
-        # Hallway walls with doors to apartments
-        for i in range(num_rooms):
-            y_start = iy_min + i * room_depth
-            y_end = min(y_start + room_depth, hallway_y_max)
+        # Every apartment has the same size, so one check covers them all
+        apartments_usable = validate_room_size(room_width_each_side, room_depth)
+        
+        # Apartment starts along the hallway and, for the hallway walls, the
+        # wall segments before and after each apartment's door as
+        # ((start, end), (start, end)) spans
+        if num_rooms == 1:
+            # One apartment per side, the common case for small buildings:
+            # the same spans as below without the array setup
+            y_start = [iy_min]
+            y_end = min(iy_min + room_depth, hallway_y_max)
+            door_y = iy_min + (y_end - iy_min) * 0.5 - DOOR_WIDTH / 2
+            door_spans = [((iy_min, door_y), (door_y + DOOR_WIDTH, y_end))]
+        else:
+            y_start = iy_min + np.arange(num_rooms) * room_depth
+            y_end = np.minimum(y_start + room_depth, hallway_y_max)
             door_y = y_start + (y_end - y_start) * 0.5 - DOOR_WIDTH / 2
-            
-            # Ensure wall segments are long enough (at least MIN_WALL_OFFSET)
-            wall_before_door = door_y - y_start
-            wall_after_door = y_end - (door_y + DOOR_WIDTH)
-            
-            # Left wall segments
-            if wall_before_door > MIN_WALL_OFFSET:
-                walls.append({
-                    'start': Vector((hallway_x_left, y_start, 0)),
-                    'end': Vector((hallway_x_left, door_y, 0)),
-                    'height': floor_height,
-                    'thickness': wall_thickness,
-                    'openings': []
-                })
-            if wall_after_door > MIN_WALL_OFFSET:
-                walls.append({
-                    'start': Vector((hallway_x_left, door_y + DOOR_WIDTH, 0)),
-                    'end': Vector((hallway_x_left, y_end, 0)),
-                    'height': floor_height,
-                    'thickness': wall_thickness,
-                    'openings': []
-                })
-            
-            # Right wall segments
-            if wall_before_door > MIN_WALL_OFFSET:
-                walls.append({
-                    'start': Vector((hallway_x_right, y_start, 0)),
-                    'end': Vector((hallway_x_right, door_y, 0)),
-                    'height': floor_height,
-                    'thickness': wall_thickness,
-                    'openings': []
-                })
-            if wall_after_door > MIN_WALL_OFFSET:
-                walls.append({
-                    'start': Vector((hallway_x_right, door_y + DOOR_WIDTH, 0)),
-                    'end': Vector((hallway_x_right, y_end, 0)),
-                    'height': floor_height,
-                    'thickness': wall_thickness,
-                    'openings': []
-                })
+            door_spans = np.stack([np.column_stack([y_start, door_y]),
+                                   np.column_stack([door_y + DOOR_WIDTH, y_end])], axis=1).tolist()
+            y_start = y_start.tolist()
+        
+        if apartments_usable:
+            apartment_spans = [(i, y0, y0 + room_depth) for i, y0 in enumerate(y_start)
+                               if y0 + room_depth <= hallway_y_max + 0.01]
+            # Rooms on left side of hallway, then on the right side
+            rooms += [RoomDef(f'apt_L{i}_{floor_idx}', (ix_min, y0, hallway_x_left, y1), 'apartment')
+                      for i, y0, y1 in apartment_spans]
+            rooms += [RoomDef(f'apt_R{i}_{floor_idx}', (hallway_x_right, y0, ix_max, y1), 'apartment')
+                      for i, y0, y1 in apartment_spans]
+        
+        # Left then right wall segments for each apartment, skipping segments
+        # shorter than MIN_WALL_OFFSET
+        walls = [
+            new_wall((wall_x, seg_start), (wall_x, seg_end))
+            for segments in door_spans
+            for wall_x in (hallway_x_left, hallway_x_right)
+            for seg_start, seg_end in segments if seg_end - seg_start > MIN_WALL_OFFSET
+        ]
         
         # Cross walls between apartments (only if multiple rooms)
         if num_rooms > 1:
@@ -1065,24 +1355,12 @@ class ResidentialProfile(BuildingProfile):
                 # Left side cross wall - ensure it's not too close to hallway
                 left_wall_length = hallway_x_left - ix_min - DOOR_WIDTH
                 if left_wall_length > MIN_WALL_OFFSET:
-                    walls.append({
-                        'start': Vector((ix_min, mid_y, 0)),
-                        'end': Vector((hallway_x_left - DOOR_WIDTH, mid_y, 0)),
-                        'height': floor_height,
-                        'thickness': wall_thickness,
-                        'openings': []
-                    })
+                    walls.append(new_wall((ix_min, mid_y), (hallway_x_left - DOOR_WIDTH, mid_y)))
                 
                 # Right side cross wall
                 right_wall_length = ix_max - hallway_x_right - DOOR_WIDTH
                 if right_wall_length > MIN_WALL_OFFSET:
-                    walls.append({
-                        'start': Vector((hallway_x_right + DOOR_WIDTH, mid_y, 0)),
-                        'end': Vector((ix_max, mid_y, 0)),
-                        'height': floor_height,
-                        'thickness': wall_thickness,
-                        'openings': []
-                    })
+                    walls.append(new_wall((hallway_x_right + DOOR_WIDTH, mid_y), (ix_max, mid_y)))
         
         exterior_door = None
         if floor_idx == 0 and cls.needs_exterior_stair_door(params):
@@ -1090,15 +1368,6 @@ class ResidentialProfile(BuildingProfile):
         
         return {'rooms': rooms, 'walls': walls, 'exterior_door': exterior_door}
     
-    @classmethod
-    def get_exterior_stair_door(cls, width: float, depth: float, params: dict) -> dict:
-        return {
-            'wall': 'back',
-            'position': 0.5,  # Center of back wall
-            'width': EXTERIOR_DOOR_WIDTH,
-            'height': 2.4
-        }
-
 
 class BarProfile(BuildingProfile):
     """
@@ -1110,66 +1379,52 @@ class BarProfile(BuildingProfile):
     name = "bar"
     description = "Bar/entertainment with multiple connected rooms"
     stair_position = "back_left"
+    exterior_stair_door = MappingProxyType({
+        'wall': 'back',
+        'position': 0.2,  # Left side of back wall
+        'width': EXTERIOR_DOOR_WIDTH,
+        'height': 2.4
+    })
     
     @classmethod
+    @_cached_layout
     def get_ground_floor_layout(cls, width: float, depth: float, params: dict) -> dict:
-        wall_thickness = params.get('wall_thickness', 0.25)
-        floor_height = params.get('floor_height', 3.5)
-        floors = params.get('floors', 1)
-        
-        ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
-        interior_width = ix_max - ix_min
-        interior_depth = iy_max - iy_min
-        
-        stair_zone = cls.get_stair_zone(width, depth, params) if floors > 1 else None
+        (wall_thickness, floor_height, floors, exterior_stairs, (ix_min, iy_min, ix_max, iy_max),
+         interior_width, interior_depth, stair_zone) = cls._prep(width, depth, params)
+        new_wall = partial(WallDef, height=floor_height, thickness=wall_thickness)
+        if floors <= 1:
+            stair_zone = None
         
         # Layout: Seating (50%), Bar+Back (50%)
         bar_y = iy_min + interior_depth * 0.5
         
         # Back room for stairs if multi-floor
-        back_room_x = stair_zone['x_max'] + 0.5 if stair_zone else ix_min + interior_width * 0.3
+        back_room_x = stair_zone.x_max + 0.5 if stair_zone else ix_min + interior_width * 0.3
         
         rooms = [
-            {'name': 'seating', 'bounds': (ix_min, iy_min, ix_max, bar_y), 'type': 'seating'},
-            {'name': 'bar_area', 'bounds': (back_room_x, bar_y, ix_max, iy_max), 'type': 'bar'},
+            RoomDef('seating', (ix_min, iy_min, ix_max, bar_y), 'seating'),
+            RoomDef('bar_area', (back_room_x, bar_y, ix_max, iy_max), 'bar'),
         ]
         
         if stair_zone:
-            rooms.append({'name': 'back_room', 'bounds': (ix_min, bar_y, back_room_x, iy_max), 'type': 'storage'})
+            rooms.append(RoomDef('back_room', (ix_min, bar_y, back_room_x, iy_max), 'storage'))
         
         walls = []
         
-        # Partial wall between seating and bar (large opening in center)
-        opening_width = interior_width * 0.5
-        opening_start = ix_min + (interior_width - opening_width) / 2
-        
-        if opening_start > ix_min + 0.3:
-            walls.append({
-                'start': Vector((ix_min, bar_y, 0)),
-                'end': Vector((opening_start, bar_y, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            })
-        
-        if opening_start + opening_width < ix_max - 0.3:
-            walls.append({
-                'start': Vector((opening_start + opening_width, bar_y, 0)),
-                'end': Vector((ix_max, bar_y, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            })
+        # Partial wall between seating and bar (large opening in center).
+        # The opening spans the middle half, so each side piece is a quarter
+        # of the interior width and both clear the 0.3 minimum together
+        if interior_width > 1.2:
+            opening_start = ix_min + interior_width * 0.25
+            opening_end = opening_start + interior_width * 0.5
+            walls += [
+                new_wall((ix_min, bar_y), (opening_start, bar_y)),
+                new_wall((opening_end, bar_y), (ix_max, bar_y)),
+            ]
         
         # Wall between bar and back room (with door)
         if stair_zone:
-            wall_def = {
-                'start': Vector((back_room_x, bar_y + DOOR_WIDTH, 0)),
-                'end': Vector((back_room_x, iy_max, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            }
+            wall_def = new_wall((back_room_x, bar_y + DOOR_WIDTH), (back_room_x, iy_max))
             adjusted = adjust_wall_for_stair_zone(wall_def, stair_zone)
             walls.extend(adjusted)
         
@@ -1178,13 +1433,11 @@ class BarProfile(BuildingProfile):
         return {'rooms': rooms, 'walls': walls, 'exterior_door': exterior_door}
     
     @classmethod
+    @_cached_layout
     def get_upper_floor_layout(cls, width: float, depth: float, floor_idx: int, params: dict) -> dict:
-        wall_thickness = params.get('wall_thickness', 0.25)
-        floor_height = params.get('floor_height', 3.5)
-        
-        ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
-        interior_width = ix_max - ix_min
-        stair_zone = cls.get_stair_zone(width, depth, params)
+        (wall_thickness, floor_height, floors, exterior_stairs, (ix_min, iy_min, ix_max, iy_max),
+         interior_width, interior_depth, stair_zone) = cls._prep(width, depth, params)
+        new_wall = partial(WallDef, height=floor_height, thickness=wall_thickness)
         
         rooms = []
         walls = []
@@ -1193,290 +1446,313 @@ class BarProfile(BuildingProfile):
         if interior_width > 4.0:
             mid_x = ix_min + interior_width / 2
             rooms = [
-                {'name': f'vip_left_{floor_idx}', 'bounds': (ix_min, iy_min, mid_x, iy_max), 'type': 'vip'},
-                {'name': f'vip_right_{floor_idx}', 'bounds': (mid_x, iy_min, ix_max, iy_max), 'type': 'vip'}
+                RoomDef(f'vip_left_{floor_idx}', (ix_min, iy_min, mid_x, iy_max), 'vip'),
+                RoomDef(f'vip_right_{floor_idx}', (mid_x, iy_min, ix_max, iy_max), 'vip')
             ]
             
             # Divider with door (positioned away from stairs)
             door_y = iy_min + 1.5
             
-            wall_def = {
-                'start': Vector((mid_x, iy_min, 0)),
-                'end': Vector((mid_x, door_y, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            }
-            adjusted = adjust_wall_for_stair_zone(wall_def, stair_zone)
-            walls.extend(adjusted)
+            wall_def = new_wall((mid_x, iy_min), (mid_x, door_y))
             
-            wall_def2 = {
-                'start': Vector((mid_x, door_y + DOOR_WIDTH, 0)),
-                'end': Vector((mid_x, iy_max, 0)),
-                'height': floor_height,
-                'thickness': wall_thickness,
-                'openings': []
-            }
-            adjusted2 = adjust_wall_for_stair_zone(wall_def2, stair_zone)
-            walls.extend(adjusted2)
+            wall_def2 = new_wall((mid_x, door_y + DOOR_WIDTH), (mid_x, iy_max))
+            walls.extend(adjust_walls_for_stair_zone([wall_def, wall_def2], stair_zone))
         
         return {'rooms': rooms, 'walls': walls}
     
-    @classmethod
-    def get_exterior_stair_door(cls, width: float, depth: float, params: dict) -> dict:
-        return {
-            'wall': 'back',
-            'position': 0.2,  # Left side of back wall
-            'width': EXTERIOR_DOOR_WIDTH,
-            'height': 2.4
-        }
-
 
 # Profile registry
-BUILDING_PROFILES = {
-    'NONE': BuildingProfile,
-    'STOREFRONT': StorefrontProfile,
-    'WAREHOUSE': WarehouseProfile,
-    'RESIDENTIAL': ResidentialProfile,
-    'BAR': BarProfile,
-}
+class ProfileKind(IntEnum):
+    """Building profiles, numbered by their position in _PROFILES."""
+    NONE = 0
+    STOREFRONT = 1
+    WAREHOUSE = 2
+    RESIDENTIAL = 3
+    BAR = 4
+
+
+_PROFILES = (BuildingProfile, StorefrontProfile, WarehouseProfile, ResidentialProfile, BarProfile)
+
+# Lookup by the building_profile enum names used in the operator properties
+BUILDING_PROFILES = {kind.name: _PROFILES[kind] for kind in ProfileKind}
 
 
 # =============================================================================
 # Interior Geometry Generation
 # =============================================================================
 
-def build_interior_wall(bm: bmesh.types.BMesh, wall_def: dict, base_z: float) -> list:
+def merge_collinear_walls(wall_defs: list, tolerance: float = 1e-4) -> list:
     """
-    Build an interior wall segment.
+    Merge collinear interior walls whose spans touch or overlap.
     
-    Walls are forced to be cardinal (along X or Y axis only).
+    Walls are grouped by axis, by their line (the average of the minor
+    axis coordinate), height and thickness; within a group, walls whose
+    spans touch within tolerance become a single wall running from the
+    lowest to the highest coordinate. Walls with openings are never merged.
+    
+    Args:
+        wall_defs: Wall definitions
+        tolerance: Gap between spans, and between lines, that still counts as
+            touching
+    
+    Returns:
+        Wall definitions in the order of the first wall of each merged run;
+        walls that were not merged are returned unchanged
     """
-    faces = []
+    groups = {}
+    for index, wall_def in enumerate(wall_defs):
+        (sx, sy), (ex, ey) = wall_def.start, wall_def.end
+        along_x = abs(ex - sx) > abs(ey - sy)
+        if along_x:
+            line, lo, hi = (sy + ey) / 2, min(sx, ex), max(sx, ex)
+        else:
+            line, lo, hi = (sx + ex) / 2, min(sy, ey), max(sy, ey)
+        key = (along_x, round(line / tolerance), wall_def.height, wall_def.thickness)
+        if wall_def.openings:
+            key = index
+        groups.setdefault(key, []).append((lo, hi, index, line, along_x))
+    
+    runs = []
+    for members in groups.values():
+        # Sweep each line in span order, starting a new run at every gap
+        members.sort()
+        merged = [[]]
+        hi = members[0][1]
+        for member in members:
+            if member[0] > hi + tolerance:
+                merged.append([])
+            hi = max(hi, member[1]) if merged[-1] else member[1]
+            merged[-1].append(member)
+        
+        for run in merged:
+            first = min(run, key=lambda m: m[2])
+            wall_def = wall_defs[first[2]]
+            if len(run) > 1:
+                lo, hi = run[0][0], max(m[1] for m in run)
+                line, along_x = first[3], first[4]
+                start, end = ((lo, line), (hi, line)) if along_x else ((line, lo), (line, hi))
+                wall_def = replace(wall_def, start=start, end=end)
+            runs.append((first[2], wall_def))
+    
+    runs.sort(key=lambda item: item[0])
+    return [wall_def for _, wall_def in runs]
+
+
+@util.njit(cache=True)
+def _wall_box_extents(rows):
+    """
+    Box extents at z=0 of the interior walls at least 0.2 long.
     
-    start = wall_def['start'].copy()
-    end = wall_def['end'].copy()
-    height = wall_def['height']
-    thickness = wall_def['thickness']
-    
-    # Skip very short walls
-    if (end - start).length < 0.2:
-        return faces
-    
-    # Force wall to be cardinal - determine primary direction
-    dx = abs(end.x - start.x)
-    dy = abs(end.y - start.y)
-    half_thickness = thickness / 2
-    
-    # Track wall direction for correct face winding
-    is_x_axis_wall = dx > dy
-    
-    if is_x_axis_wall:
-        # Wall runs east-west (along X axis)
-        # Force both endpoints to same Y value
-        avg_y = (start.y + end.y) / 2
-        start.y = avg_y
-        end.y = avg_y
-        # Normal points in Y direction
-        offset = Vector((0, half_thickness, 0))
-    else:
-        # Wall runs north-south (along Y axis)
-        # Force both endpoints to same X value
-        avg_x = (start.x + end.x) / 2
-        start.x = avg_x
-        end.x = avg_x
-        # Normal points in X direction
-        offset = Vector((half_thickness, 0, 0))
-    
-    # Create wall box vertices
-    # v0-v3: -offset side, v4-v7: +offset side
-    v0 = bm.verts.new(start - offset + Vector((0, 0, base_z)))
-    v1 = bm.verts.new(end - offset + Vector((0, 0, base_z)))
-    v2 = bm.verts.new(end - offset + Vector((0, 0, base_z + height)))
-    v3 = bm.verts.new(start - offset + Vector((0, 0, base_z + height)))
-    
-    v4 = bm.verts.new(start + offset + Vector((0, 0, base_z)))
-    v5 = bm.verts.new(end + offset + Vector((0, 0, base_z)))
-    v6 = bm.verts.new(end + offset + Vector((0, 0, base_z + height)))
-    v7 = bm.verts.new(start + offset + Vector((0, 0, base_z + height)))
-    
-    # Face winding depends on wall direction
-    # For X-axis walls: -offset side is at -Y, so front face should point -Y
-    # For Y-axis walls: -offset side is at -X, so front face should point -X
-    # The winding [v0, v1, v2, v3] gives -Y normal for X-axis walls but +X for Y-axis walls
-    # So Y-axis walls need reversed winding
-    
-    if is_x_axis_wall:
-        # Front face (points -Y)
-        f = bm.faces.new([v0, v1, v2, v3])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Back face (points +Y)
-        f = bm.faces.new([v5, v4, v7, v6])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Top cap (points +Z)
-        f = bm.faces.new([v3, v2, v6, v7])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Start end cap (points -X)
-        f = bm.faces.new([v4, v0, v3, v7])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # End end cap (points +X)
-        f = bm.faces.new([v1, v5, v6, v2])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Bottom cap (points -Z)
-        f = bm.faces.new([v0, v4, v5, v1])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-    else:
-        # Y-axis wall - all faces need adjusted winding
-        
-        # Front face (points -X)
-        f = bm.faces.new([v0, v3, v2, v1])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Back face (points +X)
-        f = bm.faces.new([v5, v6, v7, v4])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Top cap (points +Z) - adjusted winding
-        f = bm.faces.new([v3, v7, v6, v2])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Start end cap (points -Y) - adjusted winding
-        f = bm.faces.new([v4, v7, v3, v0])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # End end cap (points +Y) - adjusted winding
-        f = bm.faces.new([v1, v2, v6, v5])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
-        
-        # Bottom cap (points -Z) - adjusted winding
-        f = bm.faces.new([v0, v1, v5, v4])
-        f.material_index = MAT_INTERIOR_WALL
-        faces.append(f)
+    Only takes a float64 array so it can be compiled by numba.
     
-    return faces
+    Args:
+        rows: (N, 6) array of (x0, y0, x1, y1, height, thickness) per wall
+    
+    Returns:
+        Tuple of (min_cos, max_cos) (K, 3) arrays for the kept walls
+    """
+    dx = rows[:, 2] - rows[:, 0]
+    dy = rows[:, 3] - rows[:, 1]
+    kept = rows[dx * dx + dy * dy >= 0.2 * 0.2]
+    x0, y0, x1, y1 = kept[:, 0], kept[:, 1], kept[:, 2], kept[:, 3]
+    
+    # Snap to the cardinal axis: both endpoints move onto the average of
+    # the minor axis coordinate, widened by half the thickness across it
+    along_x = np.abs(x1 - x0) > np.abs(y1 - y0)
+    mid_x = (x0 + x1) / 2
+    mid_y = (y0 + y1) / 2
+    x0, x1 = np.where(along_x, x0, mid_x), np.where(along_x, x1, mid_x)
+    y0, y1 = np.where(along_x, mid_y, y0), np.where(along_x, mid_y, y1)
+    half_x = np.where(along_x, 0.0, kept[:, 5] / 2)
+    half_y = np.where(along_x, kept[:, 5] / 2, 0.0)
+    
+    min_cos = np.zeros((len(kept), 3))
+    max_cos = np.empty((len(kept), 3))
+    min_cos[:, 0] = np.minimum(x0, x1) - half_x
+    max_cos[:, 0] = np.maximum(x0, x1) + half_x
+    min_cos[:, 1] = np.minimum(y0, y1) - half_y
+    max_cos[:, 1] = np.maximum(y0, y1) + half_y
+    max_cos[:, 2] = kept[:, 4]
+    return min_cos, max_cos
+
+
+def interior_wall_geometry(wall_defs: list, base_zs) -> tuple:
+    """
+    Compute the box geometry of interior walls on one or more floors.
+    
+    Walls are forced to be cardinal (along X or Y axis only): both
+    endpoints are moved onto the average of the minor axis coordinate.
+    Walls shorter than 0.2 are skipped.
+    
+    Args:
+        wall_defs: Wall definitions
+        base_zs: Base height of every floor the walls are built on
+    
+    Returns:
+        Tuple of (verts, faces) with verts an (N, 3) float array and faces
+        an (M, 4) index array, floor by floor and wall by wall
+    """
+    rows = np.array([(*w.start, *w.end, w.height, w.thickness) for w in wall_defs],
+                    dtype=np.float64).reshape(-1, 6)
+    min_cos, max_cos = _wall_box_extents(rows)
+    base_zs = np.asarray(base_zs, dtype=np.float64)
+    
+    # Boxes of one floor at z=0, then translated up to every floor with a
+    # single broadcast add and the face indices offset floor by floor
+    verts, faces = util.box_geometry(min_cos, max_cos)
+    floor_offsets = np.arange(len(base_zs))[:, None, None] * len(verts)
+    verts = verts[None] + base_zs[:, None, None] * (0, 0, 1)
+    faces = faces[None] + floor_offsets
+    return verts.reshape(-1, 3), faces.reshape(-1, 4)
 
 
-def build_interior_stairs(bm: bmesh.types.BMesh, stair_zone: dict, floor_height: float,
-                          base_z: float) -> list:
+def build_interior_walls(bm: bmesh.types.BMesh, wall_defs: list, base_zs):
     """
-    Build interior stairs within the designated stair zone.
-    Stairs go from base_z to base_z + floor_height.
+    Build interior walls on one or more floors with a single bulk submission.
+    
+    Args:
+        bm: BMesh to add geometry to
+        wall_defs: Wall definitions
+        base_zs: Base height of every floor the walls are built on
     """
-    faces = []
+    # Nothing to build when damage or a patio leaves no floor for walls
+    if wall_defs and len(base_zs):
+        verts, faces = interior_wall_geometry(wall_defs, base_zs)
+        util.add_geometry_bulk(bm, verts, faces, MAT_INTERIOR_WALL)
+
+
+def build_interior_wall(bm: bmesh.types.BMesh, wall_def: WallDef, base_z: float):
+    """
+    Build an interior wall segment.
+    
+    Walls are forced to be cardinal (along X or Y axis only).
+    """
+    build_interior_walls(bm, [wall_def], [base_z])
+
+
+def interior_stair_geometry(stair_zone: Zone, floor_height: float, base_zs) -> tuple:
+    """
+    Compute the geometry of stair flights with their top landings.
+    
+    Every step and the landing is a solid box spanning the stair zone in X.
+    One flight is laid out and then repeated at the base height of each
+    floor that gets stairs.
+    
+    Args:
+        stair_zone: Zone the flights are built in
+        floor_height: Height climbed by each flight
+        base_zs: Base height of every flight
     
-    x_min = stair_zone['x_min']
-    y_min = stair_zone['y_min']
-    x_max = stair_zone['x_max']
-    y_max = stair_zone['y_max']
+    Returns:
+        Tuple of (verts, faces) with verts an (N, 3) float array and faces
+        an (M, 4) index array, flight by flight and step by step with each
+        landing last
+    """
+    x_min, y_min, x_max, y_max = stair_zone
     
-    stair_width = x_max - x_min
     stair_depth = y_max - y_min - STAIR_LANDING  # Reserve space for landing
     
     num_steps = max(1, int(floor_height / 0.2))
     step_height = floor_height / num_steps
     step_depth = stair_depth / num_steps
     step_thickness = 0.12
-    
-    # Build each step as a solid box
-    for i in range(num_steps):
-        step_top_z = base_z + (i + 1) * step_height
-        step_bottom_z = step_top_z - step_thickness
-        step_y = y_min + i * step_depth
-        
-        # Step vertices
-        t0 = bm.verts.new(Vector((x_min, step_y, step_top_z)))
-        t1 = bm.verts.new(Vector((x_max, step_y, step_top_z)))
-        t2 = bm.verts.new(Vector((x_max, step_y + step_depth, step_top_z)))
-        t3 = bm.verts.new(Vector((x_min, step_y + step_depth, step_top_z)))
-        
-        b0 = bm.verts.new(Vector((x_min, step_y, step_bottom_z)))
-        b1 = bm.verts.new(Vector((x_max, step_y, step_bottom_z)))
-        b2 = bm.verts.new(Vector((x_max, step_y + step_depth, step_bottom_z)))
-        b3 = bm.verts.new(Vector((x_min, step_y + step_depth, step_bottom_z)))
-        
-        # Create all 6 faces
-        f = bm.faces.new([t0, t1, t2, t3])  # Top
-        f.material_index = MAT_STAIRS
-        faces.append(f)
-        
-        f = bm.faces.new([b3, b2, b1, b0])  # Bottom
-        f.material_index = MAT_STAIRS
-        faces.append(f)
-        
-        f = bm.faces.new([b0, b1, t1, t0])  # Front
-        f.material_index = MAT_STAIRS
-        faces.append(f)
-        
-        f = bm.faces.new([b2, b3, t3, t2])  # Back
-        f.material_index = MAT_STAIRS
-        faces.append(f)
-        
-        f = bm.faces.new([b3, b0, t0, t3])  # Left
-        f.material_index = MAT_STAIRS
-        faces.append(f)
-        
-        f = bm.faces.new([b1, b2, t2, t1])  # Right
-        f.material_index = MAT_STAIRS
-        faces.append(f)
-    
-    # Top landing
-    landing_z = base_z + floor_height
     landing_thickness = 0.15
+    base_zs = np.asarray(base_zs, dtype=np.float64)
+    
+    # Box extents per step, with the landing appended as the last box
+    steps = np.arange(num_steps)
+    step_y = y_min + steps * step_depth
+    y_start = np.append(step_y, y_max - STAIR_LANDING)
+    y_end = np.append(step_y + step_depth, y_max)
+    top_z = base_zs[:, None] + np.append((steps + 1) * step_height, floor_height)
+    bottom_z = top_z - np.append(np.full(num_steps, step_thickness), landing_thickness)
+    
+    flights, boxes = len(base_zs), num_steps + 1
+    min_cos = np.empty((flights, boxes, 3))
+    max_cos = np.empty((flights, boxes, 3))
+    min_cos[..., 0] = x_min
+    max_cos[..., 0] = x_max
+    min_cos[..., 1] = y_start
+    max_cos[..., 1] = y_end
+    min_cos[..., 2] = bottom_z
+    max_cos[..., 2] = top_z
+    return util.box_geometry(min_cos, max_cos)
+
+
+def build_interior_stair_flights(bm: bmesh.types.BMesh, stair_zone: Zone, floor_height: float,
+                                 base_zs):
+    """
+    Build the interior stair flights of several floors with a single bulk submission.
     
-    lt0 = bm.verts.new(Vector((x_min, y_max - STAIR_LANDING, landing_z)))
-    lt1 = bm.verts.new(Vector((x_max, y_max - STAIR_LANDING, landing_z)))
-    lt2 = bm.verts.new(Vector((x_max, y_max, landing_z)))
-    lt3 = bm.verts.new(Vector((x_min, y_max, landing_z)))
-    
-    lb0 = bm.verts.new(Vector((x_min, y_max - STAIR_LANDING, landing_z - landing_thickness)))
-    lb1 = bm.verts.new(Vector((x_max, y_max - STAIR_LANDING, landing_z - landing_thickness)))
-    lb2 = bm.verts.new(Vector((x_max, y_max, landing_z - landing_thickness)))
-    lb3 = bm.verts.new(Vector((x_min, y_max, landing_z - landing_thickness)))
-    
-    f = bm.faces.new([lt0, lt1, lt2, lt3])
-    f.material_index = MAT_STAIRS
-    faces.append(f)
-    
-    f = bm.faces.new([lb3, lb2, lb1, lb0])
-    f.material_index = MAT_STAIRS
-    faces.append(f)
-    
-    f = bm.faces.new([lb0, lb1, lt1, lt0])
-    f.material_index = MAT_STAIRS
-    faces.append(f)
+    Args:
+        bm: BMesh to add geometry to
+        stair_zone: Zone the flights are built in
+        floor_height: Height climbed by each flight
+        base_zs: Base height of every flight
+    """
+    if len(base_zs):
+        verts, faces = interior_stair_geometry(stair_zone, floor_height, base_zs)
+        util.add_geometry_bulk(bm, verts, faces, MAT_STAIRS)
+
+
+def build_interior_stairs(bm: bmesh.types.BMesh, stair_zone: Zone, floor_height: float,
+                          base_z: float):
+    """
+    Build interior stairs within the designated stair zone.
+    Stairs go from base_z to base_z + floor_height.
+    """
+    build_interior_stair_flights(bm, stair_zone, floor_height, [base_z])
+
+
+class BuildLimits(NamedTuple):
+    """
+    Floor and height limits that damage and a patio put on interior elements.
     
-    f = bm.faces.new([lb2, lb3, lt3, lt2])
-    f.material_index = MAT_STAIRS
-    faces.append(f)
+    max_interior_floor is the number of floors that get interior walls,
+    max_stair_floor the number of floors that get a stair flight (before
+    the multi-floor and slab checks) and max_rubble_height the highest point
+    rubble fill may reach.
+    """
+    max_interior_floor: int
+    max_stair_floor: int
+    max_rubble_height: float
+
+
+@lru_cache(maxsize=64)
+def _build_limits(floors: int, floor_height: float, damage_min_height: float,
+                  has_patio: bool, damage_enabled: bool) -> BuildLimits:
+    """Cached body of get_build_limits, keyed on the scalar parameters it reads."""
+    total_height = floors * floor_height
+    has_patio = has_patio and floors >= 2
+    damaged = damage_min_height is not None and damage_min_height < total_height
     
-    f = bm.faces.new([lb3, lb0, lt0, lt3])
-    f.material_index = MAT_STAIRS
-    faces.append(f)
+    # Only build interiors for floors completely below damage, and don't
+    # generate interior walls on the patio floor (top floor). Stairs can go
+    # up to the patio but must still respect damage
+    max_interior_floor = int(damage_min_height / floor_height) if damaged else floors
+    if has_patio:
+        max_interior_floor = min(max_interior_floor, floors - 1)
+    max_stair_floor = int(damage_min_height / floor_height) - 1 if damaged else floors - 1
     
-    f = bm.faces.new([lb1, lb2, lt2, lt1])
-    f.material_index = MAT_STAIRS
-    faces.append(f)
+    # Rubble stays below the lowest damage point and the patio floor
+    max_rubble_height = total_height - 0.1
+    if damage_enabled and damage_min_height is not None:
+        max_rubble_height = min(max_rubble_height, damage_min_height - 0.1)
+    if has_patio:
+        max_rubble_height = min(max_rubble_height, (floors - 1) * floor_height - 0.1)
     
-    return faces
+    return BuildLimits(max_interior_floor, max_stair_floor, max_rubble_height)
+
+
+def get_build_limits(params: dict) -> BuildLimits:
+    """Get the damage and patio limits for interior walls, stairs and rubble."""
+    return _build_limits(params['floors'], params['floor_height'],
+                         params.get('damage_min_height', None),
+                         params.get('has_patio', False),
+                         params.get('enable_damage', False) and params.get('damage_amount', 0) > 0)
 
 
-def generate_interior_layout(bm: bmesh.types.BMesh, params: dict) -> list:
+def generate_interior_layout(bm: bmesh.types.BMesh, params: dict):
     """
     Generate complete interior layout based on building profile.
     
@@ -1488,13 +1764,11 @@ def generate_interior_layout(bm: bmesh.types.BMesh, params: dict) -> list:
     - Upper floor walls use same layout as ground floor for structural consistency
     - Damage-aware: walls and stairs only built below damage line
     """
-    faces = []
-    
     profile_name = params.get('building_profile', 'NONE')
     profile_class = BUILDING_PROFILES.get(profile_name, BuildingProfile)
     
     if profile_name == 'NONE':
-        return faces
+        return
     
     width = params['width']
     depth = params['depth']
@@ -1503,22 +1777,8 @@ def generate_interior_layout(bm: bmesh.types.BMesh, params: dict) -> list:
     wall_thickness = params.get('wall_thickness', 0.25)
     floor_slabs_enabled = params.get('floor_slabs', True)
     
-    # Check for damage - limit interior elements to below damage line
-    damage_min_height = params.get('damage_min_height', None)
-    total_height = floors * floor_height
-    
-    # Calculate max floor index that is below damage
-    if damage_min_height is not None and damage_min_height < total_height:
-        # Only build interiors for floors completely below damage
-        max_interior_floor = int(damage_min_height / floor_height)
-    else:
-        max_interior_floor = floors
-    
-    # Check for patio - don't generate interior walls on patio floor (top floor)
-    has_patio = params.get('has_patio', False) and floors >= 2
-    if has_patio:
-        # Don't generate interior walls on the top floor (patio floor)
-        max_interior_floor = min(max_interior_floor, floors - 1)
+    # Damage and patio limit interior elements to the floors below them
+    max_interior_floor, max_stair_floor, _ = get_build_limits(params)
     
     # Get window/door positions for wall attachment validation
     window_positions = get_window_positions(width, depth, params)
@@ -1534,42 +1794,40 @@ def generate_interior_layout(bm: bmesh.types.BMesh, params: dict) -> list:
     
     # Build validated ground floor walls list (reused for upper floors for structural support)
     validated_ground_walls = []
-    for wall_def in ground_floor_layout.get('walls', []):
-        adjusted_start, adjusted_end = validate_and_adjust_cardinal_wall(
-            wall_def['start'], wall_def['end'],
-            width, depth, wall_thickness, window_positions
-        )
-        
-        if adjusted_start is None or adjusted_end is None:
-            continue
-        
-        adjusted_wall = wall_def.copy()
-        adjusted_wall['start'] = adjusted_start
-        adjusted_wall['end'] = adjusted_end
-        
-        if (adjusted_end - adjusted_start).length < 0.3:
-            continue
-        
-        validated_ground_walls.append(adjusted_wall)
+    ground_walls = ground_floor_layout.get('walls', [])
+    if ground_walls:
+        keep, adjusted = validate_cardinal_batch(
+            WallArray.from_wall_defs(ground_walls),
+            *get_interior_bounds(width, depth, wall_thickness), window_positions)
+        dx = adjusted.x1 - adjusted.x0
+        dy = adjusted.y1 - adjusted.y0
+        long_enough = dx * dx + dy * dy >= 0.3 * 0.3
+        
+        # Endpoints stay in the array form until the surviving rows are
+        # converted back to wall definitions in one pass; the kept walls are
+        # streamed into it rather than collected first
+        rows = np.column_stack([adjusted.x0, adjusted.y0, adjusted.x1, adjusted.y1]).tolist()
+        validated_ground_walls = [
+            replace(wall_def, start=(x0, y0), end=(x1, y1))
+            for wall_def, (x0, y0, x1, y1), usable
+            in zip(compress(ground_walls, keep.tolist()), rows, long_enough.tolist())
+            if usable
+        ]
+    
+    # Abutting pieces of one wall line are built as a single box
+    validated_ground_walls = merge_collinear_walls(validated_ground_walls)
     
     # Generate interior walls for each floor (limited by damage)
-    for floor_idx in range(min(floors, max_interior_floor)):
-        floor_base_z = floor_idx * floor_height
-        
-        if floor_idx == 0:
-            # Ground floor: use the validated ground floor walls
-            for wall_def in validated_ground_walls:
-                faces.extend(build_interior_wall(bm, wall_def, floor_base_z))
-        else:
-            # Upper floors: ONLY generate walls if floor slabs are enabled
-            # (walls need floor slab to stand on)
-            if not floor_slabs_enabled:
-                continue  # Skip upper floor walls - nothing to support them
-            
-            # Upper floors use SAME wall layout as ground floor for structural consistency
-            # This ensures walls are stacked directly on top of each other
-            for wall_def in validated_ground_walls:
-                faces.extend(build_interior_wall(bm, wall_def, floor_base_z))
+    wall_floors = min(floors, max_interior_floor)
+    if not floor_slabs_enabled:
+        # Upper floors ONLY get walls if floor slabs are enabled
+        # (walls need floor slab to stand on)
+        wall_floors = min(wall_floors, 1)
+    
+    # Upper floors use SAME wall layout as ground floor for structural consistency
+    # This ensures walls are stacked directly on top of each other
+    build_interior_walls(bm, validated_ground_walls,
+                         [floor_idx * floor_height for floor_idx in range(wall_floors)])
     
     # Generate interior stairs ONLY if:
     # 1. Multi-floor building
@@ -1577,24 +1835,15 @@ def generate_interior_layout(bm: bmesh.types.BMesh, params: dict) -> list:
     # 3. Not using exterior stairs only
     # 4. Below damage line (stairs can't go above damaged areas)
     if floors > 1 and stair_zone and floor_slabs_enabled and not params.get('exterior_stairs', False):
-        # Calculate max stair floor - stairs can go up to patio even if interior walls don't
-        # But stairs should still respect damage
-        if damage_min_height is not None and damage_min_height < total_height:
-            max_stair_floor = int(damage_min_height / floor_height) - 1
-        else:
-            max_stair_floor = floors - 1
-        
-        for floor_idx in range(max(0, max_stair_floor)):
-            floor_base_z = floor_idx * floor_height
-            faces.extend(build_interior_stairs(bm, stair_zone, floor_height, floor_base_z))
-    
-    return faces
+        build_interior_stair_flights(
+            bm, stair_zone, floor_height,
+            [floor_idx * floor_height for floor_idx in range(max(0, max_stair_floor))])
 
 
-def get_floor_slab_opening(params: dict) -> dict:
+def get_floor_slab_opening(params: dict) -> Zone:
     """
     Get floor slab opening for stair access.
-    Returns opening dict or None.
+    Returns the opening Zone or None.
     
     Only returns opening if:
     - Building has multiple floors
@@ -1627,12 +1876,13 @@ def generate_rubble_fill(bm: bmesh.types.BMesh, params: dict) -> list:
     - FILLED: Entire interior is filled (solid block, no interior visible)
     - PARTIAL: Lower floors filled, upper floors open
     - RUBBLE_PILES: Random rubble piles inside the building
-    """
-    faces = []
     
+    Returns:
+        List of the created faces
+    """
     fill_mode = params.get('interior_fill', 'NONE')
     if fill_mode == 'NONE':
-        return faces
+        return []
     
     width = params['width']
     depth = params['depth']
@@ -1642,29 +1892,18 @@ def generate_rubble_fill(bm: bmesh.types.BMesh, params: dict) -> list:
     
     ix_min, iy_min, ix_max, iy_max = get_interior_bounds(width, depth, wall_thickness)
     
-    # Check for damage - rubble shouldn't exceed the lowest damage point
-    total_height = floors * floor_height
-    max_rubble_height = total_height - 0.1
-    
-    # If damage is enabled, limit rubble to lowest damage height
-    if params.get('enable_damage', False) and params.get('damage_amount', 0) > 0:
-        # Get minimum damage height from params if available
-        damage_min_height = params.get('damage_min_height', None)
-        if damage_min_height is not None:
-            max_rubble_height = min(max_rubble_height, damage_min_height - 0.1)
+    # Rubble shouldn't exceed the lowest damage point or the patio floor
+    max_rubble_height = get_build_limits(params).max_rubble_height
     
-    # If patio is enabled, limit rubble to below the patio floor
-    if params.get('has_patio', False) and floors >= 2:
-        patio_floor_z = (floors - 1) * floor_height
-        max_rubble_height = min(max_rubble_height, patio_floor_z - 0.1)
+    # Fill blocks are collected and added to the BMesh in one submission
+    verts, faces = [], []
+    face_count = len(bm.faces)
     
     if fill_mode == 'FILLED':
         # Completely filled - one solid block covering all interior space
         fill_height = max_rubble_height
         
-        min_co = Vector((ix_min, iy_min, 0))
-        max_co = Vector((ix_max, iy_max, fill_height))
-        faces.extend(util.create_box(bm, min_co, max_co, MAT_RUBBLE))
+        util.append_box(verts, faces, (ix_min, iy_min, 0), (ix_max, iy_max, fill_height))
         
     elif fill_mode == 'PARTIAL':
         # Partial fill - fill some floors, leave others open with slanted top
@@ -1675,162 +1914,131 @@ def generate_rubble_fill(bm: bmesh.types.BMesh, params: dict) -> list:
             base_fill_height = fill_floors * floor_height - util.random_float(0.3, 0.6)
             # Limit to max rubble height (respects damage)
             base_fill_height = min(base_fill_height, max_rubble_height - 0.5)
-            faces.extend(_create_slanted_fill(bm, ix_min, iy_min, ix_max, iy_max, base_fill_height, max_rubble_height))
+            _append_slanted_fill(verts, faces, ix_min, iy_min, ix_max, iy_max,
+                                 base_fill_height, max_rubble_height)
     
     elif fill_mode == 'RUBBLE_PILES':
         # Random rubble piles inside the building (ground floor only)
-        faces.extend(_generate_rubble_piles(bm, params))
+        _generate_rubble_piles(bm, params)
     
-    return faces
+    util.add_geometry_bulk(bm, verts, faces, MAT_RUBBLE)
+    bm.faces.ensure_lookup_table()
+    return bm.faces[face_count:]
+
 
+# Faces of a slanted fill block over the corners from _slant_corners:
+# bottom, top (slanted), front, back, left, right
+_FILL_BOX_FACES = (
+    (0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+    (2, 3, 7, 6), (3, 0, 4, 7), (1, 2, 6, 5),
+)
 
-def _create_slanted_fill(bm: bmesh.types.BMesh, x_min: float, y_min: float, 
-                          x_max: float, y_max: float, base_height: float,
-                          max_height: float = None) -> list:
+
+@util.njit(cache=True)
+def _slant_corners(x_min, y_min, x_max, y_max, base_height, slant_x, slant_y,
+                   jitter_00, jitter_10, jitter_01, jitter_11, max_height):
     """
-    Create a rubble fill with a slanted/uneven top surface.
-    Uses a simple mesh with randomized top vertices.
+    Corners of a slanted fill block as an (8, 3) array.
     
-    Args:
-        max_height: Maximum allowed height (to stay within building bounds)
+    Rows are the bottom corners at z=0 and then the top corners, each in
+    the order front-left, front-right, back-right, back-left. Top heights
+    follow the slant plus per-corner jitter and are clamped to
+    [0.3, max_height].
     """
-    faces = []
-    
-    # Random slant direction and amount
-    slant_x = util.random_float(-0.3, 0.3)  # Height variation per meter in X
-    slant_y = util.random_float(-0.3, 0.3)  # Height variation per meter in Y
-    
     width = x_max - x_min
     depth = y_max - y_min
     
-    # Calculate corner heights with slant
-    h_00 = base_height  # Front-left corner (reference)
-    h_10 = base_height + slant_x * width  # Front-right
-    h_01 = base_height + slant_y * depth  # Back-left
-    h_11 = base_height + slant_x * width + slant_y * depth  # Back-right
+    # Corner heights with slant, referenced to the front-left corner
+    h_00 = base_height + jitter_00
+    h_10 = base_height + slant_x * width + jitter_10
+    h_01 = base_height + slant_y * depth + jitter_01
+    h_11 = base_height + slant_x * width + slant_y * depth + jitter_11
     
-    # Add random variation to each corner
-    h_00 += util.random_float(-0.2, 0.2)
-    h_10 += util.random_float(-0.2, 0.2)
-    h_01 += util.random_float(-0.2, 0.2)
-    h_11 += util.random_float(-0.2, 0.2)
-    
-    # Ensure minimum height
+    # Ensure minimum height, then stay within building bounds
     min_h = 0.3
-    h_00 = max(min_h, h_00)
-    h_10 = max(min_h, h_10)
-    h_01 = max(min_h, h_01)
-    h_11 = max(min_h, h_11)
-    
-    # Clamp to maximum height (stay within building bounds)
-    if max_height is not None:
-        h_00 = min(h_00, max_height)
-        h_10 = min(h_10, max_height)
-        h_01 = min(h_01, max_height)
-        h_11 = min(h_11, max_height)
-    
-    # Create vertices
-    # Bottom face (flat at z=0)
-    v_b00 = bm.verts.new(Vector((x_min, y_min, 0)))
-    v_b10 = bm.verts.new(Vector((x_max, y_min, 0)))
-    v_b11 = bm.verts.new(Vector((x_max, y_max, 0)))
-    v_b01 = bm.verts.new(Vector((x_min, y_max, 0)))
-    
-    # Top face (slanted)
-    v_t00 = bm.verts.new(Vector((x_min, y_min, h_00)))
-    v_t10 = bm.verts.new(Vector((x_max, y_min, h_10)))
-    v_t11 = bm.verts.new(Vector((x_max, y_max, h_11)))
-    v_t01 = bm.verts.new(Vector((x_min, y_max, h_01)))
-    
-    # Create faces
-    # Bottom
-    f = bm.faces.new([v_b00, v_b01, v_b11, v_b10])
-    f.material_index = MAT_RUBBLE
-    faces.append(f)
-    
-    # Top (slanted)
-    f = bm.faces.new([v_t00, v_t10, v_t11, v_t01])
-    f.material_index = MAT_RUBBLE
-    faces.append(f)
-    
-    # Front
-    f = bm.faces.new([v_b00, v_b10, v_t10, v_t00])
-    f.material_index = MAT_RUBBLE
-    faces.append(f)
-    
-    # Back
-    f = bm.faces.new([v_b11, v_b01, v_t01, v_t11])
-    f.material_index = MAT_RUBBLE
-    faces.append(f)
-    
-    # Left
-    f = bm.faces.new([v_b01, v_b00, v_t00, v_t01])
-    f.material_index = MAT_RUBBLE
-    faces.append(f)
-    
-    # Right
-    f = bm.faces.new([v_b10, v_b11, v_t11, v_t10])
-    f.material_index = MAT_RUBBLE
-    faces.append(f)
-    
-    return faces
-
-
-def _create_organic_pile(bm: bmesh.types.BMesh, center_x: float, center_y: float,
-                          base_z: float, radius: float, height: float) -> list:
-    """
-    Create an organic rubble pile shape using a low-poly cone/mound.
-    Uses 8-12 vertices for an irregular blob shape.
+    h_00 = min(max(min_h, h_00), max_height)
+    h_10 = min(max(min_h, h_10), max_height)
+    h_01 = min(max(min_h, h_01), max_height)
+    h_11 = min(max(min_h, h_11), max_height)
+    
+    corners = np.empty((8, 3))
+    corners[0] = (x_min, y_min, 0.0)
+    corners[1] = (x_max, y_min, 0.0)
+    corners[2] = (x_max, y_max, 0.0)
+    corners[3] = (x_min, y_max, 0.0)
+    corners[4] = (x_min, y_min, h_00)
+    corners[5] = (x_max, y_min, h_10)
+    corners[6] = (x_max, y_max, h_11)
+    corners[7] = (x_min, y_max, h_01)
+    return corners
+
+
+def _append_slanted_fill(verts: list, faces: list, x_min: float, y_min: float,
+                         x_max: float, y_max: float, base_height: float,
+                         max_height: float = None):
     """
-    faces = []
+    Append a rubble fill with a slanted/uneven top surface.
+    Uses a simple mesh with randomized top vertices.
+    
+    Args:
+        max_height: Maximum allowed height (to stay within building bounds)
+    """
+    # Random slant direction and amount (height variation per meter in X
+    # and Y), then random variation for each corner, drawn front-left,
+    # front-right, back-left, back-right
+    slant_x, slant_y, *jitter = util.random_floats([(-0.3, 0.3)] * 2 + [(-0.2, 0.2)] * 4)
+    
+    corners = _slant_corners(x_min, y_min, x_max, y_max, base_height, slant_x, slant_y,
+                             *jitter, math.inf if max_height is None else max_height)
+    base = len(verts)
+    verts.extend(corners.tolist())
+    faces.extend([tuple(base + i for i in quad) for quad in _FILL_BOX_FACES])
+
+
+def _append_organic_pile(verts: list, faces: list, center_x: float, center_y: float,
+                         base_z: float, radius: float, height: float):
+    """
+    Append an organic rubble pile shape using a low-poly cone/mound.
+    Uses 8-12 vertices for an irregular blob shape.
     
+    The pile's (x, y, z) coordinates are appended to verts and its faces,
+    as index lists into verts, to faces.
+    """
     # Number of sides for the base (6-8 for organic look)
     num_sides = util.random_int(5, 7)
     
-    # Create base vertices (irregular polygon on ground)
-    base_verts = []
-    import math
-    
-    for i in range(num_sides):
-        angle = (2 * math.pi * i / num_sides) + util.random_float(-0.3, 0.3)
-        # Vary radius for each vertex
-        r = radius * util.random_float(0.7, 1.0)
-        x = center_x + r * math.cos(angle)
-        y = center_y + r * math.sin(angle)
-        base_verts.append(bm.verts.new(Vector((x, y, base_z))))
-    
-    # Create peak vertex (slightly off-center for natural look)
-    peak_offset_x = util.random_float(-radius * 0.3, radius * 0.3)
-    peak_offset_y = util.random_float(-radius * 0.3, radius * 0.3)
-    peak_height = height * util.random_float(0.8, 1.0)
-    peak_vert = bm.verts.new(Vector((center_x + peak_offset_x, center_y + peak_offset_y, base_z + peak_height)))
-    
-    # Create base face (n-gon)
-    try:
-        f = bm.faces.new(base_verts)
-        f.material_index = MAT_RUBBLE
-        faces.append(f)
-    except:
-        pass  # Skip if face creation fails
-    
-    # Create side faces (triangles from base to peak)
-    for i in range(num_sides):
-        next_i = (i + 1) % num_sides
-        try:
-            f = bm.faces.new([base_verts[i], base_verts[next_i], peak_vert])
-            f.material_index = MAT_RUBBLE
-            faces.append(f)
-        except:
-            pass
-    
-    return faces
-
-
-def _generate_rubble_piles(bm: bmesh.types.BMesh, params: dict) -> list:
+    # Base vertices (irregular polygon on ground). The angle jitter and
+    # radius of each vertex are drawn in turn so seeded piles keep their
+    # shape; the trigonometry then runs over all vertices at once. The
+    # jitter (+-0.3) is below half the 2*pi/7 minimum spacing, so the base
+    # polygon never folds over
+    jitter = np.array(util.random_floats([(-0.3, 0.3), (0.7, 1.0)] * num_sides)).reshape(-1, 2)
+    angles = 2 * np.pi * np.arange(num_sides) / num_sides + jitter[:, 0]
+    radii = radius * jitter[:, 1]
+    xs = center_x + radii * np.cos(angles)
+    ys = center_y + radii * np.sin(angles)
+    
+    # Peak vertex (slightly off-center for natural look)
+    peak_offset_x, peak_offset_y, peak_scale = util.random_floats(
+        [(-radius * 0.3, radius * 0.3)] * 2 + [(0.8, 1.0)])
+    peak_height = height * peak_scale
+    
+    # Base face (n-gon) and side faces (triangles from base to peak)
+    first = len(verts)
+    peak = first + num_sides
+    verts.extend(zip(xs.tolist(), ys.tolist(), [base_z] * num_sides))
+    verts.append((center_x + peak_offset_x, center_y + peak_offset_y, base_z + peak_height))
+    faces.append(range(first, peak))
+    faces.extend([first + i, first + (i + 1) % num_sides, peak] for i in range(num_sides))
+
+
+def _generate_rubble_piles(bm: bmesh.types.BMesh, params: dict):
     """
     Generate organic rubble piles inside the building.
     Only on ground floor, 2-5 piles with blob/mound shapes.
+    All piles are added to the BMesh in one bulk submission.
     """
+    verts = []
     faces = []
     
     width = params['width']
@@ -1847,51 +2055,46 @@ def _generate_rubble_piles(bm: bmesh.types.BMesh, params: dict) -> list:
     extra_piles = int(rubble_density * 3)  # 0-3 extra based on density
     num_piles = min(5, base_piles + extra_piles)
     
-    # Keep track of pile positions to avoid overlap
-    pile_positions = []
+    # Placed piles as (x, y, radius) rows, to avoid overlap
+    placed = np.empty((0, 3))
+    
+    # Random position within interior (with margin) and pile size
+    margin = 0.8
+    pile_bounds = [
+        (ix_min + margin, ix_max - margin),
+        (iy_min + margin, iy_max - margin),
+        (0.4, min(1.2, min(interior_width, interior_depth) * 0.25)),
+        (0.3, 0.8),
+    ]
     
     for _ in range(num_piles):
         # Try to find a non-overlapping position
         attempts = 0
         while attempts < 10:
-            # Random position within interior (with margin)
-            margin = 0.8
-            pile_x = util.random_float(ix_min + margin, ix_max - margin)
-            pile_y = util.random_float(iy_min + margin, iy_max - margin)
+            pile_x, pile_y, pile_radius, pile_height = util.random_floats(pile_bounds)
             
-            # Random pile size
-            pile_radius = util.random_float(0.4, min(1.2, min(interior_width, interior_depth) * 0.25))
-            pile_height = util.random_float(0.3, 0.8)
-            
-            # Check for overlap with existing piles
-            overlaps = False
-            for px, py, pr in pile_positions:
-                dist = ((pile_x - px) ** 2 + (pile_y - py) ** 2) ** 0.5
-                if dist < (pile_radius + pr) * 0.8:  # Allow slight overlap
-                    overlaps = True
-                    break
-            
-            if not overlaps:
-                pile_positions.append((pile_x, pile_y, pile_radius))
+            # Check for overlap with existing piles (allow slight overlap)
+            dist = np.hypot(placed[:, 0] - pile_x, placed[:, 1] - pile_y)
+            if np.all(dist >= (placed[:, 2] + pile_radius) * 0.8):
+                placed = np.vstack([placed, (pile_x, pile_y, pile_radius)])
                 # Create organic pile on ground floor (z=0)
-                faces.extend(_create_organic_pile(bm, pile_x, pile_y, 0, pile_radius, pile_height))
+                _append_organic_pile(verts, faces, pile_x, pile_y, 0, pile_radius, pile_height)
                 break
             
             attempts += 1
     
-    return faces
+    util.add_geometry_bulk(bm, verts, faces, MAT_RUBBLE)
 
 
-def generate_exterior_rubble(bm: bmesh.types.BMesh, params: dict) -> list:
+def generate_exterior_rubble(bm: bmesh.types.BMesh, params: dict):
     """
     Generate organic rubble piles outside the building (collapsed debris).
     
-    Creates debris piles near walls with mound/blob shapes.
+    Creates debris piles near walls with mound/blob shapes, added to the
+    BMesh in one bulk submission.
     """
-    faces = []
-    
     if not params.get('exterior_rubble', False):
-        return faces
+        return
     
     width = params['width']
     depth = params['depth']
@@ -1899,29 +2102,27 @@ def generate_exterior_rubble(bm: bmesh.types.BMesh, params: dict) -> list:
     
     # Generate rubble piles around the building perimeter
     num_piles = params.get('exterior_rubble_piles', 4)
+    verts = []
+    faces = []
     
     for i in range(num_piles):
         # Choose a side of the building randomly
         side = util.random_int(0, 3)
         
         if side == 0:  # Front (Y = 0)
-            pile_x = util.random_float(0.5, width - 0.5)
-            pile_y = util.random_float(-rubble_spread * 0.8, -0.3)
+            position_bounds = [(0.5, width - 0.5), (-rubble_spread * 0.8, -0.3)]
         elif side == 1:  # Back (Y = depth)
-            pile_x = util.random_float(0.5, width - 0.5)
-            pile_y = util.random_float(depth + 0.3, depth + rubble_spread * 0.8)
+            position_bounds = [(0.5, width - 0.5), (depth + 0.3, depth + rubble_spread * 0.8)]
         elif side == 2:  # Left (X = 0)
-            pile_x = util.random_float(-rubble_spread * 0.8, -0.3)
-            pile_y = util.random_float(0.5, depth - 0.5)
+            position_bounds = [(-rubble_spread * 0.8, -0.3), (0.5, depth - 0.5)]
         else:  # Right (X = width)
-            pile_x = util.random_float(width + 0.3, width + rubble_spread * 0.8)
-            pile_y = util.random_float(0.5, depth - 0.5)
+            position_bounds = [(width + 0.3, width + rubble_spread * 0.8), (0.5, depth - 0.5)]
         
-        # Random pile size (exterior piles can be a bit larger)
-        pile_radius = util.random_float(0.4, 1.0)
-        pile_height = util.random_float(0.2, 0.6)
+        # Random position, then pile size (exterior piles can be a bit larger)
+        pile_x, pile_y, pile_radius, pile_height = util.random_floats(
+            position_bounds + [(0.4, 1.0), (0.2, 0.6)])
         
         # Use organic pile shape
-        faces.extend(_create_organic_pile(bm, pile_x, pile_y, 0, pile_radius, pile_height))
+        _append_organic_pile(verts, faces, pile_x, pile_y, 0, pile_radius, pile_height)
     
-    return faces
+    util.add_geometry_bulk(bm, verts, faces, MAT_RUBBLE)
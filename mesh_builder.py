@@ -1,8 +1,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Mesh building functions for Procedural Building Shell Generator
 
+from bisect import insort
+from operator import itemgetter
+from typing import NamedTuple
+
+import bpy
 import bmesh
 from mathutils import Vector
+import numpy as np
 from . import util
 from . import interiors
 from . import damage as damage_module
@@ -16,6 +22,14 @@ MAT_WINDOW_FRAME = 3
 MAT_DOOR_FRAME = 4
 
 
+# Box projection planes as the (u, v) coordinate columns they take: XY for
+# faces pointing up/down, YZ for left/right, XZ for front/back. The normal
+# axes are compared in the order Z, X, Y so that ties pick the same plane
+# as the first maximum in this order.
+_UV_AXIS_ORDER = [2, 0, 1]
+_UV_PLANE_COLUMNS = np.array([[0, 1], [1, 2], [0, 2]])
+
+
 def generate_uvs(bm: bmesh.types.BMesh):
     """
     Generate UV coordinates for all faces using box projection.
@@ -23,30 +37,28 @@ def generate_uvs(bm: bmesh.types.BMesh):
     This creates basic UV coordinates that can be refined later.
     Uses world-space projection based on face normal direction.
     """
-    # Ensure UV layer exists
-    uv_layer = bm.loops.layers.uv.verify()
-    
-    for face in bm.faces:
-        # Determine projection axis based on face normal
-        normal = face.normal
-        abs_normal = (abs(normal.x), abs(normal.y), abs(normal.z))
-        
-        # Choose projection plane based on dominant normal axis
-        if abs_normal[2] >= abs_normal[0] and abs_normal[2] >= abs_normal[1]:
-            # Face mostly points up/down - project onto XY plane
-            for loop in face.loops:
-                co = loop.vert.co
-                loop[uv_layer].uv = (co.x, co.y)
-        elif abs_normal[0] >= abs_normal[1]:
-            # Face mostly points left/right - project onto YZ plane
-            for loop in face.loops:
-                co = loop.vert.co
-                loop[uv_layer].uv = (co.y, co.z)
-        else:
-            # Face mostly points front/back - project onto XZ plane
-            for loop in face.loops:
-                co = loop.vert.co
-                loop[uv_layer].uv = (co.x, co.z)
+    util.edit_as_mesh(bm, _project_uvs)
+
+
+def _project_uvs(mesh):
+    """
+    Box project the UVs of mesh data.
+    
+    The projection plane of every polygon comes from one argmax over the
+    absolute normals, and all loop UVs are written with one foreach_set.
+    """
+    co = util.foreach_get_array(mesh.vertices, "co", np.float32, 3)
+    loop_verts = util.foreach_get_array(mesh.loops, "vertex_index", np.int32)
+    normals = util.foreach_get_array(mesh.polygons, "normal", np.float32, 3)
+    loop_totals = util.foreach_get_array(mesh.polygons, "loop_total", np.int32)
+    
+    # Choose projection plane based on dominant normal axis
+    planes = np.abs(normals)[:, _UV_AXIS_ORDER].argmax(axis=1)
+    columns = np.repeat(_UV_PLANE_COLUMNS[planes], loop_totals, axis=0)
+    uvs = np.take_along_axis(co[loop_verts], columns, axis=1)
+    
+    uv_layer = mesh.uv_layers.active or mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", uvs.ravel())
 
 
 def mark_seams_for_uvs(bm: bmesh.types.BMesh):
@@ -60,89 +72,89 @@ def mark_seams_for_uvs(bm: bmesh.types.BMesh):
     - Edges on damaged wall tops (irregular geometry)
     - All boundary edges
     """
-    bm.edges.ensure_lookup_table()
-    bm.faces.ensure_lookup_table()
+    util.edit_as_mesh(bm, _mark_seams)
+
+
+def _mark_seams(mesh):
+    """
+    Mark the UV seams of mesh data, see mark_seams_for_uvs.
     
-    for edge in bm.edges:
-        should_mark = False
-        
-        # Mark edges between faces with different materials
-        if len(edge.link_faces) == 2:
-            f1, f2 = edge.link_faces
-            if f1.material_index != f2.material_index:
-                should_mark = True
-        
-        # Mark boundary edges (edges with only 1 face) - important for damage
-        if len(edge.link_faces) == 1:
-            should_mark = True
-        
-        # Mark edges with no faces (isolated edges that shouldn't exist but mark anyway)
-        if len(edge.link_faces) == 0:
-            should_mark = True
-        
-        # Mark vertical edges at corners (edges where face normals differ significantly)
-        if len(edge.link_faces) == 2:
-            f1, f2 = edge.link_faces
-            v1, v2 = edge.verts
-            
-            # Check if edge is vertical
-            is_vertical = (abs(v1.co.x - v2.co.x) < 0.01 and 
-                          abs(v1.co.y - v2.co.y) < 0.01 and
-                          abs(v1.co.z - v2.co.z) > 0.1)
-            
-            if is_vertical:
-                # Check if normals are perpendicular (corner edge)
-                dot = abs(f1.normal.dot(f2.normal))
-                if dot < 0.1:  # Normals are roughly perpendicular
-                    should_mark = True
-            
-            # Mark edges where wall meets top cap (one face vertical, one horizontal)
-            f1_vertical = abs(f1.normal.z) < 0.5
-            f2_vertical = abs(f2.normal.z) < 0.5
-            if f1_vertical != f2_vertical:  # One vertical, one horizontal
-                should_mark = True
-        
-        # Mark horizontal edges at floor boundaries
-        if len(edge.link_faces) >= 2:
-            v1, v2 = edge.verts
-            is_horizontal = abs(v1.co.z - v2.co.z) < 0.01
-            if is_horizontal:
-                # Check if this is at a floor height transition
-                for face in edge.link_faces:
-                    # Floor/ceiling faces have vertical normals
-                    if abs(face.normal.z) > 0.9:
-                        should_mark = True
-                        break
-        
-        # Mark edges on irregular damage top surfaces
-        # These are edges where connected faces have different Z heights at their centers
-        if len(edge.link_faces) == 2:
-            f1, f2 = edge.link_faces
-            # Check if both faces are top caps (facing up)
-            if abs(f1.normal.z) > 0.5 and abs(f2.normal.z) > 0.5:
-                # Check if face centers are at different heights (stepped damage)
-                c1 = f1.calc_center_median()
-                c2 = f2.calc_center_median()
-                if abs(c1.z - c2.z) > 0.1:
-                    should_mark = True
-        
-        if should_mark:
-            edge.seam = True
+    Every seam rule is evaluated for all edges at once on edge, polygon
+    and edge-face adjacency arrays. Existing seams are kept.
+    """
+    n_edges = len(mesh.edges)
+    co = util.foreach_get_array(mesh.vertices, "co", np.float64, 3)
+    edge_verts = util.foreach_get_array(mesh.edges, "vertices", np.int32, 2)
+    seams = util.foreach_get_array(mesh.edges, "use_seam", bool)
+    loop_edges = util.foreach_get_array(mesh.loops, "edge_index", np.int32)
+    loop_totals = util.foreach_get_array(mesh.polygons, "loop_total", np.int32)
+    normals = util.foreach_get_array(mesh.polygons, "normal", np.float64, 3)
+    centers = util.foreach_get_array(mesh.polygons, "center", np.float64, 3)
+    materials = util.foreach_get_array(mesh.polygons, "material_index", np.int32)
+    
+    # Faces linked to each edge, grouped by sorting the loops on their edge
+    loop_polys = np.repeat(np.arange(len(loop_totals)), loop_totals)
+    link_polys = loop_polys[np.argsort(loop_edges, kind="stable")]
+    link_count = np.bincount(loop_edges, minlength=n_edges)
+    link_start = np.cumsum(link_count) - link_count
+    edge_delta = np.abs(co[edge_verts[:, 1]] - co[edge_verts[:, 0]])
+    
+    # Mark boundary edges (edges with only 1 face) - important for damage,
+    # and edges with no faces (isolated edges that shouldn't exist)
+    seams |= link_count < 2
+    
+    # Rules for edges between exactly two faces
+    pairs = np.flatnonzero(link_count == 2)
+    f1 = link_polys[link_start[pairs]]
+    f2 = link_polys[link_start[pairs] + 1]
+    delta = edge_delta[pairs]
+    # Per-face values are computed once and gathered per edge
+    abs_nz = np.abs(normals[:, 2])
+    center_z = centers[:, 2]
+    nz1, nz2 = abs_nz[f1], abs_nz[f2]
+    
+    # Edges between faces with different materials
+    mark = materials[f1] != materials[f2]
+    # Vertical edges at corners (face normals roughly perpendicular)
+    is_vertical = (delta[:, :2] < 0.01).all(axis=1) & (delta[:, 2] > 0.1)
+    corner = np.flatnonzero(is_vertical)
+    mark[corner] |= np.abs(np.einsum("ij,ij->i", normals[f1[corner]],
+                                     normals[f2[corner]])) < 0.1
+    # Edges where wall meets top cap (one face vertical, one horizontal)
+    mark |= (nz1 < 0.5) != (nz2 < 0.5)
+    # Irregular damage tops: two upward faces with centers at different heights
+    mark |= (nz1 > 0.5) & (nz2 > 0.5) & (np.abs(center_z[f1] - center_z[f2]) > 0.1)
+    seams[pairs] |= mark
+    
+    # Horizontal edges at floor boundaries: any linked floor/ceiling face
+    is_flat = abs_nz > 0.9
+    flat_links = np.bincount(loop_edges, weights=is_flat[loop_polys], minlength=n_edges)
+    seams |= (link_count >= 2) & (edge_delta[:, 2] < 0.01) & (flat_links > 0)
+    
+    mesh.edges.foreach_set("use_seam", seams)
+
+
+_opening_x_start = itemgetter('x_start')
 
 
 class WallSegment:
     """Represents a wall segment with potential openings."""
     
+    __slots__ = ('start', 'end', 'height', 'base_z', 'openings',
+                 'length', 'direction', 'normal')
+    
     def __init__(self, start: Vector, end: Vector, height: float, base_z: float = 0.0,
                  normal: Vector = None):
         self.start = start.copy()
         self.end = end.copy()
         self.height = height
         self.base_z = base_z
-        self.openings = []  # List of opening dicts
+        self.openings = []  # List of opening dicts, sorted by x_start
         
-        # Calculate direction and normal
-        self.direction = (self.end - self.start).normalized()
+        # Calculate length, direction and normal once, as plain attributes
+        delta = self.end - self.start
+        self.length = delta.length
+        self.direction = delta.normalized()
         if normal is not None:
             self.normal = normal.copy()
         else:
@@ -152,17 +164,15 @@ class WallSegment:
     def add_opening(self, x_start: float, x_end: float, z_start: float, z_end: float, 
                     opening_type: str = 'window'):
         """Add an opening (window or door) to this wall segment."""
-        self.openings.append({
+        # Insert in x order (after openings with the same x_start), so the
+        # wall builders never have to sort
+        insort(self.openings, {
             'x_start': x_start,
             'x_end': x_end,
             'z_start': z_start,
             'z_end': z_end,
             'type': opening_type
-        })
-    
-    @property
-    def length(self) -> float:
-        return (self.end - self.start).length
+        }, key=_opening_x_start)
 
 
 def build_wall_with_openings(bm: bmesh.types.BMesh, segment: WallSegment, 
@@ -171,6 +181,8 @@ def build_wall_with_openings(bm: bmesh.types.BMesh, segment: WallSegment,
     Build a wall segment with thickness and openings cut out.
     
     Creates outer face, inner face, top/bottom caps, and opening frames.
+    The geometry is collected by build_wall_with_openings_on_mesh and
+    added to the BMesh in one bulk step.
     
     Args:
         bm: BMesh to add geometry to
@@ -181,137 +193,179 @@ def build_wall_with_openings(bm: bmesh.types.BMesh, segment: WallSegment,
     Returns:
         List of created faces
     """
-    faces = []
-    wall_length = segment.length
-    wall_height = segment.height
-    direction = segment.direction
-    normal = segment.normal
-    base_z = segment.base_z
+    verts, faces, materials = [], [], []
+    build_wall_with_openings_on_mesh(verts, faces, materials, segment,
+                                     thickness, add_top_cap)
+    face_count = len(bm.faces)
+    util.add_geometry_bulk(bm, verts, faces, materials)
+    bm.faces.ensure_lookup_table()
+    return bm.faces[face_count:]
+
+
+def build_wall_with_openings_on_mesh(verts: list, faces: list, materials: list,
+                                     segment: WallSegment, thickness: float,
+                                     add_top_cap: bool = False):
+    """
+    Append the vertices and quads of one wall segment to shared lists.
     
-    # Offset for inner wall (inward from normal)
-    inner_offset = -normal * thickness
+    Quad indices refer to the shared vertex list, so every wall of a
+    building can be collected first and merged into the BMesh at once.
     
-    # Sort openings by x position
-    openings = sorted(segment.openings, key=lambda o: o['x_start'])
+    Args:
+        verts: Shared list of (x, y, z) tuples to append to
+        faces: Shared list of vertex index quads to append to
+        materials: Shared list of material indices, one per quad
+        segment: WallSegment defining the wall
+        thickness: Wall thickness
+        add_top_cap: Whether to add a cap on top of the wall
+    """
+    # Openings are kept sorted by x position by WallSegment.add_opening
+    openings = segment.openings
     
     if not openings:
         # No openings - create a solid wall box
-        faces.extend(_create_solid_wall_segment(
-            bm, segment.start, segment.end, wall_height, base_z, 
-            thickness, normal, direction, add_top_cap
-        ))
+        _create_solid_wall_segment(
+            verts, faces, materials, segment, thickness, add_top_cap
+        )
     else:
         # Create wall with openings
-        faces.extend(_create_wall_with_openings_thick(
-            bm, segment, openings, thickness, add_top_cap
-        ))
+        _create_wall_with_openings_thick(
+            verts, faces, materials, segment, openings, thickness, add_top_cap
+        )
+
+
+# Quads of a wall box, as positions in the corners returned by _grid_box
+# (outer bl, br, tr, tl, then the same inner corners), for a wall with its
+# normal on the right of its direction (seen from above). Nothing reorients
+# faces after the build, so walls with the normal on the left use the same
+# quads reversed (see _wall_quads).
+_WALL_OUTER = (0, 1, 2, 3)
+_WALL_INNER = (5, 4, 7, 6)
+_WALL_TOP = (3, 2, 6, 7)
+_WALL_BOTTOM = (4, 5, 1, 0)
+_WALL_LEFT = (4, 0, 3, 7)
+_WALL_RIGHT = (1, 5, 6, 2)
+
+# Quads of a grid cell by (top cap, at ground level), of a solid wall by
+# top cap, and of the end caps of a wall with openings
+_CELL_QUADS = {
+    (top, ground): (_WALL_OUTER, _WALL_INNER) + ((_WALL_TOP,) if top else ())
+    + ((_WALL_BOTTOM,) if ground else ())
+    for top in (False, True) for ground in (False, True)
+}
+_SOLID_WALL_QUADS = {
+    top: _CELL_QUADS[top, True] + (_WALL_LEFT, _WALL_RIGHT) for top in (False, True)
+}
+_END_CAP_QUADS = (_WALL_LEFT, _WALL_RIGHT)
+
+# Frame quads around an opening box: top, left, right, then all four
+# with the bottom for openings above ground level
+_FRAME_SIDES = ((2, 3, 7, 6), (3, 0, 4, 7), (1, 2, 6, 5))
+_FRAME_QUADS = ((0, 1, 5, 4),) + _FRAME_SIDES
+
+
+class _WallQuads(NamedTuple):
+    """Quad templates for walls of one handedness."""
+    cells: dict           # Grid cells by (top cap, at ground level)
+    solid: dict           # Solid walls by top cap
+    end_caps: tuple       # End caps of a wall with openings
+    frame: tuple          # Frame of an opening above ground level
+    frame_sides: tuple    # Frame of an opening at ground level
+
+
+def _reversed_quads(quads) -> tuple:
+    """Return quads with their winding reversed."""
+    return tuple(quad[::-1] for quad in quads)
+
+
+_RIGHT_WALL_QUADS = _WallQuads(_CELL_QUADS, _SOLID_WALL_QUADS, _END_CAP_QUADS,
+                               _FRAME_QUADS, _FRAME_SIDES)
+_LEFT_WALL_QUADS = _WallQuads(
+    cells={key: _reversed_quads(quads) for key, quads in _CELL_QUADS.items()},
+    solid={key: _reversed_quads(quads) for key, quads in _SOLID_WALL_QUADS.items()},
+    end_caps=_reversed_quads(_END_CAP_QUADS),
+    frame=_reversed_quads(_FRAME_QUADS),
+    frame_sides=_reversed_quads(_FRAME_SIDES),
+)
+
+
+def _wall_quads(segment: WallSegment) -> _WallQuads:
+    """Pick the quad templates that make a wall's faces point outward."""
+    direction, normal = segment.direction, segment.normal
+    if direction.y * normal.x - direction.x * normal.y >= 0:
+        return _RIGHT_WALL_QUADS
+    return _LEFT_WALL_QUADS
+
+
+def _wall_axes(segment: WallSegment, thickness: float) -> tuple:
+    """
+    Return the plain float axes of a wall for _grid_box.
     
-    return faces
+    The tuple holds the outer bottom of the wall start, the unit direction
+    along the wall and the offset from the outer to the inner face.
+    """
+    start, direction = segment.start, segment.direction
+    inner_offset = -segment.normal * thickness
+    return (start.x, start.y, start.z + segment.base_z,
+            direction.x, direction.y, direction.z,
+            inner_offset.x, inner_offset.y, inner_offset.z)
 
 
-def _create_solid_wall_segment(bm: bmesh.types.BMesh, start: Vector, end: Vector,
-                                height: float, base_z: float, thickness: float,
-                                normal: Vector, direction: Vector,
-                                add_top_cap: bool = False) -> list:
-    """Create a solid wall segment (no openings) with thickness."""
-    faces = []
-    
-    inner_offset = -normal * thickness
-    
-    # 8 corners of the wall box
-    # Outer face corners
-    o_bl = start + Vector((0, 0, base_z))  # outer bottom-left
-    o_br = end + Vector((0, 0, base_z))    # outer bottom-right
-    o_tl = start + Vector((0, 0, base_z + height))
-    o_tr = end + Vector((0, 0, base_z + height))
-    
-    # Inner face corners
-    i_bl = o_bl + inner_offset
-    i_br = o_br + inner_offset
-    i_tl = o_tl + inner_offset
-    i_tr = o_tr + inner_offset
-    
-    verts = [
-        bm.verts.new(o_bl),  # 0
-        bm.verts.new(o_br),  # 1
-        bm.verts.new(o_tr),  # 2
-        bm.verts.new(o_tl),  # 3
-        bm.verts.new(i_bl),  # 4
-        bm.verts.new(i_br),  # 5
-        bm.verts.new(i_tr),  # 6
-        bm.verts.new(i_tl),  # 7
-    ]
-    
-    # Create all faces with consistent winding
-    # Outer face - should point in normal direction
-    f = bm.faces.new([verts[0], verts[1], verts[2], verts[3]])
-    f.material_index = MAT_WALLS
-    # Check if face normal aligns with expected normal, flip if not
-    if f.normal.dot(normal) < 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Inner face - should point opposite to normal direction
-    f = bm.faces.new([verts[5], verts[4], verts[7], verts[6]])
-    f.material_index = MAT_WALLS
-    # Inner face should point opposite to outer normal
-    if f.normal.dot(normal) > 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Top cap - ensure it faces upward
-    if add_top_cap:
-        f = bm.faces.new([verts[3], verts[2], verts[6], verts[7]])
-        f.material_index = MAT_WALLS
-        # Check actual normal and flip if pointing down
-        if f.normal.z < 0:
-            f.normal_flip()
-        faces.append(f)
-    
-    # Bottom face - should face downward
-    f = bm.faces.new([verts[4], verts[5], verts[1], verts[0]])
-    f.material_index = MAT_WALLS
-    if f.normal.z > 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Left end cap - should face in negative direction along wall
-    f = bm.faces.new([verts[4], verts[0], verts[3], verts[7]])
-    f.material_index = MAT_WALLS
-    # Check if face normal points away from wall (opposite to direction)
-    if f.normal.dot(direction) > 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Right end cap - should face in positive direction along wall
-    f = bm.faces.new([verts[1], verts[5], verts[6], verts[2]])
-    f.material_index = MAT_WALLS
-    # Check if face normal points in direction
-    if f.normal.dot(direction) < 0:
-        f.normal_flip()
-    faces.append(f)
+def _grid_box(verts: list, grid: dict, axes: tuple,
+              x0: float, x1: float, z0: float, z1: float) -> list:
+    """
+    Return the 8 vert indices of a wall box spanning x0..x1 and z0..z1.
     
-    return faces
+    grid maps (x, z) positions on the wall to the (outer, inner) vert
+    indices there. Corners are appended on first use, so the cells,
+    opening frames and end caps that meet at a grid corner share its
+    verts instead of each creating their own.
+    """
+    sx, sy, sz, dx, dy, dz, ox, oy, oz = axes
+    box = [0] * 8
+    for k, key in enumerate(((x0, z0), (x1, z0), (x1, z1), (x0, z1))):
+        pair = grid.get(key)
+        if pair is None:
+            x, z = key
+            px, py, pz = sx + dx * x, sy + dy * x, sz + dz * x + z
+            pair = grid[key] = (len(verts), len(verts) + 1)
+            verts.append((px, py, pz))
+            verts.append((px + ox, py + oy, pz + oz))
+        box[k], box[k + 4] = pair
+    return box
+
+
+def _append_quads(faces: list, materials: list, box: list, quads,
+                  material_index: int = MAT_WALLS):
+    """Append the quads of a grid box, given as positions in box."""
+    faces.extend([tuple(box[i] for i in quad) for quad in quads])
+    materials.extend([material_index] * len(quads))
 
 
-def _create_wall_with_openings_thick(bm: bmesh.types.BMesh, segment: WallSegment,
-                                      openings: list, thickness: float,
-                                      add_top_cap: bool = False) -> list:
+def _create_solid_wall_segment(verts: list, faces: list, materials: list,
+                                segment: WallSegment, thickness: float,
+                                add_top_cap: bool = False):
+    """Append a solid wall segment (no openings) with thickness."""
+    box = _grid_box(verts, {}, _wall_axes(segment, thickness),
+                    0.0, segment.length, 0.0, segment.height)
+    _append_quads(faces, materials, box, _wall_quads(segment).solid[add_top_cap])
+
+
+def _create_wall_with_openings_thick(verts: list, faces: list, materials: list,
+                                      segment: WallSegment, openings: list,
+                                      thickness: float, add_top_cap: bool = False):
     """
-    Create a wall with rectangular openings, with proper thickness.
+    Append a wall with rectangular openings, with proper thickness.
     
     Uses a grid-based approach to create wall sections around openings,
-    then adds frame faces for the opening sides.
+    then adds frame faces for the opening sides. Cells, frames and end
+    caps index one shared set of grid corner verts.
     """
-    faces = []
     wall_length = segment.length
     wall_height = segment.height
-    direction = segment.direction
-    normal = segment.normal
-    base_z = segment.base_z
-    start = segment.start
-    
-    inner_offset = -normal * thickness
+    axes = _wall_axes(segment, thickness)
+    quads = _wall_quads(segment)
+    grid = {}
     
     # Collect X coordinates for grid (only where openings exist)
     x_coords = [0.0, wall_length]
@@ -325,6 +379,20 @@ def _create_wall_with_openings_thick(bm: bmesh.types.BMesh, segment: WallSegment
     x_coords = sorted(set(max(0, min(wall_length, x)) for x in x_coords))
     z_coords = sorted(set(max(0, min(wall_height, z)) for z in z_coords))
     
+    # Mark the cells inside an opening. The grid lines are the (clamped)
+    # opening bounds, so each opening covers one block of cells, found by
+    # looking its bounds up in the grid
+    x_index = {x: i for i, x in enumerate(x_coords)}
+    z_index = {z: j for j, z in enumerate(z_coords)}
+    in_opening = [[False] * (len(z_coords) - 1) for _ in range(len(x_coords) - 1)]
+    for op in openings:
+        i0 = x_index[util.clamp(op['x_start'], 0, wall_length)]
+        i1 = x_index[util.clamp(op['x_end'], 0, wall_length)]
+        j0 = z_index[util.clamp(op['z_start'], 0, wall_height)]
+        j1 = z_index[util.clamp(op['z_end'], 0, wall_height)]
+        for row in in_opening[i0:i1]:
+            row[j0:j1] = [True] * (j1 - j0)
+    
     # Create grid of cells
     for i in range(len(x_coords) - 1):
         for j in range(len(z_coords) - 1):
@@ -335,234 +403,92 @@ def _create_wall_with_openings_thick(bm: bmesh.types.BMesh, segment: WallSegment
             if abs(x1 - x0) < 0.001 or abs(z1 - z0) < 0.001:
                 continue
             
-            # Check if this cell is inside any opening
-            cell_center_x = (x0 + x1) / 2
-            cell_center_z = (z0 + z1) / 2
-            
-            is_opening = False
-            for op in openings:
-                if (op['x_start'] <= cell_center_x <= op['x_end'] and
-                    op['z_start'] <= cell_center_z <= op['z_end']):
-                    is_opening = True
-                    break
-            
-            if not is_opening:
-                # Create a solid wall section for this cell
-                cell_start = start + direction * x0
-                cell_end = start + direction * x1
-                
+            if not in_opening[i][j]:
                 # Only add top cap to topmost cells
                 is_top_cell = (z1 >= wall_height - 0.001)
                 
-                faces.extend(_create_wall_cell(
-                    bm, cell_start, cell_end, z0, z1, base_z,
-                    thickness, normal, direction,
+                _create_wall_cell(
+                    verts, faces, materials, grid, axes, quads, x0, x1, z0, z1,
                     add_top_cap=(add_top_cap and is_top_cell)
-                ))
+                )
     
     # Create opening frames (the sides of the openings that show wall thickness)
     for op in openings:
-        faces.extend(_create_opening_frame(
-            bm, segment, op, thickness
-        ))
+        _create_opening_frame(verts, faces, materials, grid, axes, quads, op)
     
     # Add end caps at both ends of the wall (left and right extremities)
-    # These close off the wall thickness at the ends
-    
-    # Left end cap (at x = 0)
-    left_outer_bottom = start + Vector((0, 0, base_z))
-    left_outer_top = start + Vector((0, 0, base_z + wall_height))
-    left_inner_bottom = left_outer_bottom + inner_offset
-    left_inner_top = left_outer_top + inner_offset
-    
-    v_lob = bm.verts.new(left_outer_bottom)
-    v_lot = bm.verts.new(left_outer_top)
-    v_lib = bm.verts.new(left_inner_bottom)
-    v_lit = bm.verts.new(left_inner_top)
-    
-    f = bm.faces.new([v_lib, v_lob, v_lot, v_lit])
-    f.material_index = MAT_WALLS
-    faces.append(f)
-    
-    # Right end cap (at x = wall_length)
-    right_outer_bottom = start + direction * wall_length + Vector((0, 0, base_z))
-    right_outer_top = start + direction * wall_length + Vector((0, 0, base_z + wall_height))
-    right_inner_bottom = right_outer_bottom + inner_offset
-    right_inner_top = right_outer_top + inner_offset
-    
-    v_rob = bm.verts.new(right_outer_bottom)
-    v_rot = bm.verts.new(right_outer_top)
-    v_rib = bm.verts.new(right_inner_bottom)
-    v_rit = bm.verts.new(right_inner_top)
-    
-    f = bm.faces.new([v_rob, v_rib, v_rit, v_rot])
-    f.material_index = MAT_WALLS
-    faces.append(f)
-    
-    return faces
+    # These close off the wall thickness at the ends. Their corners are the
+    # grid's (0, 0)/(length, height) corners, already made by the first and
+    # last columns of cells, so no new verts are added here
+    box = _grid_box(verts, grid, axes, 0.0, wall_length, 0.0, wall_height)
+    _append_quads(faces, materials, box, quads.end_caps)
 
 
-def _create_wall_cell(bm: bmesh.types.BMesh, start: Vector, end: Vector,
-                       z0: float, z1: float, base_z: float, thickness: float,
-                       normal: Vector, direction: Vector,
-                       add_top_cap: bool = False) -> list:
-    """Create a single wall cell (part of the grid) with thickness."""
-    faces = []
-    
-    inner_offset = -normal * thickness
-    
-    # Outer face corners
-    o_bl = start + Vector((0, 0, base_z + z0))
-    o_br = end + Vector((0, 0, base_z + z0))
-    o_tl = start + Vector((0, 0, base_z + z1))
-    o_tr = end + Vector((0, 0, base_z + z1))
-    
-    # Inner face corners
-    i_bl = o_bl + inner_offset
-    i_br = o_br + inner_offset
-    i_tl = o_tl + inner_offset
-    i_tr = o_tr + inner_offset
-    
-    verts = [
-        bm.verts.new(o_bl),  # 0
-        bm.verts.new(o_br),  # 1
-        bm.verts.new(o_tr),  # 2
-        bm.verts.new(o_tl),  # 3
-        bm.verts.new(i_bl),  # 4
-        bm.verts.new(i_br),  # 5
-        bm.verts.new(i_tr),  # 6
-        bm.verts.new(i_tl),  # 7
-    ]
-    
-    # Outer face - should point in normal direction
-    f = bm.faces.new([verts[0], verts[1], verts[2], verts[3]])
-    f.material_index = MAT_WALLS
-    if f.normal.dot(normal) < 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Inner face - should point opposite to normal direction
-    f = bm.faces.new([verts[5], verts[4], verts[7], verts[6]])
-    f.material_index = MAT_WALLS
-    if f.normal.dot(normal) > 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Top cap if requested - ensure it faces upward
-    if add_top_cap:
-        f = bm.faces.new([verts[3], verts[2], verts[6], verts[7]])
-        f.material_index = MAT_WALLS
-        # Check actual normal and flip if pointing down
-        if f.normal.z < 0:
-            f.normal_flip()
-        faces.append(f)
-    
-    # Bottom face (for ground level cells) - should face downward
-    if z0 < 0.001:  # At ground level
-        f = bm.faces.new([verts[4], verts[5], verts[1], verts[0]])
-        f.material_index = MAT_WALLS
-        if f.normal.z > 0:
-            f.normal_flip()
-        faces.append(f)
-    
-    return faces
+def _create_wall_cell(verts: list, faces: list, materials: list, grid: dict,
+                       axes: tuple, quads: _WallQuads, x0: float, x1: float,
+                       z0: float, z1: float, add_top_cap: bool = False):
+    """Append a single wall cell (part of the grid) with thickness."""
+    box = _grid_box(verts, grid, axes, x0, x1, z0, z1)
+    # Top cap if requested, bottom face for ground level cells
+    _append_quads(faces, materials, box, quads.cells[add_top_cap, z0 < 0.001])
 
 
-def _create_opening_frame(bm: bmesh.types.BMesh, segment: WallSegment,
-                           opening: dict, thickness: float) -> list:
+def _create_opening_frame(verts: list, faces: list, materials: list, grid: dict,
+                           axes: tuple, quads: _WallQuads, opening: dict):
     """
-    Create the frame faces around an opening (the sides that show wall thickness).
+    Append the frame faces around an opening (the sides that show wall thickness).
     
-    Creates 4 faces: top, bottom, left, right of the opening.
+    Creates 4 faces: top, bottom, left, right of the opening. The bottom
+    is left out for openings at ground level.
     """
-    faces = []
-    
-    direction = segment.direction
-    normal = segment.normal
-    base_z = segment.base_z
-    start = segment.start
-    inner_offset = -normal * thickness
-    
-    x0, x1 = opening['x_start'], opening['x_end']
-    z0, z1 = opening['z_start'], opening['z_end']
-    opening_type = opening['type']
-    
-    mat_idx = MAT_DOOR_FRAME if opening_type == 'door' else MAT_WINDOW_FRAME
-    
-    # Calculate corner positions
-    # Outer corners
-    o_bl = start + direction * x0 + Vector((0, 0, base_z + z0))
-    o_br = start + direction * x1 + Vector((0, 0, base_z + z0))
-    o_tl = start + direction * x0 + Vector((0, 0, base_z + z1))
-    o_tr = start + direction * x1 + Vector((0, 0, base_z + z1))
-    
-    # Inner corners
-    i_bl = o_bl + inner_offset
-    i_br = o_br + inner_offset
-    i_tl = o_tl + inner_offset
-    i_tr = o_tr + inner_offset
-    
-    # Bottom frame (only if not at ground level, or for windows)
-    # Should face downward (into the opening)
-    if z0 > 0.01:
-        verts = [
-            bm.verts.new(o_bl),
-            bm.verts.new(o_br),
-            bm.verts.new(i_br),
-            bm.verts.new(i_bl),
-        ]
-        f = bm.faces.new(verts)
-        f.material_index = mat_idx
-        if f.normal.z > 0:
-            f.normal_flip()
-        faces.append(f)
-    
-    # Top frame - should face upward (into the opening)
-    verts = [
-        bm.verts.new(o_tr),
-        bm.verts.new(o_tl),
-        bm.verts.new(i_tl),
-        bm.verts.new(i_tr),
-    ]
-    f = bm.faces.new(verts)
-    f.material_index = mat_idx
-    if f.normal.z < 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Left frame - should face in negative direction (left into opening)
-    verts = [
-        bm.verts.new(o_tl),
-        bm.verts.new(o_bl),
-        bm.verts.new(i_bl),
-        bm.verts.new(i_tl),
-    ]
-    f = bm.faces.new(verts)
-    f.material_index = mat_idx
-    if f.normal.dot(direction) > 0:
-        f.normal_flip()
-    faces.append(f)
-    
-    # Right frame - should face in positive direction (right into opening)
-    verts = [
-        bm.verts.new(o_br),
-        bm.verts.new(o_tr),
-        bm.verts.new(i_tr),
-        bm.verts.new(i_br),
-    ]
-    f = bm.faces.new(verts)
-    f.material_index = mat_idx
-    if f.normal.dot(direction) < 0:
-        f.normal_flip()
-    faces.append(f)
+    box = _grid_box(verts, grid, axes, opening['x_start'], opening['x_end'],
+                    opening['z_start'], opening['z_end'])
     
-    return faces
+    mat_idx = MAT_DOOR_FRAME if opening['type'] == 'door' else MAT_WINDOW_FRAME
+    
+    frame = quads.frame if opening['z_start'] > 0.01 else quads.frame_sides
+    _append_quads(faces, materials, box, frame, mat_idx)
+
+
+# Quads of a slab frame around an opening, as positions in the verts of
+# _slab_with_hole_geometry: bottom outer ring 0-3, bottom hole ring 4-7,
+# then the same rings on top (8-15). Per side of the frame: top, bottom,
+# outer side and hole side, all facing away from the slab.
+_SLAB_RING_QUADS = [
+    quad
+    for i, j in ((0, 1), (1, 2), (2, 3), (3, 0))
+    for quad in ((8 + i, 8 + j, 12 + j, 12 + i), (4 + i, 4 + j, j, i),
+                 (i, j, 8 + j, 8 + i), (4 + j, 4 + i, 12 + i, 12 + j))
+]
+
+
+def _slab_with_hole_geometry(outer: tuple, hole: tuple, z_bottom: float,
+                             z_top: float) -> tuple:
+    """
+    Compute a slab with a rectangular hole as one closed frame.
+    
+    Args:
+        outer: (x_min, y_min, x_max, y_max) of the slab
+        hole: (x_min, y_min, x_max, y_max) of the hole, inside outer
+        z_bottom: Slab bottom height
+        z_top: Slab top height
+    
+    Returns:
+        Tuple of (verts, faces) for add_geometry_bulk: 16 verts and 16
+        quads, with mitered top and bottom quads between the two rings
+    """
+    verts = []
+    for z in (z_bottom, z_top):
+        for x_min, y_min, x_max, y_max in (outer, hole):
+            verts.extend([(x_min, y_min, z), (x_max, y_min, z),
+                          (x_max, y_max, z), (x_min, y_max, z)])
+    return verts, _SLAB_RING_QUADS
 
 
 def build_floor_slab(bm: bmesh.types.BMesh, width: float, depth: float, 
                      z_height: float, thickness: float = 0.15,
                      wall_thickness: float = 0.25,
-                     opening: dict = None) -> list:
+                     opening: interiors.Zone = None) -> list:
     """
     Build a floor slab with optional opening for stairs.
     
@@ -573,13 +499,39 @@ def build_floor_slab(bm: bmesh.types.BMesh, width: float, depth: float,
         z_height: Height of the floor slab bottom
         thickness: Slab thickness
         wall_thickness: Wall thickness (to inset slab properly)
-        opening: Optional dict with 'x_min', 'y_min', 'x_max', 'y_max' for stair opening
+        opening: Optional interiors.Zone for the stair opening
     
     Returns:
         List of created faces
     """
-    faces = []
+    verts, faces = [], []
+    build_floor_slab_on_mesh(verts, faces, width, depth, z_height, thickness,
+                             wall_thickness, opening)
+    face_count = len(bm.faces)
+    util.add_geometry_bulk(bm, verts, faces, MAT_FLOOR)
+    bm.faces.ensure_lookup_table()
+    return bm.faces[face_count:]
+
+
+def build_floor_slab_on_mesh(verts: list, faces: list, width: float, depth: float,
+                             z_height: float, thickness: float = 0.15,
+                             wall_thickness: float = 0.25,
+                             opening: interiors.Zone = None):
+    """
+    Append the vertices and quads of a floor slab to shared lists.
     
+    All quads use MAT_FLOOR.
+    
+    Args:
+        verts: Shared list of (x, y, z) tuples to append to
+        faces: Shared list of vertex index quads to append to
+        width: Building width (X)
+        depth: Building depth (Y)
+        z_height: Height of the floor slab bottom
+        thickness: Slab thickness
+        wall_thickness: Wall thickness (to inset slab properly)
+        opening: Optional interiors.Zone for the stair opening
+    """
     # Slab is inset to sit within the interior walls (not through them)
     slab_x_min = wall_thickness
     slab_y_min = wall_thickness
@@ -590,54 +542,67 @@ def build_floor_slab(bm: bmesh.types.BMesh, width: float, depth: float,
     
     if opening is None:
         # Simple solid slab
-        min_co = Vector((slab_x_min, slab_y_min, slab_z_bottom))
-        max_co = Vector((slab_x_max, slab_y_max, slab_z_top))
-        return util.create_box(bm, min_co, max_co, MAT_FLOOR)
+        min_co = (slab_x_min, slab_y_min, slab_z_bottom)
+        max_co = (slab_x_max, slab_y_max, slab_z_top)
+        util.append_box(verts, faces, min_co, max_co)
+        return
     
     # Slab with opening - create as multiple sections around the hole
     # Clamp opening to slab bounds with minimum margin from edges
     min_margin = 0.05  # Minimum edge from opening to slab edge
     
-    ox_min = max(opening['x_min'], slab_x_min + min_margin)
-    oy_min = max(opening['y_min'], slab_y_min + min_margin)
-    ox_max = min(opening['x_max'], slab_x_max - min_margin)
-    oy_max = min(opening['y_max'], slab_y_max - min_margin)
+    ox_min = max(opening.x_min, slab_x_min + min_margin)
+    oy_min = max(opening.y_min, slab_y_min + min_margin)
+    ox_max = min(opening.x_max, slab_x_max - min_margin)
+    oy_max = min(opening.y_max, slab_y_max - min_margin)
     
     # Minimum dimension threshold for creating a section
     min_dim = 0.05
     
-    # Create sections around the opening using an "frame" approach:
-    # We create up to 4 sections that together form a frame around the opening
+    front_depth = oy_min - slab_y_min
+    back_depth = slab_y_max - oy_max
+    left_width = ox_min - slab_x_min
+    right_width = slab_x_max - ox_max
+    
+    if (min(front_depth, back_depth, left_width, right_width) > min_dim and
+            ox_min < ox_max and oy_min < oy_max):
+        # The opening lies inside the slab: build one closed frame whose
+        # sections share their corners
+        ring_verts, ring_faces = _slab_with_hole_geometry(
+            (slab_x_min, slab_y_min, slab_x_max, slab_y_max),
+            (ox_min, oy_min, ox_max, oy_max), slab_z_bottom, slab_z_top)
+        base = len(verts)
+        verts.extend(ring_verts)
+        faces.extend([tuple(base + i for i in quad) for quad in ring_faces])
+        return
+    
+    # Opening at the slab margin: create sections around the opening
+    # using an "frame" approach, up to 4 sections that together form a
+    # frame around the opening
     
     # Section 1: Front strip (full width, from slab front to opening front)
-    front_depth = oy_min - slab_y_min
     if front_depth > min_dim:
-        min_co = Vector((slab_x_min, slab_y_min, slab_z_bottom))
-        max_co = Vector((slab_x_max, oy_min, slab_z_top))
-        faces.extend(util.create_box(bm, min_co, max_co, MAT_FLOOR))
+        min_co = (slab_x_min, slab_y_min, slab_z_bottom)
+        max_co = (slab_x_max, oy_min, slab_z_top)
+        util.append_box(verts, faces, min_co, max_co)
     
     # Section 2: Back strip (full width, from opening back to slab back)
-    back_depth = slab_y_max - oy_max
     if back_depth > min_dim:
-        min_co = Vector((slab_x_min, oy_max, slab_z_bottom))
-        max_co = Vector((slab_x_max, slab_y_max, slab_z_top))
-        faces.extend(util.create_box(bm, min_co, max_co, MAT_FLOOR))
+        min_co = (slab_x_min, oy_max, slab_z_bottom)
+        max_co = (slab_x_max, slab_y_max, slab_z_top)
+        util.append_box(verts, faces, min_co, max_co)
     
     # Section 3: Left strip (between opening Y bounds, from slab left to opening left)
-    left_width = ox_min - slab_x_min
     if left_width > min_dim:
-        min_co = Vector((slab_x_min, oy_min, slab_z_bottom))
-        max_co = Vector((ox_min, oy_max, slab_z_top))
-        faces.extend(util.create_box(bm, min_co, max_co, MAT_FLOOR))
+        min_co = (slab_x_min, oy_min, slab_z_bottom)
+        max_co = (ox_min, oy_max, slab_z_top)
+        util.append_box(verts, faces, min_co, max_co)
     
     # Section 4: Right strip (between opening Y bounds, from opening right to slab right)
-    right_width = slab_x_max - ox_max
     if right_width > min_dim:
-        min_co = Vector((ox_max, oy_min, slab_z_bottom))
-        max_co = Vector((slab_x_max, oy_max, slab_z_top))
-        faces.extend(util.create_box(bm, min_co, max_co, MAT_FLOOR))
-    
-    return faces
+        min_co = (ox_max, oy_min, slab_z_bottom)
+        max_co = (slab_x_max, oy_max, slab_z_top)
+        util.append_box(verts, faces, min_co, max_co)
 
 
 def build_roof(bm: bmesh.types.BMesh, width: float, depth: float, 
@@ -658,6 +623,19 @@ def build_roof(bm: bmesh.types.BMesh, width: float, depth: float,
     Returns:
         List of created faces
     """
+    min_co, max_co = roof_bounds(width, depth, z_height, thickness,
+                                 wall_thickness, has_parapet)
+    faces = util.create_box(bm, min_co, max_co, MAT_ROOF)
+    return faces
+
+
+def roof_bounds(width: float, depth: float, z_height: float, thickness: float = 0.2,
+                wall_thickness: float = 0.25, has_parapet: bool = False) -> tuple:
+    """
+    Return the (min_co, max_co) corners of a flat roof box.
+    
+    See build_roof for the arguments.
+    """
     if has_parapet:
         # Roof is inset to sit within the parapet walls
         # Note: Parapet is thinner than main walls (0.8 * thickness)
@@ -669,8 +647,7 @@ def build_roof(bm: bmesh.types.BMesh, width: float, depth: float,
         min_co = Vector((0, 0, z_height))
         max_co = Vector((width, depth, z_height + thickness))
     
-    faces = util.create_box(bm, min_co, max_co, MAT_ROOF)
-    return faces
+    return min_co, max_co
 
 
 class BuildingShellBuilder:
@@ -685,6 +662,11 @@ class BuildingShellBuilder:
         """
         self.params = params
         self.bm = None
+        # Geometry collected as plain vertex/face lists during the build and
+        # merged into the BMesh in one step by _flush_deferred_geometry
+        self.deferred_verts = []
+        self.deferred_faces = []
+        self.deferred_materials = []
     
     def build(self) -> bmesh.types.BMesh:
         """
@@ -693,10 +675,46 @@ class BuildingShellBuilder:
         Returns:
             BMesh containing the building geometry
         """
+        self._build_geometry()
+        
+        # Generate UVs and mark seams for easier texturing, sharing one
+        # round trip through mesh data
+        if self.params.get('mark_uv_seams', True):
+            util.edit_as_mesh(self.bm, _project_uvs, _mark_seams)
+        
+        return self.bm
+    
+    def build_mesh(self, mesh: bpy.types.Mesh):
+        """
+        Build the complete building shell into mesh data.
+        
+        Gives the same mesh as build() followed by bm.to_mesh(mesh), but
+        the UVs and seams are written on the final mesh arrays, so the
+        BMesh is converted to mesh data only once. The BMesh is freed.
+        
+        Args:
+            mesh: Empty mesh data to write the building into
+        """
+        self._build_geometry()
+        try:
+            self.bm.to_mesh(mesh)
+        finally:
+            self.bm.free()
+            self.bm = None
+        
+        if self.params.get('mark_uv_seams', True):
+            _project_uvs(mesh)
+            _mark_seams(mesh)
+    
+    def _build_geometry(self):
+        """Build the shell geometry into self.bm, without UVs or seams."""
         # Initialize random seed
         util.seed_random(self.params.get('seed', 0))
         
         self.bm = util.create_bmesh()
+        self.deferred_verts = []
+        self.deferred_faces = []
+        self.deferred_materials = []
         
         # Extract parameters
         width = self.params['width']
@@ -756,7 +774,7 @@ class BuildingShellBuilder:
                 resolution=resolution,
                 seed=self.params.get('seed', 0)
             )
-            min_damage_height = damage_profile.get('min_height', total_height)
+            min_damage_height = damage_profile.min_height
             intact_floors = damage_module.get_intact_floor_count(min_damage_height, floor_height)
             
             # Store damage min height for rubble generation to use
@@ -870,19 +888,19 @@ class BuildingShellBuilder:
                     self._build_patio_interior_floor_slab(
                         floor_base_z, 0.15, width, depth, wall_thickness, stair_opening)
                 else:
-                    build_floor_slab(self.bm, width, depth, floor_base_z, 0.15, wall_thickness, stair_opening)
+                    self._add_floor_slab(width, depth, floor_base_z, 0.15, wall_thickness, stair_opening)
         
         # === BUILD ADDITIONAL FLOOR SLABS BELOW DAMAGE LINE ===
         # If damage cuts into upper floors, we still need to build their floor slabs
         # if the slab height is below the damage minimum
         if damage_profile is not None and self.params.get('floor_slabs', True):
-            min_damage_height = damage_profile.get('min_height', total_height)
+            min_damage_height = damage_profile.min_height
             for floor_idx in range(floors_to_build, floors):
                 floor_base_z = floor_idx * floor_height
                 # Only build slab if it's below the damage line
                 if floor_base_z < min_damage_height - 0.1:
                     stair_opening = self._get_stair_opening()
-                    build_floor_slab(self.bm, width, depth, floor_base_z, 0.15, wall_thickness, stair_opening)
+                    self._add_floor_slab(width, depth, floor_base_z, 0.15, wall_thickness, stair_opening)
         
         # === BUILD DAMAGED TOP PORTION ===
         if damage_profile is not None and intact_floors < floors:
@@ -927,7 +945,8 @@ class BuildingShellBuilder:
                     self._build_roof_with_patio(width, depth, total_height, wall_thickness, 
                                                  has_parapet, patio_info)
                 else:
-                    build_roof(self.bm, width, depth, total_height, 0.2, wall_thickness, has_parapet)
+                    self._add_box(*roof_bounds(width, depth, total_height, 0.2,
+                                               wall_thickness, has_parapet), MAT_ROOF)
         else:
             # Damaged building - might still have pilasters on intact portion
             if self.params.get('facade_pilasters', False) and intact_floors > 0:
@@ -964,16 +983,14 @@ class BuildingShellBuilder:
         if self.params.get('exterior_rubble', False):
             interiors.generate_exterior_rubble(self.bm, self.params)
         
+        # Merge the geometry collected as plain lists before any cleanup,
+        # then calculate normals once for the whole building
+        self._flush_deferred_geometry()
+        self.bm.normal_update()
+        
         # Clean up mesh - comprehensive cleanup
         if self.params.get('auto_clean', True):
             self._cleanup_mesh()
-        
-        # Generate UVs and mark seams for easier texturing
-        if self.params.get('mark_uv_seams', True):
-            generate_uvs(self.bm)
-            mark_seams_for_uvs(self.bm)
-        
-        return self.bm
     
     def _cleanup_mesh(self):
         """
@@ -1002,8 +1019,9 @@ class BuildingShellBuilder:
         self._dissolve_wall_seams()
         
         # Note: We don't use recalc_face_normals because it can flip faces
-        # that were correctly oriented during creation. All faces are created
-        # with correct winding using cross-product checks.
+        # that were correctly oriented during creation. Nothing reorients
+        # faces after the build: walls take outward windings from fixed quad
+        # templates picked by their handedness (see _wall_quads).
     
     def _dissolve_wall_seams(self):
         """
@@ -1062,7 +1080,8 @@ class BuildingShellBuilder:
             except:
                 pass  # Some edges might not be dissolvable
     
-    def _build_damaged_top(self, damage_profile: dict, base_z: float, wall_thickness: float):
+    def _build_damaged_top(self, damage_profile: damage_module.DamageProfiles,
+                           base_z: float, wall_thickness: float):
         """
         Build the damaged top portion of all walls with irregular top edges.
         
@@ -1075,78 +1094,113 @@ class BuildingShellBuilder:
         """
         width = self.params['width']
         depth = self.params['depth']
+        walls = []
         
         # Front wall (Y = 0, facing -Y)
-        front_profile = damage_profile.get('front', [])
-        if front_profile:
-            damage_module.build_damaged_top_section(
-                self.bm, front_profile,
-                start_pos=Vector((0, 0, 0)),
-                direction=Vector((1, 0, 0)),
-                normal=Vector((0, -1, 0)),
-                base_z=base_z,
-                thickness=wall_thickness,
-                mat_index=MAT_WALLS
-            )
+        front_profile = damage_profile.front
+        walls.append((front_profile, Vector((0, 0, 0)),
+                      Vector((1, 0, 0)), Vector((0, -1, 0)), ('left', 'right')))
         
         # Back wall (Y = depth, facing +Y)
-        back_profile = damage_profile.get('back', [])
-        if back_profile:
-            # Reverse the profile for back wall
-            reversed_profile = [(width - pos, height) for pos, height in reversed(back_profile)]
-            damage_module.build_damaged_top_section(
-                self.bm, reversed_profile,
-                start_pos=Vector((0, depth, 0)),
-                direction=Vector((1, 0, 0)),
-                normal=Vector((0, 1, 0)),
-                base_z=base_z,
-                thickness=wall_thickness,
-                mat_index=MAT_WALLS
-            )
+        # Reverse the profile for back wall
+        back_profile = damage_profile.back[::-1].copy()
+        back_profile[:, 0] = width - back_profile[:, 0]
+        walls.append((back_profile, Vector((0, depth, 0)),
+                      Vector((1, 0, 0)), Vector((0, 1, 0)), ('left', 'right')))
         
         # Left wall (X = 0, facing -X) - shortened to avoid corner overlap
-        left_profile = damage_profile.get('left', [])
-        if left_profile:
-            # Adjust profile to fit between front/back walls
-            adjusted_profile = []
-            for pos, height in left_profile:
-                # Scale position to fit shortened wall
-                if depth > 2 * wall_thickness:
-                    scaled_pos = wall_thickness + (pos / depth) * (depth - 2 * wall_thickness)
-                else:
-                    scaled_pos = pos
-                adjusted_profile.append((scaled_pos - wall_thickness, height))
-            
-            damage_module.build_damaged_top_section(
-                self.bm, adjusted_profile,
-                start_pos=Vector((0, wall_thickness, 0)),
-                direction=Vector((0, 1, 0)),
-                normal=Vector((-1, 0, 0)),
-                base_z=base_z,
-                thickness=wall_thickness,
-                mat_index=MAT_WALLS
-            )
+        # Scale positions to fit between front/back walls
+        left_profile = damage_profile.left.copy()
+        if depth > 2 * wall_thickness:
+            left_profile[:, 0] *= (depth - 2 * wall_thickness) / depth
+        else:
+            left_profile[:, 0] -= wall_thickness
+        
+        walls.append((left_profile, Vector((0, wall_thickness, 0)),
+                      Vector((0, 1, 0)), Vector((-1, 0, 0)),
+                      self._damaged_side_caps(left_profile, front_profile, back_profile,
+                                              0, wall_thickness, base_z)))
         
         # Right wall (X = width, facing +X) - shortened to avoid corner overlap
-        right_profile = damage_profile.get('right', [])
-        if right_profile:
-            adjusted_profile = []
-            for pos, height in right_profile:
-                if depth > 2 * wall_thickness:
-                    scaled_pos = wall_thickness + (pos / depth) * (depth - 2 * wall_thickness)
-                else:
-                    scaled_pos = pos
-                adjusted_profile.append((scaled_pos - wall_thickness, height))
-            
-            damage_module.build_damaged_top_section(
-                self.bm, adjusted_profile,
-                start_pos=Vector((width, wall_thickness, 0)),
-                direction=Vector((0, 1, 0)),
-                normal=Vector((1, 0, 0)),
+        right_profile = damage_profile.right.copy()
+        if depth > 2 * wall_thickness:
+            right_profile[:, 0] *= (depth - 2 * wall_thickness) / depth
+        else:
+            right_profile[:, 0] -= wall_thickness
+        
+        walls.append((right_profile, Vector((width, wall_thickness, 0)),
+                      Vector((0, 1, 0)), Vector((1, 0, 0)),
+                      self._damaged_side_caps(right_profile, front_profile, back_profile,
+                                              width - wall_thickness, width, base_z)))
+        
+        # Collect all four walls into the deferred lists; they reach the
+        # BMesh together with the rest of the deferred geometry
+        face_count = len(self.deferred_faces)
+        vert_cache = {}
+        for profile, start_pos, direction, normal, caps in walls:
+            damage_module.build_damaged_top_section_on_mesh(
+                self.deferred_verts, self.deferred_faces, profile,
+                start_pos, direction, normal,
                 base_z=base_z,
                 thickness=wall_thickness,
-                mat_index=MAT_WALLS
+                caps=caps,
+                vert_cache=vert_cache
             )
+        self.deferred_materials.extend(
+            [MAT_WALLS] * (len(self.deferred_faces) - face_count))
+    
+    def _add_box(self, min_co, max_co, material_index: int):
+        """Collect a box into the deferred geometry, laid out as util.create_box."""
+        util.append_box(self.deferred_verts, self.deferred_faces, min_co, max_co)
+        self.deferred_materials.extend([material_index] * 6)
+    
+    def _add_floor_slab(self, width: float, depth: float, z_height: float,
+                        thickness: float, wall_thickness: float,
+                        opening: interiors.Zone = None):
+        """Collect a floor slab into the deferred geometry, see build_floor_slab."""
+        face_count = len(self.deferred_faces)
+        build_floor_slab_on_mesh(self.deferred_verts, self.deferred_faces, width,
+                                 depth, z_height, thickness, wall_thickness, opening)
+        self.deferred_materials.extend(
+            [MAT_FLOOR] * (len(self.deferred_faces) - face_count))
+    
+    def _flush_deferred_geometry(self):
+        """
+        Merge the deferred vertex and face lists into the BMesh.
+        
+        Builders that append to deferred_verts / deferred_faces skip the
+        per-element BMesh API entirely; everything they collected goes
+        through a single temporary mesh and from_mesh round-trip here.
+        
+        No normals are calculated while merging. Normal updates are never
+        done per section during the build: they touch every linked face
+        and make large builds scale quadratically, so the BMesh gets one
+        normal_update after all geometry exists.
+        """
+        util.add_geometry_bulk(self.bm, self.deferred_verts, self.deferred_faces,
+                               self.deferred_materials, face_normals=False)
+        self.deferred_verts = []
+        self.deferred_faces = []
+        self.deferred_materials = []
+    
+    def _damaged_side_caps(self, profile, front_profile, back_profile,
+                           span_start: float, span_end: float, base_z: float) -> tuple:
+        """
+        Pick the end caps a damaged side wall needs.
+        
+        Side walls are shortened to fit between the front and back walls, so
+        their end caps sit against those walls' inner faces. A cap is hidden
+        there, and skipped, when the adjoining wall stands at least as tall
+        across the joint span.
+        """
+        min_top = base_z + 0.05
+        caps = []
+        for cap, joined, height in (('left', front_profile, profile[0, 1]),
+                                    ('right', back_profile, profile[-1, 1])):
+            if height <= min_top or not damage_module.profile_covers(joined, span_start,
+                                                                      span_end, height):
+                caps.append(cap)
+        return tuple(caps)
     
     def _build_facade_pilasters(self, width: float, depth: float, total_height: float, 
                                  wall_thickness: float):
@@ -1240,7 +1294,7 @@ class BuildingShellBuilder:
                 # Pilaster box: protruding outward from front wall
                 min_co = Vector((x - pilaster_width/2, -pilaster_depth, 0))
                 max_co = Vector((x + pilaster_width/2, 0, pilaster_height))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
         
         # Build pilasters on back wall (Y = depth, protruding in +Y direction)
         if has_back:
@@ -1259,7 +1313,7 @@ class BuildingShellBuilder:
                 
                 min_co = Vector((x - pilaster_width/2, depth, 0))
                 max_co = Vector((x + pilaster_width/2, depth + pilaster_depth, pilaster_height))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
         
         # Build pilasters on left wall (X = 0, protruding in -X direction)
         if has_left:
@@ -1278,7 +1332,7 @@ class BuildingShellBuilder:
                 
                 min_co = Vector((-pilaster_depth, y - pilaster_width/2, 0))
                 max_co = Vector((0, y + pilaster_width/2, pilaster_height))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
         
         # Build pilasters on right wall (X = width, protruding in +X direction)
         if has_right:
@@ -1297,7 +1351,7 @@ class BuildingShellBuilder:
                 
                 min_co = Vector((width, y - pilaster_width/2, 0))
                 max_co = Vector((width + pilaster_depth, y + pilaster_width/2, pilaster_height))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
     
     def _build_parapet(self, width: float, depth: float, roof_height: float,
                         wall_thickness: float, parapet_height: float):
@@ -1316,22 +1370,22 @@ class BuildingShellBuilder:
         # Front parapet (Y = 0)
         min_co = Vector((0, 0, z_base))
         max_co = Vector((width, parapet_thickness, z_top))
-        util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+        self._add_box(min_co, max_co, MAT_WALLS)
         
         # Back parapet (Y = depth)
         min_co = Vector((0, depth - parapet_thickness, z_base))
         max_co = Vector((width, depth, z_top))
-        util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+        self._add_box(min_co, max_co, MAT_WALLS)
         
         # Left parapet (X = 0)
         min_co = Vector((0, parapet_thickness, z_base))
         max_co = Vector((parapet_thickness, depth - parapet_thickness, z_top))
-        util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+        self._add_box(min_co, max_co, MAT_WALLS)
         
         # Right parapet (X = width)
         min_co = Vector((width - parapet_thickness, parapet_thickness, z_base))
         max_co = Vector((width, depth - parapet_thickness, z_top))
-        util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+        self._add_box(min_co, max_co, MAT_WALLS)
         
         # If pilasters are enabled, extend them through the parapet
         if self.params.get('facade_pilasters', False):
@@ -1347,21 +1401,21 @@ class BuildingShellBuilder:
                 # Left corner
                 min_co = Vector((pilaster_width/2 - pilaster_width/2, -pilaster_depth, z_base))
                 max_co = Vector((pilaster_width/2 + pilaster_width/2, 0, z_top))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
                 # Right corner
                 min_co = Vector((width - pilaster_width/2 - pilaster_width/2, -pilaster_depth, z_base))
                 max_co = Vector((width - pilaster_width/2 + pilaster_width/2, 0, z_top))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
             
             if has_back:
                 # Left corner
                 min_co = Vector((pilaster_width/2 - pilaster_width/2, depth, z_base))
                 max_co = Vector((pilaster_width/2 + pilaster_width/2, depth + pilaster_depth, z_top))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
                 # Right corner
                 min_co = Vector((width - pilaster_width/2 - pilaster_width/2, depth, z_base))
                 max_co = Vector((width - pilaster_width/2 + pilaster_width/2, depth + pilaster_depth, z_top))
-                util.create_box(self.bm, min_co, max_co, MAT_WALLS)
+                self._add_box(min_co, max_co, MAT_WALLS)
     
     def _build_parapet_with_patio(self, width: float, depth: float, roof_height: float,
                                     wall_thickness: float, parapet_height: float, patio_info: dict):
@@ -1379,62 +1433,62 @@ class BuildingShellBuilder:
         if patio_side == 'BACK':
             divider_y = patio_info['divider_y']
             # Front parapet (full width)
-            util.create_box(self.bm, Vector((0, 0, z_base)), 
-                           Vector((width, parapet_thickness, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, 0, z_base)),
+                         Vector((width, parapet_thickness, z_top)), MAT_WALLS)
             # Left parapet (up to divider)
-            util.create_box(self.bm, Vector((0, parapet_thickness, z_base)),
-                           Vector((parapet_thickness, divider_y, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, parapet_thickness, z_base)),
+                         Vector((parapet_thickness, divider_y, z_top)), MAT_WALLS)
             # Right parapet (up to divider)
-            util.create_box(self.bm, Vector((width - parapet_thickness, parapet_thickness, z_base)),
-                           Vector((width, divider_y, z_top)), MAT_WALLS)
+            self._add_box(Vector((width - parapet_thickness, parapet_thickness, z_base)),
+                         Vector((width, divider_y, z_top)), MAT_WALLS)
             # Back parapet at divider line
-            util.create_box(self.bm, Vector((0, divider_y - parapet_thickness, z_base)),
-                           Vector((width, divider_y, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, divider_y - parapet_thickness, z_base)),
+                         Vector((width, divider_y, z_top)), MAT_WALLS)
                            
         elif patio_side == 'FRONT':
             divider_y = patio_info['divider_y']
             # Back parapet (full width)
-            util.create_box(self.bm, Vector((0, depth - parapet_thickness, z_base)),
-                           Vector((width, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, depth - parapet_thickness, z_base)),
+                         Vector((width, depth, z_top)), MAT_WALLS)
             # Left parapet (from divider to back)
-            util.create_box(self.bm, Vector((0, divider_y, z_base)),
-                           Vector((parapet_thickness, depth - parapet_thickness, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, divider_y, z_base)),
+                         Vector((parapet_thickness, depth - parapet_thickness, z_top)), MAT_WALLS)
             # Right parapet (from divider to back)
-            util.create_box(self.bm, Vector((width - parapet_thickness, divider_y, z_base)),
-                           Vector((width, depth - parapet_thickness, z_top)), MAT_WALLS)
+            self._add_box(Vector((width - parapet_thickness, divider_y, z_base)),
+                         Vector((width, depth - parapet_thickness, z_top)), MAT_WALLS)
             # Front parapet at divider line
-            util.create_box(self.bm, Vector((0, divider_y, z_base)),
-                           Vector((width, divider_y + parapet_thickness, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, divider_y, z_base)),
+                         Vector((width, divider_y + parapet_thickness, z_top)), MAT_WALLS)
                            
         elif patio_side == 'LEFT':
             divider_x = patio_info['divider_x']
             # Right parapet (full depth)
-            util.create_box(self.bm, Vector((width - parapet_thickness, 0, z_base)),
-                           Vector((width, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((width - parapet_thickness, 0, z_base)),
+                         Vector((width, depth, z_top)), MAT_WALLS)
             # Front parapet (from divider to right)
-            util.create_box(self.bm, Vector((divider_x, 0, z_base)),
-                           Vector((width - parapet_thickness, parapet_thickness, z_top)), MAT_WALLS)
+            self._add_box(Vector((divider_x, 0, z_base)),
+                         Vector((width - parapet_thickness, parapet_thickness, z_top)), MAT_WALLS)
             # Back parapet (from divider to right)
-            util.create_box(self.bm, Vector((divider_x, depth - parapet_thickness, z_base)),
-                           Vector((width - parapet_thickness, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((divider_x, depth - parapet_thickness, z_base)),
+                         Vector((width - parapet_thickness, depth, z_top)), MAT_WALLS)
             # Left parapet at divider line
-            util.create_box(self.bm, Vector((divider_x, 0, z_base)),
-                           Vector((divider_x + parapet_thickness, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((divider_x, 0, z_base)),
+                         Vector((divider_x + parapet_thickness, depth, z_top)), MAT_WALLS)
                            
         else:  # RIGHT
             divider_x = patio_info['divider_x']
             # Left parapet (full depth)
-            util.create_box(self.bm, Vector((0, 0, z_base)),
-                           Vector((parapet_thickness, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((0, 0, z_base)),
+                         Vector((parapet_thickness, depth, z_top)), MAT_WALLS)
             # Front parapet (from left to divider)
-            util.create_box(self.bm, Vector((parapet_thickness, 0, z_base)),
-                           Vector((divider_x, parapet_thickness, z_top)), MAT_WALLS)
+            self._add_box(Vector((parapet_thickness, 0, z_base)),
+                         Vector((divider_x, parapet_thickness, z_top)), MAT_WALLS)
             # Back parapet (from left to divider)
-            util.create_box(self.bm, Vector((parapet_thickness, depth - parapet_thickness, z_base)),
-                           Vector((divider_x, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((parapet_thickness, depth - parapet_thickness, z_base)),
+                         Vector((divider_x, depth, z_top)), MAT_WALLS)
             # Right parapet at divider line
-            util.create_box(self.bm, Vector((divider_x - parapet_thickness, 0, z_base)),
-                           Vector((divider_x, depth, z_top)), MAT_WALLS)
+            self._add_box(Vector((divider_x - parapet_thickness, 0, z_base)),
+                         Vector((divider_x, depth, z_top)), MAT_WALLS)
         
         # Extend pilasters through parapet (only on non-patio sides)
         if self.params.get('facade_pilasters', False):
@@ -1448,21 +1502,21 @@ class BuildingShellBuilder:
             # Front corner pilasters extended through parapet
             if has_front:
                 # Left corner
-                util.create_box(self.bm, 
+                self._add_box(
                     Vector((pilaster_width/2 - pilaster_width/2, -pilaster_depth, z_base)),
                     Vector((pilaster_width/2 + pilaster_width/2, 0, z_top)), MAT_WALLS)
                 # Right corner
-                util.create_box(self.bm,
+                self._add_box(
                     Vector((width - pilaster_width/2 - pilaster_width/2, -pilaster_depth, z_base)),
                     Vector((width - pilaster_width/2 + pilaster_width/2, 0, z_top)), MAT_WALLS)
             
             if has_back:
                 # Left corner
-                util.create_box(self.bm,
+                self._add_box(
                     Vector((pilaster_width/2 - pilaster_width/2, depth, z_base)),
                     Vector((pilaster_width/2 + pilaster_width/2, depth + pilaster_depth, z_top)), MAT_WALLS)
                 # Right corner
-                util.create_box(self.bm,
+                self._add_box(
                     Vector((width - pilaster_width/2 - pilaster_width/2, depth, z_base)),
                     Vector((width - pilaster_width/2 + pilaster_width/2, depth + pilaster_depth, z_top)), MAT_WALLS)
     
@@ -1515,7 +1569,7 @@ class BuildingShellBuilder:
                 min_co = Vector((0, 0, roof_height))
                 max_co = Vector((divider_x, depth, roof_height + thickness))
         
-        util.create_box(self.bm, min_co, max_co, MAT_ROOF)
+        self._add_box(min_co, max_co, MAT_ROOF)
     
     def _build_patio(self, width: float, depth: float, floor_height: float,
                       top_floor_z: float, wall_thickness: float, parapet_height: float = 0.5):
@@ -1583,15 +1637,15 @@ class BuildingShellBuilder:
         if patio_side == 'BACK':
             # Front of patio (divider line) - will have door, built separately
             # Back parapet
-            util.create_box(self.bm, 
+            self._add_box(
                 Vector((0, depth - parapet_thickness, z_base)),
                 Vector((width, depth, z_top)), MAT_WALLS)
             # Left side parapet (patio portion only)
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((0, divider_y, z_base)),
                 Vector((parapet_thickness, depth - parapet_thickness, z_top)), MAT_WALLS)
             # Right side parapet (patio portion only)
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((width - parapet_thickness, divider_y, z_base)),
                 Vector((width, depth - parapet_thickness, z_top)), MAT_WALLS)
             
@@ -1606,15 +1660,15 @@ class BuildingShellBuilder:
         elif patio_side == 'FRONT':
             # Back parapet (divider line) - will have door
             # Front parapet
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((0, 0, z_base)),
                 Vector((width, parapet_thickness, z_top)), MAT_WALLS)
             # Left side parapet
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((0, parapet_thickness, z_base)),
                 Vector((parapet_thickness, divider_y, z_top)), MAT_WALLS)
             # Right side parapet
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((width - parapet_thickness, parapet_thickness, z_base)),
                 Vector((width, divider_y, z_top)), MAT_WALLS)
             
@@ -1628,15 +1682,15 @@ class BuildingShellBuilder:
                 
         elif patio_side == 'LEFT':
             # Left parapet
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((0, 0, z_base)),
                 Vector((parapet_thickness, depth, z_top)), MAT_WALLS)
             # Front parapet (patio portion)
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((parapet_thickness, 0, z_base)),
                 Vector((divider_x, parapet_thickness, z_top)), MAT_WALLS)
             # Back parapet (patio portion)
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((parapet_thickness, depth - parapet_thickness, z_base)),
                 Vector((divider_x, depth, z_top)), MAT_WALLS)
             
@@ -1650,15 +1704,15 @@ class BuildingShellBuilder:
                 
         else:  # RIGHT
             # Right parapet
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((width - parapet_thickness, 0, z_base)),
                 Vector((width, depth, z_top)), MAT_WALLS)
             # Front parapet (patio portion)
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((divider_x, 0, z_base)),
                 Vector((width - parapet_thickness, parapet_thickness, z_top)), MAT_WALLS)
             # Back parapet (patio portion)
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((divider_x, depth - parapet_thickness, z_base)),
                 Vector((width - parapet_thickness, depth, z_top)), MAT_WALLS)
             
@@ -1706,42 +1760,42 @@ class BuildingShellBuilder:
         
         if stair_opening is None:
             # No stair opening - build solid slab
-            util.create_box(self.bm,
+            self._add_box(
                 Vector((slab_x_min, slab_y_min, slab_z_bottom)),
                 Vector((slab_x_max, slab_y_max, slab_z_top)), MAT_FLOOR)
         else:
             # Check if opening intersects with patio slab bounds
             min_margin = 0.05
-            ox_min = max(stair_opening['x_min'], slab_x_min + min_margin)
-            oy_min = max(stair_opening['y_min'], slab_y_min + min_margin)
-            ox_max = min(stair_opening['x_max'], slab_x_max - min_margin)
-            oy_max = min(stair_opening['y_max'], slab_y_max - min_margin)
+            ox_min = max(stair_opening.x_min, slab_x_min + min_margin)
+            oy_min = max(stair_opening.y_min, slab_y_min + min_margin)
+            ox_max = min(stair_opening.x_max, slab_x_max - min_margin)
+            oy_max = min(stair_opening.y_max, slab_y_max - min_margin)
             
             if ox_min >= ox_max or oy_min >= oy_max:
                 # Opening doesn't intersect patio - build solid slab
-                util.create_box(self.bm,
+                self._add_box(
                     Vector((slab_x_min, slab_y_min, slab_z_bottom)),
                     Vector((slab_x_max, slab_y_max, slab_z_top)), MAT_FLOOR)
             else:
                 # Build slab sections around the opening
                 # Front section
                 if oy_min > slab_y_min + min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((slab_x_min, slab_y_min, slab_z_bottom)),
                         Vector((slab_x_max, oy_min, slab_z_top)), MAT_FLOOR)
                 # Back section
                 if oy_max < slab_y_max - min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((slab_x_min, oy_max, slab_z_bottom)),
                         Vector((slab_x_max, slab_y_max, slab_z_top)), MAT_FLOOR)
                 # Left section
                 if ox_min > slab_x_min + min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((slab_x_min, oy_min, slab_z_bottom)),
                         Vector((ox_min, oy_max, slab_z_top)), MAT_FLOOR)
                 # Right section
                 if ox_max < slab_x_max - min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((ox_max, oy_min, slab_z_bottom)),
                         Vector((slab_x_max, oy_max, slab_z_top)), MAT_FLOOR)
         
@@ -1785,16 +1839,18 @@ class BuildingShellBuilder:
         segment.add_opening(door_x, door_x + door_width, 0, door_height, 'door')
         
         # Build wall with the door
-        build_wall_with_openings(self.bm, segment, thickness, add_top_cap=True)
+        build_wall_with_openings_on_mesh(self.deferred_verts, self.deferred_faces,
+                                         self.deferred_materials, segment, thickness,
+                                         add_top_cap=True)
     
-    def _get_stair_opening(self) -> dict:
+    def _get_stair_opening(self) -> interiors.Zone:
         """Get stair opening bounds for floor slabs."""
         # Use the centralized function from interiors module
         return interiors.get_floor_slab_opening(self.params)
     
     def _build_patio_interior_floor_slab(self, z_height: float, thickness: float,
                                           width: float, depth: float, wall_thickness: float,
-                                          stair_opening: dict = None):
+                                          stair_opening: interiors.Zone = None):
         """
         Build floor slab for patio floor that only covers the interior portion.
         
@@ -1829,44 +1885,44 @@ class BuildingShellBuilder:
             # Simple solid slab
             min_co = Vector((slab_x_min, slab_y_min, slab_z_bottom))
             max_co = Vector((slab_x_max, slab_y_max, slab_z_top))
-            util.create_box(self.bm, min_co, max_co, MAT_FLOOR)
+            self._add_box(min_co, max_co, MAT_FLOOR)
         else:
             # Slab with opening - create sections around the hole
             min_margin = 0.05
-            ox_min = max(stair_opening['x_min'], slab_x_min + min_margin)
-            oy_min = max(stair_opening['y_min'], slab_y_min + min_margin)
-            ox_max = min(stair_opening['x_max'], slab_x_max - min_margin)
-            oy_max = min(stair_opening['y_max'], slab_y_max - min_margin)
+            ox_min = max(stair_opening.x_min, slab_x_min + min_margin)
+            oy_min = max(stair_opening.y_min, slab_y_min + min_margin)
+            ox_max = min(stair_opening.x_max, slab_x_max - min_margin)
+            oy_max = min(stair_opening.y_max, slab_y_max - min_margin)
             
             # Check if opening is within slab bounds
             if ox_min >= ox_max or oy_min >= oy_max:
                 # Opening doesn't intersect - build solid slab
                 min_co = Vector((slab_x_min, slab_y_min, slab_z_bottom))
                 max_co = Vector((slab_x_max, slab_y_max, slab_z_top))
-                util.create_box(self.bm, min_co, max_co, MAT_FLOOR)
+                self._add_box(min_co, max_co, MAT_FLOOR)
             else:
                 # Create 4 sections around the opening (L-shaped pieces)
                 # Front section (Y from slab_y_min to oy_min)
                 if oy_min > slab_y_min + min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((slab_x_min, slab_y_min, slab_z_bottom)),
                         Vector((slab_x_max, oy_min, slab_z_top)), MAT_FLOOR)
                 
                 # Back section (Y from oy_max to slab_y_max)
                 if oy_max < slab_y_max - min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((slab_x_min, oy_max, slab_z_bottom)),
                         Vector((slab_x_max, slab_y_max, slab_z_top)), MAT_FLOOR)
                 
                 # Left section (X from slab_x_min to ox_min, Y from oy_min to oy_max)
                 if ox_min > slab_x_min + min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((slab_x_min, oy_min, slab_z_bottom)),
                         Vector((ox_min, oy_max, slab_z_top)), MAT_FLOOR)
                 
                 # Right section (X from ox_max to slab_x_max, Y from oy_min to oy_max)
                 if ox_max < slab_x_max - min_margin:
-                    util.create_box(self.bm,
+                    self._add_box(
                         Vector((ox_max, oy_min, slab_z_bottom)),
                         Vector((slab_x_max, oy_max, slab_z_top)), MAT_FLOOR)
     
@@ -2001,11 +2057,11 @@ class BuildingShellBuilder:
             walls = [left_wall, front_wall, back_wall]
         
         # Determine which sides should have windows
-        window_sides = self.params.get('window_sides', 'ALL')
-        has_front_windows = window_sides in ('ALL', 'FRONT_BACK', 'FRONT_SIDES', 'FRONT_ONLY', 'FRONT_LEFT', 'FRONT_RIGHT')
-        has_back_windows = window_sides in ('ALL', 'FRONT_BACK', 'BACK_SIDES')
-        has_left_windows = window_sides in ('ALL', 'FRONT_SIDES', 'FRONT_LEFT', 'BACK_SIDES', 'SIDES_ONLY')
-        has_right_windows = window_sides in ('ALL', 'FRONT_SIDES', 'FRONT_RIGHT', 'BACK_SIDES', 'SIDES_ONLY')
+        mask = interiors.WINDOW_SIDES_MASK.get(self.params.get('window_sides', 'ALL'), 0)
+        has_front_windows = bool(mask & interiors.WINDOW_SIDE_FRONT)
+        has_back_windows = bool(mask & interiors.WINDOW_SIDE_BACK)
+        has_left_windows = bool(mask & interiors.WINDOW_SIDE_LEFT)
+        has_right_windows = bool(mask & interiors.WINDOW_SIDE_RIGHT)
         
         # Add windows to walls based on their direction
         for wall in walls:
@@ -2030,7 +2086,9 @@ class BuildingShellBuilder:
         
         # Build all walls
         for wall in walls:
-            build_wall_with_openings(self.bm, wall, wall_thickness, add_top_cap=add_top_caps)
+            build_wall_with_openings_on_mesh(self.deferred_verts, self.deferred_faces,
+                                             self.deferred_materials, wall, wall_thickness,
+                                             add_top_cap=add_top_caps)
     
     def _build_floor_walls(self, floor_idx: int, floor_base_z: float, floor_height: float,
                            width: float, depth: float, wall_thickness: float,
@@ -2095,11 +2153,11 @@ class BuildingShellBuilder:
                 back_wall.add_opening(back_door_x, back_door_x + door_width, 0, door_height, 'door')
         
         # Determine which sides should have windows
-        window_sides = self.params.get('window_sides', 'ALL')
-        has_front_windows = window_sides in ('ALL', 'FRONT_BACK', 'FRONT_SIDES', 'FRONT_ONLY', 'FRONT_LEFT', 'FRONT_RIGHT')
-        has_back_windows = window_sides in ('ALL', 'FRONT_BACK', 'BACK_SIDES')
-        has_left_windows = window_sides in ('ALL', 'FRONT_SIDES', 'FRONT_LEFT', 'BACK_SIDES', 'SIDES_ONLY')
-        has_right_windows = window_sides in ('ALL', 'FRONT_SIDES', 'FRONT_RIGHT', 'BACK_SIDES', 'SIDES_ONLY')
+        mask = interiors.WINDOW_SIDES_MASK.get(self.params.get('window_sides', 'ALL'), 0)
+        has_front_windows = bool(mask & interiors.WINDOW_SIDE_FRONT)
+        has_back_windows = bool(mask & interiors.WINDOW_SIDE_BACK)
+        has_left_windows = bool(mask & interiors.WINDOW_SIDE_LEFT)
+        has_right_windows = bool(mask & interiors.WINDOW_SIDE_RIGHT)
         
         # Add windows to front and back walls (avoiding doors)
         if has_front_windows:
@@ -2120,7 +2178,9 @@ class BuildingShellBuilder:
         
         # Build all walls with thickness
         for wall in [front_wall, back_wall, left_wall, right_wall]:
-            build_wall_with_openings(self.bm, wall, wall_thickness, add_top_cap=add_wall_caps)
+            build_wall_with_openings_on_mesh(self.deferred_verts, self.deferred_faces,
+                                             self.deferred_materials, wall, wall_thickness,
+                                             add_top_cap=add_wall_caps)
     
     def _add_windows_to_wall(self, wall: WallSegment, count: int, 
                               window_width: float, window_height: float,
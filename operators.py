@@ -41,6 +41,22 @@ def unwrap_object_uvs(obj):
         bpy.context.view_layer.objects.active = old_active
 
 
+def build_shell_mesh(name: str, params: dict) -> bpy.types.Mesh:
+    """
+    Build a building shell into new mesh data.
+    
+    The mesh datablock is removed again if the build fails, so failed
+    builds leave no orphan meshes behind.
+    """
+    mesh = bpy.data.meshes.new(name)
+    try:
+        mesh_builder.BuildingShellBuilder(params).build_mesh(mesh)
+    except Exception:
+        bpy.data.meshes.remove(mesh)
+        raise
+    return mesh
+
+
 class MESH_OT_procedural_building_shell(bpy.types.Operator):
     """Generate a procedural building shell with windows, doors, and optional damage"""
     bl_idname = "mesh.procedural_building_shell"
@@ -518,17 +534,9 @@ class MESH_OT_procedural_building_shell(bpy.types.Operator):
         # Collect parameters
         params = self._get_params()
         
-        # Build the mesh
-        builder = mesh_builder.BuildingShellBuilder(params)
-        bm = builder.build()
-        
         # Note: Damage is now integrated into the mesh building process
         # No need to apply damage separately
-        
-        # Create mesh data and object
-        mesh = bpy.data.meshes.new("BuildingShell")
-        bm.to_mesh(mesh)
-        bm.free()
+        mesh = build_shell_mesh("BuildingShell", params)
         
         # Create object
         obj = bpy.data.objects.new("BuildingShell", mesh)
@@ -1564,13 +1572,7 @@ class MESH_OT_procedural_building_bulk(bpy.types.Operator):
                 # Generate parameters with feature overrides
                 params = self._generate_params_with_overrides(i, feature_overrides)
                 
-                # Build the mesh
-                builder = mesh_builder.BuildingShellBuilder(params)
-                bm = builder.build()
-                
-                # Note: Damage is now integrated into the mesh building process
-                
-                # Create mesh and object
+                # Create mesh and object names
                 mesh_name = f"BuildingShell_{i:03d}"
                 obj_name = f"Building_{i:03d}"
                 if len(combinations) > 1:
@@ -1578,9 +1580,8 @@ class MESH_OT_procedural_building_bulk(bpy.types.Operator):
                     mesh_name = f"BuildingShell_{i:03d}_{combo_suffix}"
                     obj_name = f"Building_{i:03d}_{combo_suffix}"
                 
-                mesh = bpy.data.meshes.new(mesh_name)
-                bm.to_mesh(mesh)
-                bm.free()
+                # Build the mesh (damage is integrated into the build)
+                mesh = build_shell_mesh(mesh_name, params)
                 
                 obj = bpy.data.objects.new(obj_name, mesh)
                 obj.location = position + context.scene.cursor.location
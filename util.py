@@ -2,9 +2,25 @@
 # Utility functions for Procedural Building Shell Generator
 
 import random
+import itertools
+import bpy
 import bmesh
 import mathutils
 from mathutils import Vector
+import numpy as np
+
+# Numba is optional: numeric kernels decorated with njit are compiled when
+# it is installed and run as plain NumPy/Python otherwise. Kernels use
+# cache=True so the machine code is written next to the module and reused
+# by later Blender sessions instead of being JIT compiled again.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 
 def seed_random(seed: int):
@@ -17,6 +33,17 @@ def random_float(min_val: float, max_val: float) -> float:
     return random.uniform(min_val, max_val)
 
 
+def random_floats(bounds) -> list:
+    """
+    Return one random float per (min_val, max_val) pair, drawn in order.
+    
+    Draws the same values as calling random_float once per pair, without
+    the per-value function call.
+    """
+    uniform = random.uniform
+    return [uniform(min_val, max_val) for min_val, max_val in bounds]
+
+
 def random_int(min_val: int, max_val: int) -> int:
     """Return a random integer between min_val and max_val (inclusive)."""
     return random.randint(min_val, max_val)
@@ -109,6 +136,150 @@ def create_box(bm: bmesh.types.BMesh, min_co: Vector, max_co: Vector, material_i
     return faces
 
 
+# Unit box in the corner order of create_box (0/1 picks the min/max
+# coordinate per axis), and its faces: front, back, left, right, bottom, top
+_BOX_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=bool)
+_BOX_FACES = np.array([
+    [0, 1, 5, 4], [2, 3, 7, 6], [3, 0, 4, 7],
+    [1, 2, 6, 5], [3, 2, 1, 0], [4, 5, 6, 7],
+])
+
+
+def box_geometry(min_cos, max_cos) -> tuple:
+    """
+    Compute the geometry of axis-aligned boxes from a shared unit box.
+    
+    Args:
+        min_cos: (N, 3) minimum corners
+        max_cos: (N, 3) maximum corners
+    
+    Returns:
+        Tuple of (verts, faces) for add_geometry_bulk, with 8 verts and 6
+        outward facing quads per box in the layout of create_box
+    """
+    min_cos = np.asarray(min_cos, dtype=np.float64).reshape(-1, 1, 3)
+    max_cos = np.asarray(max_cos, dtype=np.float64).reshape(-1, 1, 3)
+    verts = np.where(_BOX_CORNERS, max_cos, min_cos)
+    faces = _BOX_FACES + 8 * np.arange(len(verts))[:, None, None]
+    return verts.reshape(-1, 3), faces.reshape(-1, 4)
+
+
+def append_box(verts: list, faces: list, min_co, max_co):
+    """
+    Append a box to shared vertex and face lists.
+    
+    The box has the vert and face layout of create_box, but nothing is
+    written to a BMesh; the lists are meant for add_geometry_bulk.
+    
+    Args:
+        verts: Shared list of (x, y, z) tuples to append to
+        faces: Shared list of vertex index quads to append to
+        min_co: Minimum corner (x, y, z)
+        max_co: Maximum corner (x, y, z)
+    """
+    x0, y0, z0 = min_co
+    x1, y1, z1 = max_co
+    base = len(verts)
+    verts.extend([
+        (x0, y0, z0), (x1, y0, z0), (x1, y1, z0), (x0, y1, z0),
+        (x0, y0, z1), (x1, y0, z1), (x1, y1, z1), (x0, y1, z1),
+    ])
+    faces.extend((_BOX_FACES + base).tolist())
+
+
+def add_geometry_bulk(bm: bmesh.types.BMesh, verts, faces, material_index=0,
+                      face_normals: bool = True):
+    """
+    Append indexed polygon geometry to a BMesh in a single submission.
+    
+    The vertex, loop and polygon arrays are written into a temporary mesh
+    with foreach_set and merged into the BMesh with one from_mesh call,
+    which is far cheaper than creating every vert and face through
+    bm.verts.new / bm.faces.new.
+    
+    Args:
+        bm: BMesh to append to
+        verts: Sequence of (x, y, z) coordinates
+        faces: Sequence of index sequences into verts; polygons may have
+            any number of corners
+        material_index: Material slot index for all faces, or a sequence
+            with one index per face
+        face_normals: Calculate normals for the new faces. Pass False when
+            the caller updates normals once after all geometry is built
+    """
+    if not len(faces):
+        return
+    
+    verts = np.asarray(verts, dtype=np.float32).reshape(-1, 3)
+    loop_totals = np.fromiter(map(len, faces), dtype=np.int32, count=len(faces))
+    loop_starts = np.zeros(len(faces), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    loop_verts = np.fromiter(itertools.chain.from_iterable(faces), dtype=np.int32,
+                             count=int(loop_totals.sum()))
+    materials = np.broadcast_to(np.asarray(material_index, dtype=np.int32), (len(faces),))
+    
+    mesh = bpy.data.meshes.new("_bulk_geometry")
+    try:
+        mesh.vertices.add(len(verts))
+        mesh.vertices.foreach_set("co", verts.ravel())
+        mesh.loops.add(len(loop_verts))
+        mesh.loops.foreach_set("vertex_index", loop_verts)
+        # Polygon sizes are derived from consecutive loop starts; loop_total
+        # is read-only on current Blender versions
+        mesh.polygons.add(len(faces))
+        mesh.polygons.foreach_set("loop_start", loop_starts)
+        mesh.polygons.foreach_set("material_index", np.ascontiguousarray(materials))
+        mesh.update(calc_edges=True)
+        bm.from_mesh(mesh, face_normals=face_normals)
+    finally:
+        bpy.data.meshes.remove(mesh)
+
+
+def foreach_get_array(collection, attr: str, dtype, width: int = 1) -> np.ndarray:
+    """
+    Read one attribute of every element of a mesh collection into an array.
+    
+    Args:
+        collection: Mesh element collection, e.g. mesh.vertices
+        attr: Attribute name passed to foreach_get
+        dtype: NumPy dtype of the result
+        width: Number of values per element
+    
+    Returns:
+        Array of shape (N,) or (N, width)
+    """
+    values = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attr, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+
+def edit_as_mesh(bm: bmesh.types.BMesh, *edits):
+    """
+    Apply array based edits to a BMesh through temporary mesh data.
+    
+    The BMesh is written to a temporary mesh once, every edit is called
+    with that mesh in order, and the result is read back into the same
+    BMesh. Edits use foreach_get / foreach_set on whole element arrays,
+    which the BMesh API has no equivalent for. Element order is kept.
+    
+    Args:
+        bm: BMesh to edit in place
+        edits: Callables taking the temporary bpy.types.Mesh
+    """
+    mesh = bpy.data.meshes.new("_array_edit")
+    try:
+        bm.to_mesh(mesh)
+        for edit in edits:
+            edit(mesh)
+        bm.clear()
+        bm.from_mesh(mesh)
+    finally:
+        bpy.data.meshes.remove(mesh)
+
+
 def subdivide_face_for_opening(bm: bmesh.types.BMesh, face: bmesh.types.BMFace, 
                                 opening_min: Vector, opening_max: Vector) -> bmesh.types.BMFace:
     """